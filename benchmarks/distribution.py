@@ -0,0 +1,140 @@
+# Бенчмарк распределения грузов.
+#   python benchmarks/distribution.py run --sizes 100 1000 10000 --out base.json
+#   python benchmarks/distribution.py compare base.json new.json --threshold 0.1
+#   python benchmarks/distribution.py run --sizes 10000 --profile --spans spans.json
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from workloads import WORKLOADS, make_company
+from transport.distribution_metrics import DistributionMetrics
+
+
+def measure(kind: str, size: int, strategy: str, seed: int, repeat: int, metrics=None) -> dict:
+    company = make_company(kind, size, seed=seed)
+
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        unassigned = company.optimize_cargo_distribution(strategy)
+        latencies.append(time.perf_counter() - start)
+
+    # Пиковая память — отдельным прогоном, т.к. tracemalloc замедляет выполнение
+    tracemalloc.start()
+    company.optimize_cargo_distribution(strategy)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Разбивка по фазам — отдельным инструментированным прогоном
+    profile = {}
+    if metrics is not None:
+        company.optimize_cargo_distribution(strategy, metrics=metrics)
+        profile = {"phases_s": metrics.last["phases"], "capacity_probes": metrics.last["capacity_probes"],
+                   "load_cargo_s": metrics.last["load_cargo_s"]}
+
+    return {
+        "workload": kind,
+        "size": size,
+        "vehicles": len(company.vehicles),
+        "strategy": strategy,
+        "latency_s": min(latencies),
+        "peak_memory_bytes": peak,
+        "vehicles_used": company.vehicles_used,
+        "unassigned_count": len(unassigned),
+        "unassigned_weight": sum(c.cargo_weight for c in unassigned),
+        **profile,
+    }
+
+
+def run(args):
+    metrics = DistributionMetrics() if args.profile or args.spans else None
+    results = []
+    for size in args.sizes:
+        for kind in args.workloads:
+            for strategy in args.strategies:
+                row = measure(kind, size, strategy, args.seed, args.repeat, metrics)
+                results.append(row)
+                print(f"{kind:<13} n={size:<9} {strategy:<14} {row['latency_s']:9.4f} с "
+                      f"{row['peak_memory_bytes'] / 2**20:9.1f} МБ  машин: {row['vehicles_used']}", flush=True)
+                if metrics is not None:
+                    phases = "  ".join(f"{name}: {seconds:.4f}" for name, seconds in row["phases_s"].items())
+                    print(f"    {phases}  проверок места: {row['capacity_probes']}", flush=True)
+    if args.spans:
+        metrics.write_spans(args.spans)
+        print(f"Трассировка сохранена в {args.spans}")
+
+    report = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "seed": args.seed, "repeat": args.repeat},
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Результаты сохранены в {args.out}")
+
+
+def compare(args):
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+
+    key = lambda row: (row["workload"], row["size"], row["strategy"])
+    old_rows = {key(row): row for row in base["results"]}
+    regressions = 0
+    for row in new["results"]:
+        old = old_rows.get(key(row))
+        if old is None:
+            continue
+        problems = []
+        for field in ("latency_s", "peak_memory_bytes"):
+            if old[field] and (row[field] - old[field]) / old[field] > args.threshold:
+                problems.append(f"{field}: {old[field]:.4g} -> {row[field]:.4g}")
+        for field in ("vehicles_used", "unassigned_count"):
+            if row[field] > old[field]:
+                problems.append(f"{field}: {old[field]} -> {row[field]}")
+        label = "/".join(str(part) for part in key(row))
+        if problems:
+            regressions += 1
+            print(f"РЕГРЕССИЯ {label}: " + "; ".join(problems))
+        else:
+            print(f"ok        {label}: {old['latency_s']:.4f} с -> {row['latency_s']:.4f} с")
+
+    print(f"Регрессий: {regressions}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк распределения грузов")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="выполнить замеры")
+    run_parser.add_argument("--sizes", type=lambda s: int(float(s)), nargs="+",
+                            default=[100, 1000, 10000, 100000], help="число клиентов (до 1e7)")
+    run_parser.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=list(WORKLOADS))
+    run_parser.add_argument("--strategies", nargs="+", default=["greedy_legacy"])
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--out", help="путь к JSON-файлу с результатами")
+    run_parser.add_argument("--profile", action="store_true", help="добавить разбивку по фазам (DistributionMetrics)")
+    run_parser.add_argument("--spans", help="путь к файлу трассировки OTLP/JSON")
+
+    compare_parser = commands.add_parser("compare", help="сравнить два прогона")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.1,
+                                help="допустимый относительный рост времени и памяти")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+        return 0
+    return compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+# Замер памяти и времени массового создания объектов модели:
+# обычный конструктор, быстрый путь from_trusted и прежняя модель (__dict__ + uuid4 в __init__).
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transport.client import Client
+from transport.train import Train
+
+
+class LegacyVehicle:
+    def __init__(self, capacity: float):
+        if not isinstance(capacity, (int, float)) or capacity <= 0:
+            raise ValueError("Грузоподъемность должна быть положительным числом.")
+        self.vehicle_id = str(uuid.uuid4())
+        self.capacity = float(capacity)
+        self.current_load = 0.0
+        self.clients_list = []
+
+
+class LegacyTrain(LegacyVehicle):
+    def __init__(self, capacity: float, number_of_cars: int):
+        super().__init__(capacity)
+        self.number_of_cars = number_of_cars
+
+
+class LegacyClient:
+    def __init__(self, name: str, cargo_weight: float, is_vip: bool = False):
+        self.name = name.strip()
+        self.cargo_weight = float(cargo_weight)
+        self.is_vip = is_vip
+
+
+def measure(label: str, build):
+    # Время — без трассировки памяти, память — отдельным проходом под tracemalloc
+    start = time.perf_counter()
+    objects = build()
+    elapsed = time.perf_counter() - start
+    count = len(objects)
+    del objects
+
+    tracemalloc.start()
+    objects = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed:8.3f} с {current / count:8.1f} байт/объект")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк объектной модели transport")
+    parser.add_argument("-n", type=int, default=200_000, help="количество объектов")
+    args = parser.parse_args()
+    n = args.n
+
+    print(f"n = {n}")
+    measure("LegacyTrain", lambda: [LegacyTrain(10.0 + i % 50, 3) for i in range(n)])
+    measure("Train", lambda: [Train(10.0 + i % 50, 3) for i in range(n)])
+    measure("Train.from_trusted", lambda: [Train.from_trusted(10.0 + i % 50, 3) for i in range(n)])
+    measure("LegacyClient", lambda: [LegacyClient("Клиент", 1.0 + i % 7) for i in range(n)])
+    measure("Client", lambda: [Client("Клиент", 1.0 + i % 7) for i in range(n)])
+    measure("Client.from_trusted", lambda: [Client.from_trusted("Клиент", 1.0 + i % 7) for i in range(n)])
+
+
+if __name__ == "__main__":
+    main()
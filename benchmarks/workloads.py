@@ -0,0 +1,45 @@
+# Генераторы синтетических нагрузок для бенчмарков. Все генераторы детерминированы по seed.
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transport.transport_company import TransportCompany
+
+WORKLOADS = ("uniform", "heavy_tailed", "vip_heavy")
+
+
+def client_rows(kind: str, count: int, rng: random.Random):
+    if kind == "uniform":
+        return [(f"Клиент {i}", rng.uniform(0.1, 20.0), rng.random() < 0.1) for i in range(count)]
+    if kind == "heavy_tailed":
+        # Парето: много мелких грузов и редкие очень тяжелые
+        return [(f"Клиент {i}", min(0.1 * rng.paretovariate(1.2), 500.0), rng.random() < 0.1)
+                for i in range(count)]
+    if kind == "vip_heavy":
+        return [(f"Клиент {i}", rng.uniform(0.1, 20.0), rng.random() < 0.7) for i in range(count)]
+    raise ValueError(f"Неизвестный тип нагрузки: {kind}.")
+
+
+def fleet_rows(count: int, rng: random.Random, train_share: float = 0.5):
+    # Смешанный парк: поезда вместительнее самолетов
+    rows = []
+    for _ in range(count):
+        if rng.random() < train_share:
+            rows.append(("train", rng.uniform(50.0, 200.0), rng.randint(2, 30)))
+        else:
+            rows.append(("airplane", rng.uniform(5.0, 60.0), rng.randint(5000, 12000)))
+    return rows
+
+
+def make_company(kind: str, clients: int, vehicles: int = None, seed: int = 0) -> TransportCompany:
+    # По умолчанию парк рассчитан примерно на весь спрос равномерной нагрузки
+    rng = random.Random(seed)
+    if vehicles is None:
+        vehicles = max(1, clients // 8)
+    # Без кэша планов: повторные прогоны на том же составе должны выполнять расчет
+    company = TransportCompany(f"Бенчмарк {kind}", plan_cache_size=0)
+    company.add_vehicles(fleet_rows(vehicles, rng))
+    company.add_clients(client_rows(kind, clients, rng))
+    return company
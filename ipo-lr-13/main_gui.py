@@ -3,10 +3,15 @@ from transport.client import Client
 from transport.train import Train
 from transport.airplane import Airplane
 from transport.transport_company import TransportCompany
-import json
+from transport.result_exporter import export_distribution
+from transport.distribution_cancelled import DistributionCancelled
 import os
+import queue
+import threading
 
-company = TransportCompany("Моя Транспортная Компания")
+# concurrent=True: фоновое распределение считает план на копиях транспорта, а
+# таблицы и окно результата рисуются из опубликованной версии плана (company.plan())
+company = TransportCompany("Моя Транспортная Компания", concurrent=True)
 client_table = "client_table"
 vehicle_table = "vehicle_table"
 status_bar = "status_bar"
@@ -39,6 +44,8 @@ def validate_client_data(name: str, weight_str: str) -> tuple[bool, str, float]:
 
 
 def add_client_callback(sender, app_data, user_data):
+    if plan_busy():
+        return
     name = dpg.get_value("client_name_input")
     weight_str = dpg.get_value("client_weight_input")
     is_vip = dpg.get_value("client_vip_checkbox")
@@ -52,6 +59,7 @@ def add_client_callback(sender, app_data, user_data):
         client = Client(name.strip(), weight, is_vip)
         company.add_client(client)
         refresh_client_table()
+        refresh_vehicle_table()
         set_status(f"Клиент '{name}' добавлен.")
         dpg.hide_item("add_client_window")
         dpg.set_value("client_name_input", "")
@@ -65,22 +73,34 @@ def open_add_client_window():
     dpg.set_value("client_name_input", "")
     dpg.set_value("client_weight_input", "")
     dpg.set_value("client_vip_checkbox", False)
+    dpg.set_item_callback("save_client_btn", add_client_callback)
     dpg.show_item("add_client_window")
 
 
-def edit_client_callback(sender, app_data):
-    row_id = app_data[1]
-    if row_id < len(company.clients):
-        client = company.clients[row_id]
+def edit_client_callback(sender, app_data, user_data):
+    # user_data строки — сам клиент, а не номер виджета в пуле строк
+    select_row(client_table, user_data)
+    open_client_editor(user_data)
+
+
+def client_row_double_clicked(sender, app_data):
+    open_client_editor(row_key(client_table, app_data[1]))
+
+
+def open_client_editor(client):
+    if client in company.clients:
         dpg.set_value("client_name_input", client.name)
         dpg.set_value("client_weight_input", str(client.cargo_weight))
         dpg.set_value("client_vip_checkbox", client.is_vip)
-        dpg.set_item_user_data("save_client_btn", ("edit", row_id))
+        dpg.set_item_user_data("save_client_btn", ("edit", client))
+        dpg.set_item_callback("save_client_btn", save_client_edit)
         dpg.show_item("add_client_window")
 
 
 def save_client_edit(sender, app_data, user_data):
-    action, index = user_data
+    if plan_busy():
+        return
+    action, client = user_data
     name = dpg.get_value("client_name_input")
     weight_str = dpg.get_value("client_weight_input")
     is_vip = dpg.get_value("client_vip_checkbox")
@@ -91,9 +111,9 @@ def save_client_edit(sender, app_data, user_data):
         return
 
     try:
-        client = Client(name.strip(), weight, is_vip)
-        company.clients[index] = client
+        company.update_client(client, name.strip(), weight, is_vip)
         refresh_client_table()
+        refresh_vehicle_table()
         set_status(f"Клиент '{name}' обновлён.")
         dpg.hide_item("add_client_window")
     except Exception as e:
@@ -101,14 +121,17 @@ def save_client_edit(sender, app_data, user_data):
 
 
 def delete_selected_client():
-    selected = dpg.get_selected_rows(client_table)
-    if not selected:
+    if plan_busy():
+        return
+    client = table_state[client_table]["selected"]
+    if client is None or client not in company.clients:
         show_message("Внимание", "Выберите клиента для удаления.")
         return
-    idx = selected[0]
-    name = company.clients[idx].name
-    del company.clients[idx]
+    name = client.name
+    company.remove_client(client)
+    table_state[client_table]["selected"] = None
     refresh_client_table()
+    refresh_vehicle_table()
     set_status(f"Клиент '{name}' удалён.")
 
 
@@ -131,6 +154,8 @@ def validate_vehicle_data(vehicle_type: str, capacity_str: str, extra_str: str)
 
 
 def add_vehicle_callback(sender, app_data, user_data):
+    if plan_busy():
+        return
     v_type = dpg.get_value("vehicle_type_combo")
     cap_str = dpg.get_value("vehicle_capacity_input")
     extra_str = dpg.get_value("vehicle_extra_input")
@@ -160,13 +185,23 @@ def open_add_vehicle_window():
     dpg.set_value("vehicle_type_combo", "Поезд")
     dpg.set_value("vehicle_capacity_input", "")
     dpg.set_value("vehicle_extra_input", "")
+    dpg.set_item_callback("save_vehicle_btn", add_vehicle_callback)
     dpg.show_item("add_vehicle_window")
 
 
-def edit_vehicle_callback(sender, app_data):
-    row_id = app_data[1]
-    if row_id < len(company.vehicles):
-        v = company.vehicles[row_id]
+def edit_vehicle_callback(sender, app_data, user_data):
+    # user_data строки — ID транспорта
+    select_row(vehicle_table, user_data)
+    open_vehicle_editor(user_data)
+
+
+def vehicle_row_double_clicked(sender, app_data):
+    open_vehicle_editor(row_key(vehicle_table, app_data[1]))
+
+
+def open_vehicle_editor(vehicle_id):
+    v = company.find_vehicle(vehicle_id) if vehicle_id is not None else None
+    if v is not None:
         if isinstance(v, Train):
             dpg.set_value("vehicle_type_combo", "Поезд")
             dpg.set_value("vehicle_extra_input", str(v.number_of_cars))
@@ -174,12 +209,15 @@ def edit_vehicle_callback(sender, app_data):
             dpg.set_value("vehicle_type_combo", "Самолёт")
             dpg.set_value("vehicle_extra_input", str(v.max_altitude))
         dpg.set_value("vehicle_capacity_input", str(v.capacity))
-        dpg.set_item_user_data("save_vehicle_btn", ("edit", row_id))
+        dpg.set_item_user_data("save_vehicle_btn", ("edit", vehicle_id))
+        dpg.set_item_callback("save_vehicle_btn", save_vehicle_edit)
         dpg.show_item("add_vehicle_window")
 
 
 def save_vehicle_edit(sender, app_data, user_data):
-    action, index = user_data
+    if plan_busy():
+        return
+    action, vehicle_id = user_data
     v_type = dpg.get_value("vehicle_type_combo")
     cap_str = dpg.get_value("vehicle_capacity_input")
     extra_str = dpg.get_value("vehicle_extra_input")
@@ -197,9 +235,10 @@ def save_vehicle_edit(sender, app_data, user_data):
         else:
             raise ValueError("Неизвестный тип")
 
-        old_id = company.vehicles[index].vehicle_id
-        vehicle.vehicle_id = old_id
-        company.vehicles[index] = vehicle
+        old = company.find_vehicle(vehicle_id)
+        if old is None:
+            raise ValueError("Транспорт уже удалён.")
+        company.replace_vehicle(old, vehicle)
         refresh_vehicle_table()
         set_status(f"{v_type} обновлён.")
         dpg.hide_item("add_vehicle_window")
@@ -208,41 +247,158 @@ def save_vehicle_edit(sender, app_data, user_data):
 
 
 def delete_selected_vehicle():
-    selected = dpg.get_selected_rows(vehicle_table)
-    if not selected:
+    if plan_busy():
+        return
+    selected = table_state[vehicle_table]["selected"]
+    v = company.find_vehicle(selected) if selected is not None else None
+    if v is None:
         show_message("Внимание", "Выберите транспорт для удаления.")
         return
-    idx = selected[0]
-    v = company.vehicles[idx]
     v_type = "Поезд" if isinstance(v, Train) else "Самолёт"
-    del company.vehicles[idx]
+    company.remove_vehicle(v)
+    table_state[vehicle_table]["selected"] = None
     refresh_vehicle_table()
     set_status(f"{v_type} (ID: {v.vehicle_id[:8]}...) удалён.")
 
 
+# Виртуализированные таблицы: создается только PAGE_SIZE строк-виджетов на таблицу,
+# они переиспользуются при листании, а обновляются лишь строки с изменившимся содержимым.
+# Строка-виджет несет в user_data ключ своей записи (клиент или ID транспорта), а выбор
+# хранится по ключу: после листания он не переходит на другую запись в том же виджете.
+PAGE_SIZE = 100
+table_state = {
+    client_table: {"offset": 0, "rows": [], "cache": [], "label": "client_page_label", "selected": None},
+    vehicle_table: {"offset": 0, "rows": [], "cache": [], "label": "vehicle_page_label", "selected": None},
+}
+
+
+def create_row_pool(table: str, columns: int, callback):
+    state = table_state[table]
+    with dpg.clipper(parent=table):
+        for _ in range(PAGE_SIZE):
+            with dpg.table_row(show=False) as row:
+                selectable = dpg.add_selectable(label="", span_columns=True, callback=callback)
+                texts = [dpg.add_text("") for _ in range(columns - 1)]
+            state["rows"].append((row, selectable, texts))
+            state["cache"].append(None)
+
+
+def row_key(table: str, slot: int):
+    # Ключ записи, показанной сейчас в строке-виджете slot
+    return dpg.get_item_user_data(table_state[table]["rows"][slot][1])
+
+
+def select_row(table: str, key):
+    state = table_state[table]
+    state["selected"] = key
+    # Подсветка — только у строки с выбранной записью
+    for slot, (row, selectable, texts) in enumerate(state["rows"]):
+        entry = state["cache"][slot]
+        if entry is not None:
+            dpg.set_value(selectable, entry[0] == key)
+
+
+def refresh_table(table: str, items, make_record, make_key):
+    state = table_state[table]
+    total = len(items)
+    last_page = max(0, (total - 1) // PAGE_SIZE * PAGE_SIZE)
+    state["offset"] = min(state["offset"], last_page)
+    offset = state["offset"]
+
+    for slot, (row, selectable, texts) in enumerate(state["rows"]):
+        index = offset + slot
+        if index < total:
+            key = make_key(items[index])
+            # Клиенты сравниваются по тождеству (__eq__ у Client нет), ID транспорта — как строки
+            selected = key == state["selected"]
+            entry = (key, selected) + make_record(items[index])
+            cached = state["cache"][slot]
+            if cached == entry:
+                continue
+            if cached is None:
+                dpg.show_item(row)
+            dpg.configure_item(selectable, label=entry[2], user_data=key)
+            dpg.set_value(selectable, selected)
+            for text, value in zip(texts, entry[3:]):
+                dpg.set_value(text, value)
+            state["cache"][slot] = entry
+        elif state["cache"][slot] is not None:
+            dpg.hide_item(row)
+            state["cache"][slot] = None
+
+    shown = min(total - offset, PAGE_SIZE)
+    dpg.set_value(state["label"], f"{offset + 1}–{offset + shown} из {total}" if total else "0 из 0")
+
+
+def change_page(sender, app_data, user_data):
+    table, step = user_data
+    table_state[table]["offset"] = max(0, table_state[table]["offset"] + step * PAGE_SIZE)
+    if table == client_table:
+        refresh_client_table()
+    else:
+        refresh_vehicle_table()
+
+
+def client_record(client) -> tuple:
+    return (client.name, str(client.cargo_weight), "Да" if client.is_vip else "Нет")
+
+
+def vehicle_kind(v) -> str:
+    # Запись версии плана (PlannedVehicle) хранит имя типа исходного транспорта
+    return "Поезд" if v.type_name == "Train" else "Самолёт"
+
+
+def vehicle_record(v) -> tuple:
+    return (v.vehicle_id[:8] + "...", vehicle_kind(v), str(v.capacity), f"{v.current_load:.2f}")
+
+
 def refresh_client_table():
-    dpg.delete_item(client_table, children_only=True)
-    for i, client in enumerate(company.clients):
-        dpg.add_table_row(parent=client_table, tag=f"client_row_{i}")
-        dpg.add_selectable(label=client.name, span_columns=True, callback=edit_client_callback,
-                           user_data=i, parent=f"client_row_{i}")
-        dpg.add_text(str(client.cargo_weight), parent=f"client_row_{i}")
-        dpg.add_text("Да" if client.is_vip else "Нет", parent=f"client_row_{i}")
+    refresh_table(client_table, company.clients, client_record, lambda c: c)
 
 
 def refresh_vehicle_table():
-    dpg.delete_item(vehicle_table, children_only=True)
-    for i, v in enumerate(company.vehicles):
-        v_type = "Поезд" if isinstance(v, Train) else "Самолёт"
-        dpg.add_table_row(parent=vehicle_table, tag=f"vehicle_row_{i}")
-        dpg.add_selectable(label=v.vehicle_id[:8] + "...", span_columns=True,
-                           callback=edit_vehicle_callback, user_data=i, parent=f"vehicle_row_{i}")
-        dpg.add_text(v_type, parent=f"vehicle_row_{i}")
-        dpg.add_text(str(v.capacity), parent=f"vehicle_row_{i}")
-        dpg.add_text(f"{v.current_load:.2f}", parent=f"vehicle_row_{i}")
+    # Загрузка — из опубликованной версии плана: фоновый расчет ее не меняет
+    refresh_table(vehicle_table, company.plan().vehicles, vehicle_record, lambda v: v.vehicle_id)
+
+
+# Распределение и экспорт выполняются в фоновых потоках; потоки передают события
+# в очередь, а главный цикл отрисовки разбирает ее каждый кадр — вызовы dearpygui
+# делаются только из него.
+RESULT_PAGE_SIZE = 50
+solve_events = queue.Queue()
+solve_state = {"thread": None, "cancel": threading.Event()}
+export_state = {"thread": None}
+result_state = {"plan": None, "page": 0}
+
+
+def is_solving() -> bool:
+    thread = solve_state["thread"]
+    return thread is not None and thread.is_alive()
+
+
+def is_exporting() -> bool:
+    thread = export_state["thread"]
+    return thread is not None and thread.is_alive()
+
+
+def plan_busy() -> bool:
+    # План нельзя менять, пока он распределяется или читается экспортом
+    if is_solving():
+        show_message("Внимание", "Дождитесь окончания распределения грузов.")
+        return True
+    if is_exporting():
+        show_message("Внимание", "Дождитесь окончания экспорта результата.")
+        return True
+    return False
 
 
 def distribute_cargo():
+    if is_solving():
+        show_message("Внимание", "Распределение уже выполняется.")
+        return
+    if is_exporting():
+        show_message("Внимание", "Дождитесь окончания экспорта результата.")
+        return
     if not company.clients:
         show_message("Ошибка", "Нет клиентов для распределения.")
         return
@@ -250,72 +406,138 @@ def distribute_cargo():
         show_message("Ошибка", "Нет транспорта для загрузки.")
         return
 
-    unassigned = company.optimize_cargo_distribution()
-    refresh_vehicle_table()
-    set_status("Грузы распределены!")
+    cancel = threading.Event()
+
+    def worker():
+        try:
+            # Инкрементальный режим: последующие правки клиентов и транспорта дорабатывают этот план
+            unassigned = company.optimize_cargo_distribution(
+                incremental=True,
+                progress=lambda done, total: solve_events.put(("progress", done, total)),
+                should_stop=cancel.is_set)
+            solve_events.put(("done", unassigned, None))
+        except DistributionCancelled:
+            solve_events.put(("cancelled", None, None))
+        except Exception as e:
+            solve_events.put(("error", str(e), None))
+
+    solve_state["cancel"] = cancel
+    solve_state["thread"] = threading.Thread(target=worker, daemon=True)
+    dpg.show_item("cancel_distribution_btn")
+    set_status("Распределение грузов...")
+    solve_state["thread"].start()
+
+
+def cancel_distribution():
+    if is_solving():
+        solve_state["cancel"].set()
+        set_status("Отмена распределения...")
+
+
+def process_solve_events():
+    while True:
+        try:
+            kind, first, second = solve_events.get_nowait()
+        except queue.Empty:
+            return
+        if kind == "progress":
+            set_status(f"Распределение грузов: {first} из {second} клиентов...")
+            continue
+        if kind == "status":
+            set_status(first)
+            continue
+        dpg.hide_item("cancel_distribution_btn")
+        refresh_vehicle_table()
+        if kind == "done":
+            set_status("Грузы распределены!")
+            # Окно результата листает версию плана, опубликованную этим расчетом
+            result_state["plan"] = company.plan()
+            result_state["page"] = 0
+            show_distribution_result()
+        elif kind == "cancelled":
+            set_status("Распределение отменено.")
+        else:
+            show_message("Ошибка", first, error=True)
+
+
+def client_line(c) -> str:
+    return f"  - {c.name} ({c.cargo_weight} т)" + (" [VIP]" if c.is_vip else "")
 
-    result_lines = ["Распределение грузов:\n"]
-    for v in company.vehicles:
-        v_type = "Поезд" if isinstance(v, Train) else "Самолёт"
-        result_lines.append(f"\n{v_type} (ID: {v.vehicle_id[:8]}...):")
+
+def result_page_text(page: int) -> str:
+    # Текст строится только для машин текущей страницы
+    plan = result_state["plan"]
+    start = page * RESULT_PAGE_SIZE
+    lines = []
+    for v in plan.vehicles[start:start + RESULT_PAGE_SIZE]:
+        lines.append(f"\n{vehicle_kind(v)} (ID: {v.vehicle_id[:8]}...):")
         if v.clients_list:
-            for c in v.clients_list:
-                result_lines.append(f"  - {c.name} ({c.cargo_weight} т)" + (" [VIP]" if c.is_vip else ""))
+            lines.extend(client_line(c) for c in v.clients_list)
         else:
-            result_lines.append("  (пусто)")
+            lines.append("  (пусто)")
+
+    unassigned = plan.unassigned
+    if unassigned and start + RESULT_PAGE_SIZE >= len(plan.vehicles):
+        lines.append(f"\nНе распределены ({len(unassigned)}):")
+        lines.extend(client_line(c) for c in unassigned[:RESULT_PAGE_SIZE])
+        if len(unassigned) > RESULT_PAGE_SIZE:
+            lines.append(f"  ... и ещё {len(unassigned) - RESULT_PAGE_SIZE}")
+    return "\n".join(lines)
 
-    if unassigned:
-        result_lines.append("\nНе распределены:")
-        for c in unassigned:
-            result_lines.append(f"  - {c.name} ({c.cargo_weight} т)" + (" [VIP]" if c.is_vip else ""))
 
-    result_text = "\n".join(result_lines)
+def change_result_page(sender, app_data, user_data):
+    pages = max(1, -(-len(result_state["plan"].vehicles) // RESULT_PAGE_SIZE))
+    result_state["page"] = min(max(0, result_state["page"] + user_data), pages - 1)
+    dpg.set_value("distribution_result_text", result_page_text(result_state["page"]))
+    dpg.set_value("distribution_result_page", f"Страница {result_state['page'] + 1} из {pages}")
 
+
+def show_distribution_result():
     with dpg.mutex():
         if dpg.does_item_exist("distribution_result"):
             dpg.delete_item("distribution_result")
     with dpg.window(label="Результат распределения", tag="distribution_result", width=500, height=400):
-        dpg.add_text(result_text, wrap=480)
+        with dpg.group(horizontal=True):
+            dpg.add_button(label="<", callback=change_result_page, user_data=-1)
+            dpg.add_text("", tag="distribution_result_page")
+            dpg.add_button(label=">", callback=change_result_page, user_data=1)
+        dpg.add_text("", tag="distribution_result_text", wrap=480)
         dpg.add_button(label="Закрыть", callback=lambda: dpg.delete_item("distribution_result"))
+    change_result_page(None, None, 0)
 
 
 def export_results():
-    if not company.vehicles or all(len(v.clients_list) == 0 for v in company.vehicles):
+    if is_solving():
+        show_message("Внимание", "Дождитесь окончания распределения грузов.")
+        return
+    if is_exporting():
+        show_message("Внимание", "Экспорт уже выполняется.")
+        return
+    if company.stats()["vehicles_used"] == 0:
         show_message("Ошибка", "Нет распределённых грузов для экспорта.")
         return
+    dpg.show_item("export_file_dialog")
 
-    data = {
-        "company": company.name,
-        "vehicles": []
-    }
-
-    for v in company.vehicles:
-        v_type = "Train" if isinstance(v, Train) else "Airplane"
-        clients = [
-            {
-                "name": c.name,
-                "cargo_weight": c.cargo_weight,
-                "is_vip": c.is_vip
-            }
-            for c in v.clients_list
-        ]
-        data["vehicles"].append({
-            "id": v.vehicle_id,
-            "type": v_type,
-            "capacity": v.capacity,
-            "current_load": v.current_load,
-            "clients": clients
-        })
 
-    try:
-        with open("distribution_result.json", "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        global last_export_path
-        last_export_path = os.path.abspath("distribution_result.json")
-        set_status(f"Результат сохранён в: distribution_result.json")
-        show_message("Успех", "Результаты успешно экспортированы в файл distribution_result.json")
-    except Exception as e:
-        show_message("Ошибка экспорта", str(e), error=True)
+def export_to_path(sender, app_data):
+    path = app_data.get("file_path_name") or "distribution_result.json"
+
+    def progress(done, total):
+        solve_events.put(("status", f"Экспорт: {done} из {total} ТС...", None))
+
+    def worker():
+        # Запись идет в фоновом потоке, интерфейс не блокируется; статус передается
+        # главному циклу через очередь событий
+        try:
+            export_distribution(company.plan(), path, progress=progress)
+            global last_export_path
+            last_export_path = os.path.abspath(path)
+            solve_events.put(("status", f"Результат сохранён в: {path}", None))
+        except Exception as e:
+            solve_events.put(("status", f"Ошибка экспорта: {e}", None))
+
+    export_state["thread"] = threading.Thread(target=worker, daemon=True)
+    export_state["thread"].start()
 
 
 def show_about():
@@ -345,6 +567,8 @@ with dpg.window(tag="PrimaryWindow"):
         dpg.add_button(label="Добавить транспорт", callback=open_add_vehicle_window)
         dpg.add_button(label="Удалить транспорт", callback=delete_selected_vehicle)
         dpg.add_button(label="Распределить грузы", callback=distribute_cargo)
+        dpg.add_button(label="Отменить распределение", callback=cancel_distribution,
+                       tag="cancel_distribution_btn", show=False)
 
     dpg.add_text("Клиенты:")
     with dpg.table(tag=client_table, header_row=True, borders_innerH=True, borders_outerH=True,
@@ -352,6 +576,11 @@ with dpg.window(tag="PrimaryWindow"):
         dpg.add_table_column(label="Имя")
         dpg.add_table_column(label="Вес груза (т)")
         dpg.add_table_column(label="VIP")
+    create_row_pool(client_table, 3, edit_client_callback)
+    with dpg.group(horizontal=True):
+        dpg.add_button(label="<", callback=change_page, user_data=(client_table, -1))
+        dpg.add_text("0 из 0", tag="client_page_label")
+        dpg.add_button(label=">", callback=change_page, user_data=(client_table, 1))
 
     dpg.add_separator()
     dpg.add_text("Транспортные средства:")
@@ -361,6 +590,11 @@ with dpg.window(tag="PrimaryWindow"):
         dpg.add_table_column(label="Тип")
         dpg.add_table_column(label="Грузоподъёмность (т)")
         dpg.add_table_column(label="Текущая загрузка (т)")
+    create_row_pool(vehicle_table, 4, edit_vehicle_callback)
+    with dpg.group(horizontal=True):
+        dpg.add_button(label="<", callback=change_page, user_data=(vehicle_table, -1))
+        dpg.add_text("0 из 0", tag="vehicle_page_label")
+        dpg.add_button(label=">", callback=change_page, user_data=(vehicle_table, 1))
 
     dpg.add_text("", tag=status_bar)
 
@@ -383,12 +617,21 @@ with dpg.window(label="Добавить/редактировать трансп
     dpg.add_button(label="Отмена", callback=lambda: dpg.hide_item("add_vehicle_window"))
 
 
-dpg.set_table_row_double_click_callback(client_table, edit_client_callback)
-dpg.set_table_row_double_click_callback(vehicle_table, edit_vehicle_callback)
+with dpg.file_dialog(directory_selector=False, show=False, callback=export_to_path, tag="export_file_dialog",
+                     default_filename="distribution_result", width=600, height=400):
+    dpg.add_file_extension(".json")
+    dpg.add_file_extension(".jsonl")
+    dpg.add_file_extension(".csv")
+
+
+dpg.set_table_row_double_click_callback(client_table, client_row_double_clicked)
+dpg.set_table_row_double_click_callback(vehicle_table, vehicle_row_double_clicked)
 
 dpg.create_viewport(title='Транспортная компания — ЛР12', width=900, height=700)
 dpg.setup_dearpygui()
 dpg.show_viewport()
 dpg.set_primary_window("PrimaryWindow", True)
-dpg.start_dearpygui()
+while dpg.is_dearpygui_running():
+    process_solve_events()
+    dpg.render_dearpygui_frame()
 dpg.destroy_context()
\ No newline at end of file
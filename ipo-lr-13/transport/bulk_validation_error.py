@@ -0,0 +1,7 @@
+class BulkValidationError(ValueError):
+    # Ошибка массового добавления: содержит все некорректные строки, а не только первую
+    def __init__(self, errors):
+        self.errors = list(errors)
+        shown = "\n".join(f"  строка {index}: {message}" for index, message in self.errors[:20])
+        more = f"\n  ... и еще {len(self.errors) - 20}" if len(self.errors) > 20 else ""
+        super().__init__(f"Некорректных строк: {len(self.errors)}.\n{shown}{more}")
\ No newline at end of file
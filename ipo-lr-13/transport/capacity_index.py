@@ -0,0 +1,149 @@
+from .first_fit_tree import FirstFitTree
+
+
+class CapacityIndex:
+    # Индекс допустимости по нескольким измерениям: вес, объем, вагоны/отсеки.
+    # Для каждого измерения — свое дерево максимумов остатка с общей нумерацией
+    # листьев. Пока грузам нужен только вес, работает одно дерево; деревья объема
+    # и мест строятся при первом грузе, которому они нужны, поэтому
+    # дополнительные измерения не замедляют распределение по одному весу.
+    EPSILON = FirstFitTree.EPSILON
+
+    def __init__(self, vehicles):
+        # vehicles — список транспорта; None на месте удаленного
+        self.vehicles = vehicles
+        self.weight = FirstFitTree([self._residuals(v)[0] for v in vehicles])
+        self.volume = None
+        self.slots = None
+        # Набор нужных измерений -> (дерево «баланса», масштабы). Лист дерева баланса —
+        # минимум нормированных остатков машины по этим измерениям: груз помещается,
+        # только если этот минимум не меньше минимума его нормированных потребностей.
+        # Отсекает поддеревья, где у каждой машины заполнено какое-то одно измерение.
+        self._balance = {}
+        # Минимальные по доминированию запросы (вес, объем, места), для которых места
+        # не нашлось. Пока остатки только убывают, любой запрос не меньше такого по
+        # всем измерениям тоже не поместится — без обхода деревьев.
+        self._failed = []
+
+    @staticmethod
+    def _residuals(vehicle):
+        if vehicle is None:
+            return float("-inf"), float("-inf"), float("-inf")
+        return (vehicle.capacity - vehicle.current_load,
+                vehicle.volume_capacity - vehicle.current_volume,
+                vehicle.slot_capacity - vehicle.used_slots)
+
+    @staticmethod
+    def _balance_value(residuals, dims, scales) -> float:
+        return min(residuals[d] / scales[d] for d in dims)
+
+    def _build_extra(self):
+        residuals = [self._residuals(v) for v in self.vehicles]
+        self.volume = FirstFitTree([r[1] for r in residuals])
+        self.slots = FirstFitTree([r[2] for r in residuals])
+
+    def _build_balance(self, dims):
+        # Масштаб измерения — наибольшее конечное ограничение в парке
+        scales = [1.0, 1.0, 1.0]
+        for v in self.vehicles:
+            if v is None:
+                continue
+            for d, limit in enumerate((v.capacity, v.volume_capacity, v.slot_capacity)):
+                if limit != float("inf") and limit > scales[d]:
+                    scales[d] = limit
+        tree = FirstFitTree([self._balance_value(self._residuals(v), dims, scales) for v in self.vehicles])
+        self._balance[dims] = (tree, scales)
+        return tree, scales
+
+    def max_residual(self) -> float:
+        return self.weight.max_residual()
+
+    def update(self, index: int):
+        residuals = self._residuals(self.vehicles[index])
+        weight, volume, slots = residuals
+        if self._failed and weight > self.weight.residual(index):
+            self._failed = []
+        self.weight.update(index, weight)
+        if self.volume is not None:
+            if self._failed and (volume > self.volume.residual(index) or slots > self.slots.residual(index)):
+                self._failed = []
+            self.volume.update(index, volume)
+            self.slots.update(index, slots)
+            for dims, (tree, scales) in self._balance.items():
+                tree.update(index, self._balance_value(residuals, dims, scales))
+
+    def append(self, vehicle) -> int:
+        self.vehicles.append(vehicle)
+        residuals = self._residuals(vehicle)
+        index = self.weight.append(residuals[0])
+        self._failed = []
+        if self.volume is not None:
+            self.volume.append(residuals[1])
+            self.slots.append(residuals[2])
+            for dims, (tree, scales) in self._balance.items():
+                tree.append(self._balance_value(residuals, dims, scales))
+        return index
+
+    def remove(self, index: int):
+        # Место остается пустым, чтобы не сдвигать нумерацию листьев
+        self.vehicles[index] = None
+        self.update(index)
+
+    def restore(self, index: int, vehicle):
+        # Ставит транспорт на пустое место (после remove или None при построении)
+        self.vehicles[index] = vehicle
+        self.update(index)
+
+    def find_first(self, client, start: int = 0) -> int:
+        # Индекс первого транспорта (не раньше start), вмещающего груз по всем измерениям, либо -1
+        vehicles = self.vehicles
+        weight = client.cargo_weight
+        volume = client.volume
+        slots = client.slots
+        if not volume and not slots:
+            index = self.weight.find_first(weight, start)
+            while index != -1 and not vehicles[index].fits(client):
+                index = self.weight.find_first(weight, index + 1)
+            return index
+
+        for failed in self._failed:
+            if weight >= failed[0] and volume >= failed[1] and slots >= failed[2]:
+                return -1
+        if self.volume is None:
+            self._build_extra()
+        # Измерение, которое грузу не нужно (0), не проверяем: остаток в нем не отрицателен
+        dims = (0,) + ((1,) if volume else ()) + ((2,) if slots else ())
+        balance, scales = self._balance.get(dims) or self._build_balance(dims)
+        eps = self.EPSILON
+        checks = [(self.weight.tree, weight - eps),
+                  (balance.tree, self._balance_value((weight, volume, slots), dims, scales) - eps)]
+        if volume:
+            checks.append((self.volume.tree, volume - eps))
+        if slots:
+            checks.append((self.slots.tree, slots - eps))
+        size = self.weight.size
+        count = self.weight.count
+        # Обход в глубину слева направо; поддерево отсекается, если хотя бы одно
+        # необходимое условие не выполнено для его максимумов. Максимумы по разным
+        # измерениям могут принадлежать разным машинам, поэтому лист проверяется через fits
+        stack = [(1, 0, size)]
+        while stack:
+            node, low, high = stack.pop()
+            if high <= start or low >= count:
+                continue
+            for tree, need in checks:
+                if tree[node] < need:
+                    break
+            else:
+                if node >= size:
+                    if vehicles[low].fits(client):
+                        return low
+                    continue
+                middle = (low + high) // 2
+                stack.append((2 * node + 1, middle, high))
+                stack.append((2 * node, low, middle))
+        if start == 0:
+            self._failed = [f for f in self._failed
+                            if not (f[0] >= weight and f[1] >= volume and f[2] >= slots)]
+            self._failed.append((weight, volume, slots))
+        return -1
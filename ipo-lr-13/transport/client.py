@@ -1,15 +1,43 @@
+import math
+
+
 class Client:
-    def __init__(self, name: str, cargo_weight: float, is_vip: bool = False):
+    __slots__ = ("name", "cargo_weight", "is_vip", "volume", "slots")
+
+    def __init__(self, name: str, cargo_weight: float, is_vip: bool = False, volume: float = 0.0, slots: int = 0):
         if not isinstance(name, str) or not name.strip():
             raise ValueError("Имя клиента должно быть непустой строкой.")
-        if not isinstance(cargo_weight, (int, float)) or cargo_weight <= 0:
+        if not isinstance(cargo_weight, (int, float)) or not math.isfinite(cargo_weight) or cargo_weight <= 0:
             raise ValueError("Вес груза должен быть положительным числом.")
         if not isinstance(is_vip, bool):
             raise ValueError("Флаг VIP-статуса должен быть логическим значением.")
+        if isinstance(volume, bool) or not isinstance(volume, (int, float)) or not math.isfinite(volume) or volume < 0:
+            raise ValueError("Объем груза должен быть неотрицательным числом.")
+        if isinstance(slots, bool) or not isinstance(slots, int) or slots < 0:
+            raise ValueError("Число занимаемых мест должно быть неотрицательным целым числом.")
 
         self.name = name.strip()
         self.cargo_weight = float(cargo_weight)
         self.is_vip = is_vip
+        # Объем и число вагонов/отсеков; 0 — измерение грузу не важно
+        self.volume = float(volume)
+        self.slots = slots
+
+    @classmethod
+    def from_trusted(cls, name: str, cargo_weight: float, is_vip: bool = False, volume: float = 0.0, slots: int = 0):
+        # Быстрый путь для массовой загрузки уже проверенных данных: без валидации
+        client = cls.__new__(cls)
+        client.name = name
+        client.cargo_weight = float(cargo_weight)
+        client.is_vip = is_vip
+        client.volume = float(volume)
+        client.slots = slots
+        return client
 
     def __repr__(self):
-        return f"Client(name='{self.name}', cargo_weight={self.cargo_weight}, is_vip={self.is_vip})"
\ No newline at end of file
+        extra = ""
+        if self.volume:
+            extra += f", volume={self.volume}"
+        if self.slots:
+            extra += f", slots={self.slots}"
+        return f"Client(name='{self.name}', cargo_weight={self.cargo_weight}, is_vip={self.is_vip}{extra})"
\ No newline at end of file
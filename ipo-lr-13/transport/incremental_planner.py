@@ -0,0 +1,238 @@
+from bisect import bisect_left, bisect_right, insort
+
+from .capacity_index import CapacityIndex
+from .packing_strategies import best_fit, first_fit, worst_fit
+
+
+class IncrementalPlanner:
+    # Поддерживает готовый план распределения и правит его при единичных
+    # изменениях. Груз размещается по правилу стратегии плана: first-fit — по
+    # индексу остатков, best-fit и worst-fit — среди открытых машин по
+    # отсортированному списку остатков, новая машина — из индекса неначатых;
+    # по весу это O(log m). Компания принимает правку без расчета, если
+    # certified() доказывает, что нераспределенный вес не больше, чем у любого
+    # плана. Иначе правки копятся (check_due), и на каждой CHECK_SHARE-й доле
+    # состава план сравнивается с полным перераспределением (worse_than) и при
+    # проигрыше заменяется им: O(n log n) на (n + m) / CHECK_SHARE правок.
+    # assignment — карта клиент -> транспорт компании; ее обновляют сами
+    # Vehicle.load_cargo/unload_cargo через наблюдателя.
+    # Ожидающие грузы — в списках, упорядоченных по весу (VIP — отдельно), как
+    # остатки в best_fit: при догрузке бисекция отсекает грузы тяжелее
+    # освободившегося места. waiting хранит порядок постановки в очередь.
+    EPSILON = CapacityIndex.EPSILON
+    # Функция размещения стратегии -> правило, которое повторяет планировщик
+    RULES = {first_fit: "first_fit", best_fit: "best_fit", worst_fit: "worst_fit"}
+    CHECK_SHARE = 8
+
+    def __init__(self, vehicles, unassigned, assignment, rule: str = "first_fit"):
+        self.index = CapacityIndex(list(vehicles))
+        self.vehicles = self.index.vehicles
+        self.position = {id(v): i for i, v in enumerate(self.vehicles)}
+        self.rule = rule
+        # best_fit/worst_fit: открытые машины — отсортированные ключи (остаток, позиция),
+        # для worst_fit остаток со знаком минус; неначатые — в отдельном индексе
+        self.opened = []
+        self.keys = {}
+        self.closed = None
+        if rule != "first_fit":
+            self.closed = CapacityIndex([None] * len(self.vehicles))
+            for index in range(len(self.vehicles)):
+                self._sync(index)
+        # Правки без доказанной границы с последней сверки с полным перераспределением
+        self.unchecked = 0
+        self.assignment = assignment
+        self.waiting = {}
+        self.queue = []
+        self.vip_queue = []
+        self.weight = 0.0
+        self.vip_weight = 0.0
+        self._seq = 0
+        self._largest = None
+        for client in unassigned:
+            self._wait(client)
+        self.used = sum(1 for v in self.vehicles if v.clients_list)
+
+    @property
+    def unassigned(self) -> list:
+        return list(self.waiting)
+
+    def _wait(self, client):
+        key = (client.cargo_weight, self._seq)
+        self._seq += 1
+        self.waiting[client] = key
+        insort(self.vip_queue if client.is_vip else self.queue, key + (client,))
+        self.weight += client.cargo_weight
+        if client.is_vip:
+            self.vip_weight += client.cargo_weight
+
+    def _release(self, client):
+        queue = self.vip_queue if client.is_vip else self.queue
+        del queue[bisect_left(queue, self.waiting.pop(client))]
+        self.weight -= client.cargo_weight
+        if client.is_vip:
+            self.vip_weight -= client.cargo_weight
+        # Пустая очередь обнуляет суммы, не накапливая ошибку округления
+        if not self.waiting:
+            self.weight = self.vip_weight = 0.0
+
+    def _sync(self, index):
+        # Переносит машину между открытыми и неначатыми после изменения загрузки
+        if self.closed is None:
+            return
+        key = self.keys.pop(index, None)
+        if key is not None:
+            del self.opened[bisect_left(self.opened, key)]
+        vehicle = self.vehicles[index]
+        if vehicle is not None and vehicle.clients_list:
+            residual = vehicle.capacity - vehicle.current_load
+            key = (residual if self.rule == "best_fit" else -residual, index)
+            self.keys[index] = key
+            insort(self.opened, key)
+            vehicle = None
+        if self.closed.vehicles[index] is not vehicle:
+            self.closed.restore(index, vehicle)
+
+    def _refresh(self, vehicle):
+        index = self.position[id(vehicle)]
+        self.index.update(index)
+        self._sync(index)
+
+    def _find(self, client) -> int:
+        if self.closed is None:
+            return self.index.find_first(client)
+        # Груз с объемом или местами, не вмещающийся никуда, не перебирает открытые машины
+        if (client.volume or client.slots) and self.index.find_first(client) == -1:
+            return -1
+        need = client.cargo_weight - self.EPSILON
+        opened = self.opened
+        if self.rule == "best_fit":
+            for pos in range(bisect_left(opened, (need, -1)), len(opened)):
+                if self.vehicles[opened[pos][1]].fits(client):
+                    return opened[pos][1]
+        else:
+            for residual, index in opened:
+                if -residual < need:
+                    break
+                if self.vehicles[index].fits(client):
+                    return index
+        return self.closed.find_first(client)
+
+    def _place(self, client) -> bool:
+        index = self._find(client)
+        if index == -1:
+            return False
+        vehicle = self.vehicles[index]
+        if not vehicle.clients_list:
+            self.used += 1
+        vehicle.load_cargo(client)
+        self.index.update(index)
+        self._sync(index)
+        return True
+
+    def _fill(self, vehicle):
+        # Догружает освободившийся транспорт ожидающими грузами, VIP первыми, от
+        # тяжелых к легким. Просматриваются только грузы не тяжелее остатка
+        # (и те из них, что не прошли по объему или местам).
+        loaded = False
+        for queue in (self.vip_queue, self.queue):
+            end = bisect_right(queue, (vehicle.capacity - vehicle.current_load, float("inf")))
+            while end:
+                end -= 1
+                client = queue[end][2]
+                if vehicle.fits(client):
+                    if not vehicle.clients_list:
+                        self.used += 1
+                    self._release(client)
+                    vehicle.load_cargo(client)
+                    loaded = True
+                    end = bisect_right(queue, (vehicle.capacity - vehicle.current_load, float("inf")), 0, end)
+        if loaded:
+            self._refresh(vehicle)
+
+    def _oversized(self, queue) -> float:
+        # Вес ожидающих грузов тяжелее самой большой машины: их не разместит ни один план
+        if self._largest is None:
+            self._largest = max((v.capacity for v in self.vehicles if v is not None), default=0.0)
+        weight = 0.0
+        for end in range(len(queue) - 1, -1, -1):
+            if queue[end][0] <= self._largest:
+                break
+            weight += queue[end][0]
+        return weight
+
+    def certified(self, demand: float, vip_demand: float, capacity: float) -> bool:
+        # Нераспределенный вес (VIP и общий) равен нижней границе для любого плана:
+        # грузы тяжелее самой большой машины плюс остаток спроса сверх вместимости
+        if not self.waiting:
+            return True
+        eps = self.EPSILON * max(1.0, demand)
+        vip = self._oversized(self.vip_queue)
+        if self.vip_weight > vip + max(0.0, vip_demand - vip - capacity) + eps:
+            return False
+        oversized = vip + self._oversized(self.queue)
+        return self.weight <= oversized + max(0.0, demand - oversized - capacity) + eps
+
+    def check_due(self, edits: int, size: int) -> bool:
+        # Пора ли сверить план с полным перераспределением: правок без доказанной
+        # границы накопилось не меньше size / CHECK_SHARE (size — клиенты и транспорт)
+        self.unchecked += edits
+        if self.unchecked * self.CHECK_SHARE < size:
+            return False
+        self.unchecked = 0
+        return True
+
+    def worse_than(self, unassigned) -> bool:
+        # Сравнение с планом полного перераспределения: сначала вес VIP-грузов, затем общий
+        vip = sum(c.cargo_weight for c in unassigned if c.is_vip)
+        weight = sum(c.cargo_weight for c in unassigned)
+        eps = self.EPSILON * max(1.0, self.weight, weight)
+        if self.vip_weight > vip + eps:
+            return True
+        return self.vip_weight >= vip - eps and self.weight > weight + eps
+
+    def vehicle_of(self, client):
+        return self.assignment.get(client)
+
+    def add_client(self, client) -> bool:
+        if self._place(client):
+            return True
+        self._wait(client)
+        return False
+
+    def remove_client(self, client) -> bool:
+        vehicle = self.assignment.get(client)
+        if vehicle is None:
+            self._release(client)
+            return True
+        vehicle.unload_cargo(client)
+        if not vehicle.clients_list:
+            self.used -= 1
+        self._refresh(vehicle)
+        self._fill(vehicle)
+        return True
+
+    def add_vehicle(self, vehicle) -> bool:
+        index = self.index.append(vehicle)
+        self.position[id(vehicle)] = index
+        if self.closed is not None:
+            self.closed.append(None)
+            self._sync(index)
+        self._largest = None
+        self._fill(vehicle)
+        return True
+
+    def remove_vehicle(self, vehicle) -> bool:
+        index = self.position.pop(id(vehicle))
+        self.index.remove(index)
+        self._sync(index)
+        self._largest = None
+        moved = sorted(vehicle.clients_list, key=lambda c: not c.is_vip)
+        if moved:
+            self.used -= 1
+        vehicle.reset_load()
+        ok = True
+        for client in moved:
+            if not self._place(client):
+                self._wait(client)
+                ok = False
+        return ok
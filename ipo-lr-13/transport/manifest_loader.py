@@ -0,0 +1,182 @@
+import csv
+import json
+import os
+import sys
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+
+from .bulk_validation_error import BulkValidationError
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+TRUE_VALUES = {"1", "true", "yes", "y", "да"}
+FALSE_VALUES = {"0", "false", "no", "n", "нет", ""}
+MAX_REPORTED_ERRORS = 1000
+
+
+def _number(value, cast):
+    # Неразобранное значение возвращается как есть: его отклонит проверка строки.
+    # "nan" и "inf" float() разбирает — их отклоняет та же проверка (нужны конечные числа)
+    if isinstance(value, str):
+        try:
+            return cast(value.strip())
+        except ValueError:
+            return value
+    return value
+
+
+def _flag(value):
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in TRUE_VALUES:
+            return True
+        if text in FALSE_VALUES:
+            return False
+    return value
+
+
+def _optional(record, key, cast, default):
+    # Пустое или отсутствующее поле — значение по умолчанию (манифесты без новых столбцов)
+    value = record.get(key)
+    if value is None or value == "":
+        return default
+    return _number(value, cast)
+
+
+def _client_row(record):
+    return (record.get("name"), _number(record.get("cargo_weight"), float), _flag(record.get("is_vip", False)),
+            _optional(record, "volume", float, 0.0), _optional(record, "slots", int, 0))
+
+
+def _vehicle_row(record):
+    extra = record.get("extra")
+    if extra is None:
+        extra = record.get("number_of_cars", record.get("max_altitude"))
+    return (record.get("type"), _number(record.get("capacity"), float), _number(extra, int),
+            _optional(record, "volume_capacity", float, None), _optional(record, "holds", int, None))
+
+
+ROW_BUILDERS = {"clients": _client_row, "vehicles": _vehicle_row}
+
+
+def parse_records(kind: str, fmt: str, fields, records) -> list:
+    # Разбор пачки записей файла в строки для add_clients/add_vehicles: для CSV —
+    # списки значений от csv.reader, для JSONL — строки. Функция верхнего уровня —
+    # может выполняться в процессе-обработчике.
+    build = ROW_BUILDERS[kind]
+    if fmt == "csv":
+        return [build(dict(zip(fields, values))) for values in records]
+    rows = []
+    for line in records:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        rows.append(build(record) if isinstance(record, dict) else None)
+    return rows
+
+
+def _csv_chunks(reader, chunk_size: int):
+    # Пачки режутся по записям csv.reader, а не по строкам файла: поле в кавычках
+    # с переводом строки не разрывается между пачками. Пустые строки пропускаются;
+    # для каждой записи запоминается номер ее первой строки в файле.
+    numbers, records = [], []
+    start = reader.line_num + 1
+    for values in reader:
+        if len(values) > 1 or (values and values[0].strip()):
+            numbers.append(start)
+            records.append(values)
+            if len(records) == chunk_size:
+                yield numbers, records
+                numbers, records = [], []
+        start = reader.line_num + 1
+    if records:
+        yield numbers, records
+
+
+def _jsonl_chunks(f, chunk_size: int):
+    numbers, records = [], []
+    for number, line in enumerate(f, 1):
+        if line.strip():
+            numbers.append(number)
+            records.append(line)
+            if len(records) == chunk_size:
+                yield numbers, records
+                numbers, records = [], []
+    if records:
+        yield numbers, records
+
+
+def iter_row_chunks(path: str, kind: str = "clients", chunk_size: int = 50000, workers: int = 1, fmt: str = None):
+    # Потоково читает манифест пачками по chunk_size записей и отдает (номера строк файла, строки).
+    # При workers > 1 разбор идет в пуле процессов; в работе не больше 2 * workers пачек.
+    # path "-" — стандартный ввод; формат тогда задается явно (fmt: "csv" или "jsonl").
+    if kind not in ROW_BUILDERS:
+        raise ValueError(f"Неизвестный тип манифеста: {kind}.")
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError("Размер пачки должен быть положительным целым числом.")
+    if not isinstance(workers, int) or workers <= 0:
+        raise ValueError("Количество процессов должно быть положительным целым числом.")
+    if fmt is None:
+        fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt not in ("csv", "jsonl"):
+        raise ValueError("Поддерживаются только файлы .csv и .jsonl.")
+
+    # utf-8-sig: BOM в начале файла (CSV из Excel) не становится частью первого заголовка
+    source = nullcontext(sys.stdin) if path == "-" else open(path, encoding="utf-8-sig", newline="")
+    with source as f:
+        fields = None
+        if fmt == "csv":
+            reader = csv.reader(f)
+            # Стандартный ввод читается без utf-8-sig: BOM снимается с заголовка отдельно
+            fields = [name.strip().lstrip("\ufeff") for name in next(reader, [])]
+            chunks = _csv_chunks(reader, chunk_size)
+        else:
+            chunks = _jsonl_chunks(f, chunk_size)
+
+        if workers == 1:
+            for numbers, payload in chunks:
+                yield numbers, parse_records(kind, fmt, fields, payload)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for numbers, payload in chunks:
+                pending.append((numbers, executor.submit(parse_records, kind, fmt, fields, payload)))
+                if len(pending) >= 2 * workers:
+                    numbers, future = pending.popleft()
+                    yield numbers, future.result()
+            while pending:
+                numbers, future = pending.popleft()
+                yield numbers, future.result()
+
+
+def _load(company, path: str, kind: str, chunk_size: int, workers: int, fmt: str) -> dict:
+    # Некорректные строки пропускаются и попадают в отчет с номером строки файла
+    add = company.add_clients if kind == "clients" else company.add_vehicles
+    loaded = 0
+    error_count = 0
+    errors = []
+    for numbers, rows in iter_row_chunks(path, kind, chunk_size, workers, fmt):
+        try:
+            loaded += add(rows)
+            continue
+        except BulkValidationError as e:
+            bad = {index for index, _ in e.errors}
+            error_count += len(e.errors)
+            for index, message in e.errors:
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append((numbers[index], message))
+        loaded += add([row for index, row in enumerate(rows) if index not in bad])
+    return {"loaded": loaded, "error_count": error_count, "errors": errors}
+
+
+def load_clients(company, path: str, chunk_size: int = 50000, workers: int = 1, fmt: str = None) -> dict:
+    # CSV: заголовок name,cargo_weight,is_vip[,volume,slots]; JSONL: те же ключи
+    return _load(company, path, "clients", chunk_size, workers, fmt)
+
+
+def load_fleet(company, path: str, chunk_size: int = 50000, workers: int = 1, fmt: str = None) -> dict:
+    # CSV: заголовок type,capacity,extra[,volume_capacity,holds];
+    # JSONL: {"type", "capacity", "number_of_cars" | "max_altitude", "volume_capacity", "holds"}
+    return _load(company, path, "vehicles", chunk_size, workers, fmt)
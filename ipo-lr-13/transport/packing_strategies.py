@@ -0,0 +1,189 @@
+import heapq
+from bisect import bisect_left, insort
+from itertools import islice
+
+from .capacity_index import CapacityIndex
+
+EPSILON = CapacityIndex.EPSILON
+
+
+# Каждая стратегия получает клиентов в порядке обслуживания и транспорт,
+# отсортированный по убыванию грузоподъемности, и возвращает нераспределенных.
+# Груз должен поместиться по всем измерениям (Vehicle.fits); упорядочивание
+# кандидатов ведется по остатку грузоподъемности. best_fit и worst_fit выбирают
+# среди уже открытых машин, а новую открывают, как и first_fit, по порядку парка.
+# Отказ по весу стоит O(1): наибольший остаток — корень дерева, вершина кучи
+# или конец списка. После такого отказа серия следующих грузов тяжелее
+# этого остатка отправляется в нераспределенные целиком, без проверки каждого:
+# остатки только убывают (_reject_heavier). Если серия доходит до конца
+# списка — парк переполнен, перебор заканчивается.
+
+
+def _reject_heavier(clients, start: int, max_residual: float, pending, unassigned) -> int:
+    # Переносит из pending в unassigned грузы с позиции start, пока они тяжелее
+    # max_residual; возвращает их число. Поток клиентов (с отслеживанием
+    # прогресса) позиций не имеет — для него серии не пропускаются.
+    if not isinstance(clients, list):
+        return 0
+    limit = max_residual + EPSILON
+    end = start
+    count = len(clients)
+    while end < count and clients[end].cargo_weight > limit:
+        end += 1
+    unassigned.extend(islice(pending, end - start))
+    return end - start
+
+
+def first_fit(clients, vehicles):
+    # Первый подходящий транспорт — деревья максимумов остатка по измерениям
+    capacity_index = CapacityIndex(vehicles)
+    unassigned = []
+    pending = iter(clients)
+    skipped = 0
+
+    for position, client in enumerate(pending):
+        index = capacity_index.find_first(client)
+        if index == -1:
+            unassigned.append(client)
+            residual = capacity_index.max_residual()
+            if client.cargo_weight > residual + EPSILON:
+                skipped += _reject_heavier(clients, position + skipped + 1, residual, pending, unassigned)
+            continue
+        vehicles[index].load_cargo(client)
+        capacity_index.update(index)
+
+    return unassigned
+
+
+def _opened_index(vehicles):
+    # Индекс открытого (уже загружаемого) транспорта по всем измерениям; неоткрытый — пустые места
+    return CapacityIndex([v if v.clients_list else None for v in vehicles])
+
+
+def _open(closed, opened, vehicles, client) -> int:
+    # Открывает первый по порядку (самый вместительный) неначатый транспорт,
+    # вмещающий груз; -1 — такого нет
+    index = closed.find_first(client)
+    if index != -1:
+        closed.remove(index)
+        if opened is not None:
+            opened.restore(index, vehicles[index])
+    return index
+
+
+def _pop_fitting(heap, vehicles, client) -> int:
+    # Извлекает из кучи открытый транспорт с наибольшим остатком, вмещающий груз
+    # по всем измерениям, либо -1. Перебор останавливается на остатке меньше веса
+    # груза; пропущенные записи возвращаются в кучу.
+    need = client.cargo_weight - EPSILON
+    passed = []
+    index = -1
+    while heap and -heap[0][0] >= need:
+        entry = heapq.heappop(heap)
+        if vehicles[entry[1]].fits(client):
+            index = entry[1]
+            break
+        passed.append(entry)
+    for entry in passed:
+        heapq.heappush(heap, entry)
+    return index
+
+
+def best_fit(clients, vehicles):
+    # Открытый транспорт с наименьшим достаточным остатком — отсортированный список
+    # (остаток, индекс). Новый транспорт открывается, только если груз не помещается
+    # ни в один открытый; неначатые машины — в индексе по порядку парка.
+    slots = sorted((v.capacity - v.current_load, i) for i, v in enumerate(vehicles) if v.clients_list)
+    closed = CapacityIndex([None if v.clients_list else v for v in vehicles])
+    unassigned = []
+    pending = iter(clients)
+    skipped = 0
+    # Индекс открытого транспорта по всем измерениям строится после первого груза
+    # с объемом или местами, не вошедшего ни в одну открытую машину: дальше такие
+    # случаи определяются через индекс, без перебора машин с достаточным весом
+    opened = None
+
+    for position, client in enumerate(pending):
+        weight = client.cargo_weight
+        pos = len(slots)
+        if slots and slots[-1][0] >= weight - EPSILON:
+            pos = bisect_left(slots, (weight - EPSILON, -1))
+            vector = client.volume or client.slots
+            if vector and opened is not None and opened.find_first(client) == -1:
+                pos = len(slots)
+            while pos < len(slots) and not vehicles[slots[pos][1]].fits(client):
+                pos += 1
+            if vector and pos == len(slots) and opened is None:
+                opened = _opened_index(vehicles)
+        if pos < len(slots):
+            index = slots.pop(pos)[1]
+        else:
+            index = _open(closed, opened, vehicles, client)
+            if index == -1:
+                unassigned.append(client)
+                residual = max(slots[-1][0] if slots else float("-inf"), closed.max_residual())
+                if weight > residual + EPSILON:
+                    skipped += _reject_heavier(clients, position + skipped + 1, residual, pending, unassigned)
+                continue
+        vehicle = vehicles[index]
+        vehicle.load_cargo(client)
+        insort(slots, (vehicle.capacity - vehicle.current_load, index))
+        if opened is not None:
+            opened.update(index)
+
+    return unassigned
+
+
+def worst_fit(clients, vehicles):
+    # Открытый транспорт с наибольшим остатком — куча по убыванию остатка. Если
+    # вершина не вмещает груз по объему или местам, поиск идет дальше по куче.
+    # Новый транспорт открывается, только если груз не помещается ни в один открытый.
+    heap = [(-(v.capacity - v.current_load), i) for i, v in enumerate(vehicles) if v.clients_list]
+    heapq.heapify(heap)
+    closed = CapacityIndex([None if v.clients_list else v for v in vehicles])
+    unassigned = []
+    pending = iter(clients)
+    skipped = 0
+    # Как в best_fit: индекс открытого транспорта после первого безуспешного поиска по куче
+    opened = None
+
+    for position, client in enumerate(pending):
+        if heap and vehicles[heap[0][1]].fits(client):
+            index = heap[0][1]
+            vehicle = vehicles[index]
+            vehicle.load_cargo(client)
+            heapq.heapreplace(heap, (-(vehicle.capacity - vehicle.current_load), index))
+            if opened is not None:
+                opened.update(index)
+            continue
+        index = -1
+        if heap and (client.volume or client.slots) and (opened is None or opened.find_first(client) != -1):
+            index = _pop_fitting(heap, vehicles, client)
+            if index == -1 and opened is None:
+                opened = _opened_index(vehicles)
+        if index == -1:
+            index = _open(closed, opened, vehicles, client)
+            if index == -1:
+                unassigned.append(client)
+                residual = max(-heap[0][0] if heap else float("-inf"), closed.max_residual())
+                if client.cargo_weight > residual + EPSILON:
+                    skipped += _reject_heavier(clients, position + skipped + 1, residual, pending, unassigned)
+                continue
+        vehicle = vehicles[index]
+        vehicle.load_cargo(client)
+        heapq.heappush(heap, (-(vehicle.capacity - vehicle.current_load), index))
+        if opened is not None:
+            opened.update(index)
+
+    return unassigned
+
+
+# Имя стратегии -> (сортировать ли грузы по убыванию веса, функция размещения).
+# VIP-клиенты в любом случае обслуживаются первыми.
+STRATEGIES = {
+    "greedy_legacy": (False, first_fit),
+    "ffd": (True, first_fit),
+    "best_fit": (False, best_fit),
+    "bfd": (True, best_fit),
+    "worst_fit": (False, worst_fit),
+}
@@ -0,0 +1,28 @@
+class PlanVersion:
+    # Неизменяемая версия плана распределения. Компания публикует ее заменой
+    # одной ссылки, поэтому читатель (интерфейс, экспорт) без блокировок видит
+    # согласованные загрузку, грузы и сводку одного плана, даже пока идет расчет.
+    # vehicles — кортеж PlannedVehicle в порядке регистрации, unassigned — копии клиентов.
+    __slots__ = ("version", "name", "strategy", "vehicles", "unassigned", "vehicles_used", "stats", "histogram")
+
+    def __init__(self, version: int, name: str, strategy: str, vehicles: tuple, unassigned: tuple,
+                 vehicles_used: int, stats: dict, histogram: list):
+        values = (version, name, strategy, vehicles, unassigned, vehicles_used, stats, tuple(histogram))
+        for key, value in zip(self.__slots__, values):
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Версия плана неизменяема.")
+
+    def __delattr__(self, name):
+        raise AttributeError("Версия плана неизменяема.")
+
+    def find_vehicle(self, vehicle_id: str):
+        for vehicle in self.vehicles:
+            if vehicle.vehicle_id == vehicle_id:
+                return vehicle
+        return None
+
+    def __repr__(self):
+        return (f"PlanVersion(version={self.version}, strategy='{self.strategy}', "
+                f"vehicles_used={self.vehicles_used}, unassigned={len(self.unassigned)})")
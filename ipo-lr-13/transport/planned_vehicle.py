@@ -0,0 +1,31 @@
+from .client import Client
+
+
+def frozen_clients(clients) -> tuple:
+    # Копии клиентов: update_client меняет объекты на месте, а версия плана не должна
+    return tuple(Client.from_trusted(c.name, c.cargo_weight, c.is_vip, c.volume, c.slots) for c in clients)
+
+
+class PlannedVehicle:
+    # Неизменяемая запись о транспорте в опубликованной версии плана. Атрибуты
+    # совпадают с теми, что читают экспорт и интерфейс, поэтому запись можно
+    # передавать туда вместо живого Vehicle.
+    __slots__ = ("vehicle_id", "type_name", "capacity", "current_load", "volume_capacity", "current_volume",
+                 "slot_capacity", "used_slots", "clients_list")
+
+    def __init__(self, vehicle):
+        values = (vehicle.vehicle_id, type(vehicle).__name__, vehicle.capacity, vehicle.current_load,
+                  vehicle.volume_capacity, vehicle.current_volume, vehicle.slot_capacity, vehicle.used_slots,
+                  frozen_clients(vehicle.clients_list))
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Версия плана неизменяема.")
+
+    def __delattr__(self, name):
+        raise AttributeError("Версия плана неизменяема.")
+
+    def __repr__(self):
+        return (f"PlannedVehicle(id='{self.vehicle_id}', type={self.type_name}, capacity={self.capacity}, "
+                f"current_load={self.current_load}, clients={len(self.clients_list)})")
@@ -0,0 +1,327 @@
+import asyncio
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from .bulk_validation_error import BulkValidationError
+from .manifest_loader import ROW_BUILDERS
+from .result_exporter import WRITERS, write_distribution
+
+MAX_BODY = 64 * 1024 * 1024
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+CONTENT_TYPES = {"json": "application/json", "jsonl": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _response(status: int, content_type: str, payload: bytes, keep_alive: bool) -> bytes:
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}; charset=utf-8\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("ascii") + payload
+
+
+def _json(status: int, data) -> tuple:
+    return status, CONTENT_TYPES["json"], json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+async def _read_head(reader):
+    # Строка запроса и заголовки; None — клиент закрыл соединение
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+        raise ValueError("Некорректная строка запроса.")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return parts[0].upper(), parts[1], parts[2], headers
+
+
+def _rows(kind: str, data) -> list:
+    # Тело POST — объект или список объектов с ключами манифеста JSONL
+    build = ROW_BUILDERS[kind]
+    records = data if isinstance(data, list) else [data]
+    return [build(record) if isinstance(record, dict) else None for record in records]
+
+
+class PlanningService:
+    # Локальный HTTP-сервис (asyncio, только стандартная библиотека) над TransportCompany.
+    # Компания держится в памяти с инкрементальным планом. Все изменения и расчеты
+    # выполняются по очереди в одном рабочем потоке: цикл событий только принимает
+    # запросы и сразу отвечает на чтение сводки из последней опубликованной версии.
+    # Всплеск POST /clients (и /vehicles) собирается в одну пачку — один вызов
+    # add_clients и одна правка плана; пока идет расчет, следующая пачка копится.
+    def __init__(self, company, strategy: str = "greedy_legacy", batch_window: float = 0.005,
+                 max_batch: int = 10000):
+        if strategy not in company.STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия распределения: {strategy}.")
+        if not isinstance(batch_window, (int, float)) or batch_window < 0:
+            raise ValueError("Окно сбора пачки должно быть неотрицательным числом.")
+        if not isinstance(max_batch, int) or max_batch <= 0:
+            raise ValueError("Размер пачки должен быть положительным целым числом.")
+        self.company = company
+        self.strategy = strategy
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        # Один поток: TransportCompany не рассчитана на одновременные изменения
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="planner")
+        self._lock = None
+        self._pending = {"clients": [], "vehicles": []}
+        self._flushers = {}
+        self._server = None
+        self.port = None
+        self.version = 0
+        self.summary = None
+        self.counters = {"requests": 0, "batches": 0, "batched_requests": 0, "rejected_requests": 0}
+
+    # --- Работа с компанией (рабочий поток) ---
+
+    def _publish(self):
+        # Сводка собирается, пока компания не меняется; замена ссылки атомарна
+        company = self.company
+        self.version += 1
+        self.summary = {
+            "version": self.version,
+            "strategy": self.strategy,
+            "vehicles_used": company.vehicles_used,
+            "unassigned": len(company.unassigned),
+            "stats": company.stats(),
+        }
+
+    def _optimize(self, strategy: str) -> dict:
+        self.company.optimize_cargo_distribution(strategy, incremental=self.company.supports_incremental(strategy))
+        self.strategy = strategy
+        self._publish()
+        return self.summary
+
+    def _apply(self, kind: str, requests: list) -> list:
+        # Пачка запросов добавления -> результат (словарь или исключение) на каждый запрос
+        add = self.company.add_clients if kind == "clients" else self.company.add_vehicles
+        results = [None] * len(requests)
+        try:
+            add([row for rows in requests for row in rows])
+        except BulkValidationError as e:
+            # Запрос с ошибкой отклоняется целиком, остальные добавляются одной пачкой
+            owners = [(k, i) for k, rows in enumerate(requests) for i in range(len(rows))]
+            errors = {}
+            for index, message in e.errors:
+                k, i = owners[index]
+                errors.setdefault(k, []).append((i, message))
+            for k, request_errors in errors.items():
+                results[k] = BulkValidationError(request_errors)
+            add([row for k, rows in enumerate(requests) if k not in errors for row in rows])
+        self._publish()
+        for k, rows in enumerate(requests):
+            if results[k] is None:
+                results[k] = {"added": len(rows), "version": self.version}
+        return results
+
+    def _export(self, fmt: str) -> bytes:
+        buffer = io.StringIO()
+        write_distribution(self.company, buffer, fmt)
+        return buffer.getvalue().encode("utf-8")
+
+    def _find(self, name: str) -> list:
+        found = []
+        for client in self.company.find_clients(name):
+            vehicle = self.company.where_is(client)
+            found.append({"name": client.name, "cargo_weight": client.cargo_weight, "is_vip": client.is_vip,
+                          "volume": client.volume, "slots": client.slots,
+                          "vehicle_id": None if vehicle is None else vehicle.vehicle_id})
+        return found
+
+    def _unassigned(self) -> list:
+        return [{"name": c.name, "cargo_weight": c.cargo_weight, "is_vip": c.is_vip}
+                for c in self.company.unassigned]
+
+    # --- Асинхронный интерфейс ---
+
+    async def _run(self, function, *args):
+        async with self._lock:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def _flush(self, kind: str):
+        await asyncio.sleep(self.batch_window)
+        async with self._lock:
+            # Пачка забирается, когда рабочий поток свободен: за время предыдущего
+            # расчета в нее попадают все пришедшие запросы
+            pending = self._pending[kind]
+            batch, self._pending[kind] = pending[:self.max_batch], pending[self.max_batch:]
+            if self._pending[kind]:
+                self._flushers[kind] = asyncio.create_task(self._flush(kind))
+            else:
+                del self._flushers[kind]
+            self.counters["batches"] += 1
+            self.counters["batched_requests"] += len(batch)
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self._apply, kind, [rows for rows, _ in batch])
+            except Exception as e:
+                results = [e] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def _add(self, kind: str, rows) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        self._pending[kind].append((list(rows), future))
+        if kind not in self._flushers:
+            self._flushers[kind] = asyncio.create_task(self._flush(kind))
+        try:
+            return await future
+        except BulkValidationError:
+            self.counters["rejected_requests"] += 1
+            raise
+
+    async def add_clients(self, rows) -> dict:
+        # rows — как для TransportCompany.add_clients; возвращает {"added", "version"}
+        return await self._add("clients", rows)
+
+    async def add_vehicles(self, rows) -> dict:
+        return await self._add("vehicles", rows)
+
+    async def optimize(self, strategy: str = None) -> dict:
+        strategy = self.strategy if strategy is None else strategy
+        if strategy not in self.company.STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия распределения: {strategy}.")
+        return await self._run(self._optimize, strategy)
+
+    async def distribution(self, fmt: str = "json") -> bytes:
+        if fmt not in WRITERS:
+            raise ValueError(f"Неподдерживаемый формат экспорта: {fmt}.")
+        return await self._run(self._export, fmt)
+
+    async def find_clients(self, name: str) -> list:
+        return await self._run(self._find, name)
+
+    async def unassigned(self) -> list:
+        return await self._run(self._unassigned)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080):
+        # Первичный расчет плана, затем прием соединений; port=0 — свободный порт
+        self._lock = asyncio.Lock()
+        await self.optimize()
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self._server
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for task in list(self._flushers.values()):
+            task.cancel()
+        for kind, pending in self._pending.items():
+            for _, future in pending:
+                if not future.done():
+                    future.cancel()
+            pending.clear()
+        self._flushers.clear()
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080):
+        server = await self.start(host, port)
+        try:
+            await server.serve_forever()
+        finally:
+            await self.close()
+
+    # --- HTTP ---
+
+    async def _route(self, method: str, target: str, body: bytes) -> tuple:
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        routes = {
+            "/health": ("GET",),
+            "/plan": ("GET",),
+            "/plan/vehicles": ("GET",),
+            "/unassigned": ("GET",),
+            "/clients": ("GET", "POST"),
+            "/vehicles": ("POST",),
+            "/optimize": ("POST",),
+        }
+        if path not in routes:
+            return _json(404, {"error": "Неизвестный адрес."})
+        if method not in routes[path]:
+            return _json(405, {"error": "Метод не поддерживается."})
+
+        if path == "/health":
+            return _json(200, {"status": "ok", "version": self.version})
+        if path == "/plan":
+            return _json(200, {**self.summary, "service": dict(self.counters)})
+        if path == "/plan/vehicles":
+            fmt = query.get("format", "json")
+            payload = await self.distribution(fmt)
+            return 200, CONTENT_TYPES[fmt], payload
+        if path == "/unassigned":
+            return _json(200, await self.unassigned())
+        if path == "/clients" and method == "GET":
+            if "name" not in query:
+                raise ValueError("Укажите имя клиента: /clients?name=...")
+            return _json(200, await self.find_clients(query["name"]))
+
+        data = json.loads(body.decode("utf-8")) if body.strip() else None
+        if path == "/optimize":
+            strategy = data.get("strategy") if isinstance(data, dict) else None
+            return _json(200, await self.optimize(strategy))
+        if data is None:
+            raise ValueError("Пустое тело запроса.")
+        kind = path.lstrip("/")
+        return _json(200, await self._add(kind, _rows(kind, data)))
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> tuple:
+        self.counters["requests"] += 1
+        try:
+            return await self._route(method, target, body)
+        except BulkValidationError as e:
+            return _json(400, {"error": "Некорректные строки.", "errors": e.errors})
+        except ValueError as e:
+            # В том числе ошибки разбора JSON и UTF-8
+            return _json(400, {"error": str(e)})
+        except Exception as e:
+            return _json(500, {"error": f"{type(e).__name__}: {e}"})
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await _read_head(reader)
+                except ValueError as e:
+                    writer.write(_response(*_json(400, {"error": str(e)}), False))
+                    break
+                if head is None:
+                    break
+                method, target, version, headers = head
+                # Длина — только десятичные цифры: int() принял бы и "-1", и "1_000"
+                length = headers.get("content-length", "") or "0"
+                if not (length.isascii() and length.isdigit()):
+                    writer.write(_response(*_json(400, {"error": "Некорректный заголовок Content-Length."}), False))
+                    break
+                length = int(length)
+                if length > MAX_BODY:
+                    writer.write(_response(*_json(413, {"error": "Слишком большое тело запроса."}), False))
+                    break
+                body = await reader.readexactly(length) if length > 0 else b""
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+                writer.write(_response(*await self._dispatch(method, target, body), keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
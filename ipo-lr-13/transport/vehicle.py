@@ -1,24 +1,138 @@
+import math
 import uuid
 
 class Vehicle:
-    def __init__(self, capacity: float):
-        if not isinstance(capacity, (int, float)) or capacity <= 0:
+    __slots__ = ("_id", "capacity", "current_load", "clients_list", "_observer",
+                 "volume_capacity", "current_volume", "slot_capacity", "used_slots")
+    # Значение ограничения «без ограничений» для объема и числа мест
+    UNLIMITED = float("inf")
+
+    def __init__(self, capacity: float, volume_capacity: float = None):
+        if not isinstance(capacity, (int, float)) or not math.isfinite(capacity) or capacity <= 0:
             raise ValueError("Грузоподъемность должна быть положительным числом.")
-        self.vehicle_id = str(uuid.uuid4())
+        if volume_capacity is not None and (not isinstance(volume_capacity, (int, float))
+                                           or not math.isfinite(volume_capacity) or volume_capacity <= 0):
+            raise ValueError("Вместимость по объему должна быть положительным числом.")
+        # ID хранится как 128-битное число и создается при первом обращении
+        self._id = None
         self.capacity = float(capacity)
         self.current_load = 0.0
         self.clients_list = []
+        self.volume_capacity = self.UNLIMITED if volume_capacity is None else float(volume_capacity)
+        self.current_volume = 0.0
+        # Число мест (вагонов, отсеков) задают наследники
+        self.slot_capacity = self.UNLIMITED
+        self.used_slots = 0
+        # Наблюдатель (компания) получает уведомления о загрузке и выгрузке
+        self._observer = None
+
+    @classmethod
+    def from_trusted(cls, capacity: float, volume_capacity: float = None):
+        # Быстрый путь для массовой загрузки уже проверенных данных: без валидации
+        vehicle = cls.__new__(cls)
+        vehicle._id = None
+        vehicle.capacity = float(capacity)
+        vehicle.current_load = 0.0
+        vehicle.clients_list = []
+        vehicle._observer = None
+        vehicle.volume_capacity = cls.UNLIMITED if volume_capacity is None else float(volume_capacity)
+        vehicle.current_volume = 0.0
+        vehicle.slot_capacity = cls.UNLIMITED
+        vehicle.used_slots = 0
+        return vehicle
+
+    @property
+    def vehicle_id(self) -> str:
+        if self._id is None:
+            self._id = uuid.uuid4().int
+        if isinstance(self._id, int):
+            return str(uuid.UUID(int=self._id))
+        return self._id
+
+    @vehicle_id.setter
+    def vehicle_id(self, value: str):
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError("ID транспорта должен быть непустой строкой.")
+        # Числом хранится только ID в канонической записи UUID: любая другая
+        # (верхний регистр, фигурные скобки, urn:uuid:) читается так, как задана
+        try:
+            number = uuid.UUID(value).int
+        except ValueError:
+            number = None
+        if number is not None and str(uuid.UUID(int=number)) == value:
+            self._id = number
+        else:
+            self._id = value
 
     def load_cargo(self, client):
         if not hasattr(client, 'cargo_weight') or not hasattr(client, 'name'):
             raise TypeError("Объект должен быть экземпляром класса Client.")
         if self.current_load + client.cargo_weight > self.capacity:
             raise ValueError("Невозможно загрузить груз: превышает грузоподъемность.")
+        if self.current_volume + client.volume > self.volume_capacity:
+            raise ValueError("Невозможно загрузить груз: превышает вместимость по объему.")
+        if self.used_slots + client.slots > self.slot_capacity:
+            raise ValueError("Невозможно загрузить груз: не хватает свободных вагонов/отсеков.")
         self.current_load += client.cargo_weight
+        self.current_volume += client.volume
+        self.used_slots += client.slots
         self.clients_list.append(client)
+        if self._observer is not None:
+            self._observer._cargo_loaded(self, client)
+
+    def load_many(self, clients):
+        # Загрузка готового списка грузов (перенос плана): те же проверки по итоговым
+        # суммам и одно уведомление наблюдателя вместо уведомления на каждый груз
+        load, volume, slots = self.current_load, self.current_volume, self.used_slots
+        for client in clients:
+            load += client.cargo_weight
+            volume += client.volume
+            slots += client.slots
+        if load > self.capacity:
+            raise ValueError("Невозможно загрузить груз: превышает грузоподъемность.")
+        if volume > self.volume_capacity:
+            raise ValueError("Невозможно загрузить груз: превышает вместимость по объему.")
+        if slots > self.slot_capacity:
+            raise ValueError("Невозможно загрузить груз: не хватает свободных вагонов/отсеков.")
+        self.current_load = load
+        self.current_volume = volume
+        self.used_slots = slots
+        self.clients_list.extend(clients)
+        if self._observer is not None:
+            self._observer._cargo_loaded_many(self, clients)
+
+    def unload_cargo(self, client):
+        try:
+            self.clients_list.remove(client)
+        except ValueError:
+            raise ValueError("Груз этого клиента не загружен в данный транспорт.") from None
+        self.current_load -= client.cargo_weight
+        self.current_volume -= client.volume
+        self.used_slots -= client.slots
+        if not self.clients_list:
+            self.current_load = 0.0
+            self.current_volume = 0.0
+        if self._observer is not None:
+            self._observer._cargo_unloaded(self, client)
+
+    def reset_load(self):
+        if self._observer is not None and self.clients_list:
+            self._observer._load_reset(self)
+        self.current_load = 0.0
+        self.current_volume = 0.0
+        self.used_slots = 0
+        self.clients_list = []
+
+    def has_space_for(self, cargo_weight: float, volume: float = 0.0, slots: int = 0) -> bool:
+        return (self.current_load + cargo_weight <= self.capacity
+                and self.current_volume + volume <= self.volume_capacity
+                and self.used_slots + slots <= self.slot_capacity)
 
-    def has_space_for(self, cargo_weight: float) -> bool:
-        return self.current_load + cargo_weight <= self.capacity
+    def fits(self, client) -> bool:
+        # Проверка по всем измерениям сразу: вес, объем, вагоны/отсеки
+        return (self.current_load + client.cargo_weight <= self.capacity
+                and self.current_volume + client.volume <= self.volume_capacity
+                and self.used_slots + client.slots <= self.slot_capacity)
 
     def __str__(self):
         return f"Транспорт ID: {self.vehicle_id}, грузоподъемность: {self.capacity} т, текущая загрузка: {self.current_load:.2f} т"
\ No newline at end of file
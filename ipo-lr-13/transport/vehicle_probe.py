@@ -0,0 +1,29 @@
+import time
+
+
+class VehicleProbe:
+    # Обертка транспорта для инструментированного прогона: считает проверки
+    # места и время load_cargo, остальное передает исходному объекту
+    __slots__ = ("vehicle", "metrics")
+
+    def __init__(self, vehicle, metrics):
+        self.vehicle = vehicle
+        self.metrics = metrics
+
+    def fits(self, client) -> bool:
+        self.metrics.current["capacity_probes"] += 1
+        return self.vehicle.fits(client)
+
+    def has_space_for(self, *args) -> bool:
+        self.metrics.current["capacity_probes"] += 1
+        return self.vehicle.has_space_for(*args)
+
+    def load_cargo(self, client):
+        run = self.metrics.current
+        start = time.perf_counter()
+        self.vehicle.load_cargo(client)
+        run["load_cargo_s"] += time.perf_counter() - start
+        run["loads"] += 1
+
+    def __getattr__(self, name):
+        return getattr(self.vehicle, name)
@@ -1,7 +1,7 @@
-from transport.client import Client
-from transport.train import Train
-from transport.airplane import Airplane
-from transport.transport_company import TransportCompany
+import sys
+
+# Модули transport импортируются внутри функций: пакетные команды запускаются
+# быстрее и загружают только то, что используют.
 
 def get_float_input(prompt: str) -> float:
     while True:
@@ -36,6 +36,12 @@ def get_bool_input(prompt: str) -> bool:
             print("Введите 'да' или 'нет'.")
 
 def main():
+    from transport.client import Client
+    from transport.train import Train
+    from transport.airplane import Airplane
+    from transport.transport_company import TransportCompany
+    from transport.result_exporter import export_distribution
+
     print("Добро пожаловать в систему управления транспортной компанией")
     company_name = input("Введите название компании: ").strip()
     while not company_name:
@@ -51,9 +57,10 @@ def main():
         print("3. Показать всех клиентов")
         print("4. Показать все транспортные средства")
         print("5. Распределить грузы")
-        print("6. Выйти")
+        print("6. Экспортировать результаты")
+        print("7. Выйти")
 
-        choice = input("Выберите действие (1-6): ").strip()
+        choice = input("Выберите действие (1-7): ").strip()
 
         if choice == '1':
             name = input("Введите имя клиента: ").strip()
@@ -138,11 +145,166 @@ def main():
                     print("\n Все грузы распределены")
 
         elif choice == '6':
+            if company.stats()["vehicles_used"] == 0:
+                print("Нет распределённых грузов для экспорта.")
+                continue
+            path = input("Введите путь к файлу (.json, .jsonl или .csv): ").strip() or "distribution_result.json"
+            try:
+                count = export_distribution(
+                    company, path,
+                    progress=lambda done, total: print(f"\rЗаписано {done} из {total}", end="", flush=True))
+                print(f"\nРезультаты ({count} ТС) сохранены в {path}")
+            except (OSError, ValueError) as e:
+                print(f"Ошибка экспорта: {e}")
+
+        elif choice == '7':
             print("Выход из программы")
             break
 
         else:
             print("Неверный выбор. Попробуйте снова.")
 
+def load_company(args):
+    # Компания из снимка или из манифестов; отчеты загрузчика пишутся в stderr
+    from transport.transport_company import TransportCompany
+    if args.snapshot:
+        return TransportCompany.load_snapshot(args.snapshot), 0
+    if args.clients == "-" and args.fleet == "-":
+        raise ValueError("Со стандартного ввода можно читать только один манифест.")
+    from transport.manifest_loader import load_clients, load_fleet
+
+    company = TransportCompany(args.name)
+    error_count = 0
+    for label, path, load in (("транспорт", args.fleet, load_fleet), ("клиенты", args.clients, load_clients)):
+        if not path:
+            continue
+        fmt = args.input_format if path == "-" else None
+        report = load(company, path, args.chunk_size, args.workers, fmt)
+        error_count += report["error_count"]
+        print(f"{label} ({path}): загружено {report['loaded']}, ошибок {report['error_count']}", file=sys.stderr)
+        for line, message in report["errors"][:10]:
+            print(f"  строка {line}: {message}", file=sys.stderr)
+    return company, error_count
+
+
+def progress_printer(label: str):
+    def progress(done, total):
+        print(f"\r{label}: {done} из {total}", end="", file=sys.stderr, flush=True)
+        if done == total:
+            print(file=sys.stderr)
+    return progress
+
+
+def command_plan(args) -> int:
+    from transport.result_exporter import export_distribution, write_distribution
+
+    company, error_count = load_company(args)
+    unassigned = company.optimize_cargo_distribution(
+        args.strategy, progress=progress_printer("Распределение") if args.progress else None)
+    print(f"Машин задействовано: {company.vehicles_used}, не распределено грузов: {len(unassigned)}",
+          file=sys.stderr)
+
+    export_progress = progress_printer("Экспорт") if args.progress else None
+    if args.out == "-":
+        write_distribution(company, sys.stdout, args.format or "jsonl", export_progress)
+        sys.stdout.flush()
+    else:
+        export_distribution(company, args.out, args.format, export_progress)
+        print(f"Результаты сохранены в {args.out}", file=sys.stderr)
+    if args.save_snapshot:
+        company.save_snapshot(args.save_snapshot)
+    return 1 if args.strict and (error_count or unassigned) else 0
+
+
+def command_stats(args) -> int:
+    import json
+
+    company, error_count = load_company(args)
+    if args.strategy:
+        company.optimize_cargo_distribution(args.strategy)
+    json.dump({"stats": company.stats(), "histogram": company.capacity_histogram(),
+               "feasibility": company.feasibility_report()},
+              sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 1 if args.strict and error_count else 0
+
+
+def command_serve(args) -> int:
+    import asyncio
+    from transport.planning_service import PlanningService
+
+    company, error_count = load_company(args)
+    if args.strict and error_count:
+        return 1
+    service = PlanningService(company, args.strategy, args.batch_window)
+    print(f"Сервис планирования: http://{args.host}:{args.port} (Ctrl+C — остановка)", file=sys.stderr)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+COMMANDS = {"plan": command_plan, "stats": command_stats, "serve": command_serve}
+
+
+def cli(argv) -> int:
+    # Без аргументов — интерактивное меню; иначе пакетные команды без вопросов:
+    #   python main.py plan --clients clients.csv --fleet fleet.csv --strategy ffd --out plan.jsonl
+    #   python main.py stats --snapshot state.snap
+    #   python main.py serve --snapshot state.snap --port 8080
+    if not argv:
+        main()
+        return 0
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="main.py", description="Транспортная компания: пакетный режим")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("plan", "распределить грузы и выгрузить план"),
+                            ("stats", "вывести сводку по компании в JSON"),
+                            ("serve", "запустить локальный HTTP-сервис планирования")):
+        sub = commands.add_parser(name, help=help_text)
+        sub.add_argument("--clients", help="манифест клиентов (.csv/.jsonl, \"-\" — stdin)")
+        sub.add_argument("--fleet", help="манифест транспорта (.csv/.jsonl, \"-\" — stdin)")
+        sub.add_argument("--snapshot", help="снимок состояния вместо манифестов")
+        sub.add_argument("--input-format", choices=("csv", "jsonl"), help="формат манифеста со stdin")
+        sub.add_argument("--name", default="Компания", help="название компании")
+        sub.add_argument("--chunk-size", type=int, default=50000)
+        sub.add_argument("--workers", type=int, default=1, help="процессы для разбора манифестов")
+        sub.add_argument("--strict", action="store_true", help="код возврата 1 при ошибках в данных")
+        if name == "plan":
+            sub.add_argument("--strategy", default="greedy_legacy")
+            sub.add_argument("--out", default="-", help="файл результата (.json/.jsonl/.csv), \"-\" — stdout")
+            sub.add_argument("--format", choices=("json", "jsonl", "csv"), help="формат результата")
+            sub.add_argument("--save-snapshot", help="сохранить состояние после распределения")
+            sub.add_argument("--progress", action="store_true", help="прогресс в stderr")
+        elif name == "stats":
+            sub.add_argument("--strategy", help="перед сводкой выполнить распределение")
+        else:
+            sub.add_argument("--strategy", default="greedy_legacy")
+            sub.add_argument("--host", default="127.0.0.1")
+            sub.add_argument("--port", type=int, default=8080)
+            sub.add_argument("--batch-window", type=float, default=0.005,
+                             help="сколько секунд собирать пачку добавлений")
+
+    args = parser.parse_args(argv)
+    if args.command != "serve" and not args.snapshot and not (args.clients or args.fleet):
+        parser.error("нужен --snapshot или хотя бы один из --clients/--fleet")
+    if "-" in (args.clients, args.fleet) and not args.input_format:
+        parser.error("для чтения из stdin укажите --input-format")
+    try:
+        return COMMANDS[args.command](args)
+    except BrokenPipeError:
+        # Читатель конвейера (например, head) закрыл вывод раньше времени. Остаток
+        # вывода уходит в devnull, чтобы интерпретатор не печатал ошибку при выходе;
+        # код 141 = 128 + SIGPIPE — как у утилит, завершенных этим сигналом
+        import os
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 141
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(cli(sys.argv[1:]))
\ No newline at end of file
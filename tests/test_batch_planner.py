@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from transport.client import Client
+from transport.packing_strategies import first_fit
+from transport.train import Train
+from transport.transport_company import TransportCompany
+
+
+def depot(seed, vehicles=None):
+    rng = random.Random(seed)
+    company = TransportCompany(f"Депо {seed}", plan_cache_size=0)
+    for capacity in vehicles or [rng.randint(10, 40) for _ in range(rng.randint(1, 6))]:
+        company.add_vehicle(Train(capacity, 2))
+    for i in range(rng.randint(5, 40)):
+        company.add_client(Client(f"Клиент {i}", rng.uniform(1, 15), rng.random() < 0.3))
+    return company
+
+
+def plan(company):
+    return [[c.name for c in v.clients_list] for v in company.vehicles], [c.name for c in company.unassigned]
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_batch_plan_matches_each_company(workers):
+    companies = [depot(seed, [30, 20] if seed % 2 else None) for seed in range(6)]
+    expected = []
+    for company in companies:
+        company.optimize_cargo_distribution("ffd")
+        expected.append(plan(company))
+        company.optimize_cargo_distribution("worst_fit")
+
+    results = TransportCompany.plan_batch(companies, workers=workers, strategy="ffd")
+
+    assert [plan(c) for c in companies] == expected
+    assert [r["company"] for r in results] == [c.name for c in companies]
+    assert [r["vehicles_used"] for r in results] == [c.vehicles_used for c in companies]
+    # Одинаковые парки (30, 20) используют один шаблон
+    assert len({r["fleet_template"] for r in results[1::2]}) == 1
+
+
+def test_rebalance_moves_unassigned_cargo():
+    full = TransportCompany("Полное", plan_cache_size=0)
+    full.add_vehicle(Train(10, 2))
+    for i in range(3):
+        full.add_client(Client(f"Груз {i}", 6, i == 2))
+    spare = TransportCompany("Свободное", plan_cache_size=0)
+    spare.add_vehicle(Train(20, 2))
+
+    results = TransportCompany.plan_batch([full, spare], workers=1, rebalance=True)
+
+    assert full.unassigned == [] and spare.unassigned == []
+    assert results[0]["sent"] == 2 and results[1]["received"] == 2
+    assert sorted(c.name for c in spare.vehicles[0].clients_list) == ["Груз 0", "Груз 1"]
+    assert [c.name for c in full.vehicles[0].clients_list] == ["Груз 2"]
+
+
+def test_unpicklable_strategy_rejected_for_process_pool():
+    TransportCompany.register_strategy("лямбда", lambda clients, vehicles: first_fit(clients, vehicles))
+    try:
+        companies = [depot(1), depot(2)]
+        with pytest.raises(ValueError, match="лямбда"):
+            TransportCompany.plan_batch(companies, workers=2, strategy="лямбда")
+        # В одном процессе стратегия работает
+        results = TransportCompany.plan_batch(companies, workers=1, strategy="лямбда")
+        assert len(results) == 2
+    finally:
+        TransportCompany.STRATEGIES = {k: v for k, v in TransportCompany.STRATEGIES.items() if k != "лямбда"}
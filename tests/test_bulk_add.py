@@ -0,0 +1,73 @@
+import pytest
+
+from transport.bulk_validation_error import BulkValidationError
+from transport.client import Client
+from transport.train import Train
+from transport.transport_company import TransportCompany
+
+
+def test_invalid_rows_add_nothing():
+    company = TransportCompany("Пачки")
+    with pytest.raises(BulkValidationError) as error:
+        company.add_clients([("Первый", 5), ("", 3), ("Третий", -1)])
+    assert [index for index, _ in error.value.errors] == [1, 2]
+    assert company.clients == []
+
+
+def test_registered_client_rejected_before_anything_is_added():
+    company = TransportCompany("Пачки")
+    existing = Client("Есть", 2)
+    company.add_client(existing)
+    with pytest.raises(BulkValidationError) as error:
+        company.add_clients([("Новый", 1), existing])
+    assert error.value.errors == [(1, "Клиент уже зарегистрирован в компании.")]
+    assert company.clients == [existing]
+    assert company.stats()["clients"] == 1
+
+
+def test_client_repeated_in_batch():
+    company = TransportCompany("Пачки")
+    client = Client("Дважды", 2)
+    with pytest.raises(BulkValidationError) as error:
+        company.add_clients([client, ("Новый", 1), client])
+    assert error.value.errors == [(2, "Клиент повторяется в пачке.")]
+    assert company.clients == []
+
+
+def test_vehicle_duplicates():
+    company = TransportCompany("Пачки")
+    existing, repeated = Train(10, 2), Train(20, 3)
+    company.add_vehicle(existing)
+    with pytest.raises(BulkValidationError) as error:
+        company.add_vehicles([repeated, ("train", 5, 1), existing, repeated])
+    assert error.value.errors == [(2, "Транспорт уже зарегистрирован в компании."),
+                                  (3, "Транспорт повторяется в пачке.")]
+    assert company.vehicles == [existing]
+    assert company.stats()["vehicles"] == 1
+
+
+def test_equal_rows_are_distinct_clients():
+    # Строки создают новые объекты: одинаковые значения — разные клиенты
+    company = TransportCompany("Пачки")
+    assert company.add_clients([("Тезка", 1), ("Тезка", 1)]) == 2
+    assert len(company.find_clients("Тезка")) == 2
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+def test_non_finite_numbers_rejected(value):
+    company = TransportCompany("Пачки")
+    with pytest.raises(BulkValidationError) as error:
+        company.add_clients([("Вес", value), ("Объем", 1, False, value)])
+    assert [index for index, _ in error.value.errors] == [0, 1]
+    with pytest.raises(BulkValidationError):
+        company.add_vehicles([("train", value, 2)])
+    with pytest.raises(BulkValidationError):
+        company.add_vehicles([("train", 10, 2, value)])
+    with pytest.raises(ValueError):
+        Client("Вес", value)
+    with pytest.raises(ValueError):
+        Client("Объем", 1, False, value)
+    with pytest.raises(ValueError):
+        Train(value, 2)
+    with pytest.raises(ValueError):
+        Train(10, 2, value)
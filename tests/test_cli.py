@@ -0,0 +1,192 @@
+import builtins
+import io
+import json
+import os
+import sys
+
+import pytest
+
+import main
+from transport.planning_service import PlanningService
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8", newline="")
+    return str(path)
+
+
+@pytest.fixture
+def manifests(tmp_path):
+    fleet = write(tmp_path, "fleet.csv", "type,capacity,extra\ntrain,10,2\nairplane,5,9000\n")
+    clients = write(tmp_path, "clients.csv",
+                    "name,cargo_weight,is_vip\nАльфа,6,да\nБета,4,нет\nГамма,3,нет\nДельта,20,нет\n")
+    return fleet, clients
+
+
+def test_plan_to_stdout(manifests, capsys):
+    fleet, clients = manifests
+    assert main.cli(["plan", "--fleet", fleet, "--clients", clients, "--strategy", "ffd"]) == 0
+    out, err = capsys.readouterr()
+    records = [json.loads(line) for line in out.splitlines()]
+    assert [len(r["clients"]) for r in records] == [2, 1]
+    assert records[0]["clients"][0] == {"name": "Альфа", "cargo_weight": 6.0, "is_vip": True}
+    assert "загружено 2" in err and "загружено 4" in err
+    assert "Машин задействовано: 2, не распределено грузов: 1" in err
+
+
+def test_plan_to_file_with_snapshot_then_stats(manifests, tmp_path, capsys):
+    fleet, clients = manifests
+    out_path, snapshot = tmp_path / "plan.csv", tmp_path / "state.snap"
+    assert main.cli(["plan", "--fleet", fleet, "--clients", clients, "--out", str(out_path),
+                     "--save-snapshot", str(snapshot), "--progress"]) == 0
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert "Распределение: 4 из 4" in err and "Экспорт: 2 из 2" in err
+    assert out_path.read_text(encoding="utf-8").splitlines()[0].startswith("vehicle_id,type")
+
+    assert main.cli(["stats", "--snapshot", str(snapshot)]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["stats"]["clients"] == 4
+    assert report["stats"]["clients_loaded"] == 3
+    assert report["stats"]["vehicles_used"] == 2
+    assert len(report["histogram"]) == 10
+    assert report["feasibility"]["oversized_clients"] == 1
+
+
+def test_stats_with_strategy(manifests, capsys):
+    fleet, clients = manifests
+    assert main.cli(["stats", "--fleet", fleet, "--clients", clients]) == 0
+    assert json.loads(capsys.readouterr().out)["stats"]["clients_loaded"] == 0
+    assert main.cli(["stats", "--fleet", fleet, "--clients", clients, "--strategy", "bfd"]) == 0
+    assert json.loads(capsys.readouterr().out)["stats"]["clients_loaded"] == 3
+
+
+def test_strict_exit_codes(manifests, tmp_path, capsys):
+    fleet, clients = manifests
+    # Не распределен груз тяжелее любой машины
+    assert main.cli(["plan", "--fleet", fleet, "--clients", clients, "--strict"]) == 1
+    broken = write(tmp_path, "broken.csv", "name,cargo_weight\nАльфа,1\nБета,abc\n")
+    assert main.cli(["stats", "--fleet", fleet, "--clients", broken]) == 0
+    assert main.cli(["stats", "--fleet", fleet, "--clients", broken, "--strict"]) == 1
+    assert "строка 3: Вес груза должен быть положительным числом." in capsys.readouterr().err
+    fitting = write(tmp_path, "fitting.csv", "name,cargo_weight\nАльфа,1\n")
+    assert main.cli(["plan", "--fleet", fleet, "--clients", fitting, "--strict"]) == 0
+
+
+def test_manifest_from_stdin(manifests, monkeypatch, capsys):
+    fleet, _ = manifests
+    monkeypatch.setattr(sys, "stdin", io.StringIO('{"name": "Альфа", "cargo_weight": 2}\n'))
+    assert main.cli(["plan", "--fleet", fleet, "--clients", "-", "--input-format", "jsonl",
+                     "--format", "csv"]) == 0
+    out = capsys.readouterr().out
+    assert out.splitlines()[1].split(",")[8:] == ["Альфа", "2.0", "False", "0.0", "0"]
+
+
+def test_closed_pipe_exits_with_sigpipe_status(manifests, monkeypatch, capsys):
+    # Вывод в конвейер, читатель которого уже закрылся (plan ... | head)
+    fleet, clients = manifests
+    read_end, write_end = os.pipe()
+
+    class ClosedPipe(io.StringIO):
+        def write(self, text):
+            raise BrokenPipeError
+
+        def fileno(self):
+            return write_end
+
+    monkeypatch.setattr(sys, "stdout", ClosedPipe())
+    try:
+        assert main.cli(["plan", "--fleet", fleet, "--clients", clients]) == 141
+    finally:
+        os.close(read_end)
+        os.close(write_end)
+    assert "Ошибка" not in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("argv", [
+    ["plan"],
+    ["plan", "--clients", "-"],
+    ["plan", "--clients", "x.csv", "--format", "xml"],
+    ["unknown"],
+])
+def test_usage_errors_exit_with_code_2(argv, capsys):
+    with pytest.raises(SystemExit) as e:
+        main.cli(argv)
+    assert e.value.code == 2
+    assert "usage: main.py" in capsys.readouterr().err
+
+
+def test_runtime_errors_exit_with_code_1(manifests, tmp_path, capsys):
+    fleet, clients = manifests
+    assert main.cli(["plan", "--fleet", fleet, "--clients", clients, "--strategy", "нет такой"]) == 1
+    assert "Ошибка: Неизвестная стратегия распределения: нет такой." in capsys.readouterr().err
+    assert main.cli(["plan", "--clients", str(tmp_path / "нет.csv")]) == 1
+    assert main.cli(["plan", "--clients", "-", "--fleet", "-", "--input-format", "csv"]) == 1
+    assert "только один манифест" in capsys.readouterr().err
+    assert main.cli(["stats", "--snapshot", str(tmp_path / "нет.snap")]) == 1
+
+
+def test_serve(manifests, monkeypatch, capsys):
+    fleet, clients = manifests
+    calls = []
+
+    async def serve(self, host, port):
+        calls.append((self.company.stats()["clients"], self.strategy, host, port))
+
+    monkeypatch.setattr(PlanningService, "serve", serve)
+    assert main.cli(["serve", "--fleet", fleet, "--clients", clients, "--port", "9000", "--strategy", "ffd"]) == 0
+    assert calls == [(4, "ffd", "127.0.0.1", 9000)]
+    assert "http://127.0.0.1:9000" in capsys.readouterr().err
+
+    async def interrupted(self, host, port):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(PlanningService, "serve", interrupted)
+    assert main.cli(["serve", "--fleet", fleet]) == 0
+
+
+def test_serve_strict_stops_on_bad_manifest(manifests, tmp_path, monkeypatch):
+    fleet, _ = manifests
+    broken = write(tmp_path, "broken.csv", "name,cargo_weight\nБета,abc\n")
+
+    async def serve(self, host, port):
+        raise AssertionError("сервис не должен запускаться")
+
+    monkeypatch.setattr(PlanningService, "serve", serve)
+    assert main.cli(["serve", "--fleet", fleet, "--clients", broken, "--strict"]) == 1
+
+
+def run_menu(monkeypatch, answers):
+    answers = iter(answers)
+    monkeypatch.setattr(builtins, "input", lambda prompt="": next(answers))
+    assert main.cli([]) == 0
+
+
+def test_menu_export(monkeypatch, tmp_path, capsys):
+    path = tmp_path / "menu.jsonl"
+    run_menu(monkeypatch, [
+        "Меню",
+        "6",
+        "1", "Альфа", "4", "да",
+        "2", "1", "10", "2",
+        "5",
+        "6", str(path),
+        "7",
+    ])
+    out = capsys.readouterr().out
+    assert "Нет распределённых грузов для экспорта." in out
+    assert f"Результаты (1 ТС) сохранены в {path}" in out
+    assert json.loads(path.read_text(encoding="utf-8"))["clients"][0]["name"] == "Альфа"
+
+
+def test_menu_export_error(monkeypatch, tmp_path, capsys):
+    run_menu(monkeypatch, [
+        "Меню",
+        "1", "Альфа", "4", "нет",
+        "2", "2", "10", "9000",
+        "5",
+        "6", str(tmp_path / "plan.xml"),
+        "7",
+    ])
+    assert "Ошибка экспорта: Неподдерживаемый формат экспорта: xml." in capsys.readouterr().out
@@ -0,0 +1,169 @@
+import random
+import threading
+
+from transport.client import Client
+from transport.train import Train
+from transport.transport_company import TransportCompany
+
+
+def concurrent_company(vehicles=20, clients=200, seed=0):
+    rng = random.Random(seed)
+    company = TransportCompany("Версии", concurrent=True, plan_cache_size=0)
+    company.add_vehicles([Train(rng.uniform(10, 40), 3) for _ in range(vehicles)])
+    company.add_clients([Client(f"Клиент {i}", rng.uniform(0.5, 8), rng.random() < 0.2) for i in range(clients)])
+    company.optimize_cargo_distribution()
+    return company
+
+
+def assert_version_consistent(version):
+    names = []
+    for vehicle in version.vehicles:
+        assert abs(vehicle.current_load - sum(c.cargo_weight for c in vehicle.clients_list)) < 1e-6
+        assert vehicle.current_load <= vehicle.capacity + 1e-9
+        names.extend(c.name for c in vehicle.clients_list)
+    names.extend(c.name for c in version.unassigned)
+    # Клиент в версии либо в одной машине, либо среди нераспределенных
+    assert len(names) == len(set(names))
+    assert version.vehicles_used == sum(1 for v in version.vehicles if v.clients_list)
+    assert version.stats["vehicles"] == len(version.vehicles)
+    assert version.stats["clients_loaded"] == sum(len(v.clients_list) for v in version.vehicles)
+
+
+def test_edits_do_not_publish_until_plan_is_read():
+    company = concurrent_company()
+    first = company.plan()
+    assert company.plan() is first
+    for i in range(10):
+        company.add_client(Client(f"Новый {i}", 1))
+    # Десять правок — одна новая версия, собранная при чтении
+    second = company.plan()
+    assert second.version == first.version + 1
+    assert company.plan() is second
+    assert second.stats["clients"] == first.stats["clients"] + 10
+
+
+def test_unchanged_parts_of_version_are_reused():
+    company = concurrent_company()
+    first = company.plan()
+    waiting = Client("Ожидающий", 1)
+    company.add_client(waiting)
+    second = company.plan()
+    # Груз не двигался: записи транспорта и копии нераспределенных те же
+    assert second.vehicles is first.vehicles
+    assert second.unassigned is first.unassigned
+
+    loaded = next(v for v in company.vehicles if v.clients_list)
+    company.remove_client(loaded.clients_list[0])
+    third = company.plan()
+    assert third.vehicles is not second.vehicles
+    unchanged = [v for v in company.vehicles if v is not loaded]
+    for vehicle, before, after in zip(company.vehicles, second.vehicles, third.vehicles):
+        if vehicle in unchanged:
+            assert after is before
+    assert_version_consistent(third)
+
+
+def test_plan_is_consistent_under_concurrent_writers():
+    company = concurrent_company(seed=1)
+    stop = threading.Event()
+    errors = []
+    versions = []
+
+    def writer(seed):
+        rng = random.Random(seed)
+        try:
+            for i in range(150):
+                op = rng.random()
+                if op < 0.4:
+                    company.add_client(Client(f"Поток {seed}-{i}", rng.uniform(0.5, 8)))
+                elif op < 0.7 and company.clients:
+                    try:
+                        company.remove_client(rng.choice(company.clients))
+                    except ValueError:
+                        # Клиента успел удалить другой поток
+                        pass
+                elif op < 0.8:
+                    company.add_vehicle(Train(rng.uniform(10, 40), 3))
+                else:
+                    company.optimize_cargo_distribution(rng.choice(["greedy_legacy", "ffd", "best_fit"]))
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        try:
+            while not stop.is_set():
+                version = company.plan()
+                assert_version_consistent(version)
+                versions.append(version.version)
+        except Exception as e:
+            errors.append(e)
+
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    writers = [threading.Thread(target=writer, args=(seed,)) for seed in range(3)]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    assert not errors
+    assert versions
+    final = company.plan()
+    assert_version_consistent(final)
+    assert final.stats["clients"] == len(company.clients)
+    assert final.stats["vehicles"] == len(company.vehicles)
+
+
+def test_edits_during_snapshot_solve_are_rebased():
+    company = TransportCompany("Версии", concurrent=True, plan_cache_size=0)
+    small, large, removed = Train(10, 2), Train(30, 3), Train(20, 2)
+    company.add_vehicles([small, large, removed])
+    clients = [Client(f"Клиент {i}", 5) for i in range(8)]
+    company.add_clients(clients)
+    late = Client("Поздний VIP", 4, True)
+    edits = []
+
+    def progress(done, total):
+        # Вызывается посреди расчета на копиях, вне блокировки компании
+        if not edits and done == 0:
+            edits.append(True)
+            company.remove_vehicle(removed)
+            company.remove_client(clients[0])
+            company.add_client(late)
+
+    unassigned = company.optimize_cargo_distribution("ffd", progress=progress)
+
+    assert edits
+    assert not removed.clients_list
+    loaded = [c for v in company.vehicles for c in v.clients_list]
+    assert clients[0] not in loaded and clients[0] not in unassigned
+    # Новый клиент размещен поверх перенесенного плана
+    assert late in loaded
+    assert sorted(map(id, loaded + unassigned)) == sorted(map(id, company.clients))
+    for vehicle in company.vehicles:
+        assert vehicle.current_load <= vehicle.capacity + 1e-9
+    assert company.vehicles_used == sum(1 for v in company.vehicles if v.clients_list)
+    assert_version_consistent(company.plan())
+    assert company.plan().stats["clients_loaded"] == len(loaded)
+
+
+def test_rebase_keeps_transferred_cargo_and_places_vip_leftovers_first():
+    company = TransportCompany("Версии", concurrent=True, plan_cache_size=0)
+    train = Train(10, 3)
+    company.add_vehicle(train)
+    early = Client("Ранний", 2)
+    company.add_client(early)
+    regular, vip = Client("Обычный", 6), Client("VIP", 6, True)
+
+    def progress(done, total):
+        # Обычный клиент добавлен раньше VIP, но среди оставшихся VIP размещается первым
+        if done == 0 and regular not in company.clients:
+            company.add_client(regular)
+            company.add_client(vip)
+
+    unassigned = company.optimize_cargo_distribution(progress=progress)
+    assert train.clients_list == [early, vip]
+    assert unassigned == [regular]
+    assert company.where_is(vip) is train
@@ -0,0 +1,65 @@
+import tracemalloc
+
+import pytest
+
+from transport.client import Client
+from transport.distribution_cancelled import DistributionCancelled
+from transport.distribution_metrics import PHASES, DistributionMetrics
+from transport.train import Train
+from transport.transport_company import TransportCompany
+
+
+def company(concurrent=False):
+    result = TransportCompany("Метрики", concurrent=concurrent)
+    for capacity in (10, 20):
+        result.add_vehicle(Train(capacity, 2))
+    for i in range(6):
+        result.add_client(Client(f"Клиент {i}", 4, i == 0))
+    return result
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_run_is_recorded(concurrent):
+    metrics = DistributionMetrics(trace_memory=True)
+    unassigned = company(concurrent).optimize_cargo_distribution(metrics=metrics)
+
+    run = metrics.last
+    assert list(run["phases"]) == list(PHASES)
+    assert run["loads"] == 6 - len(unassigned)
+    assert run["capacity_probes"] >= run["loads"]
+    assert "peak_memory_bytes" in run and "memory_before" not in run
+    assert not tracemalloc.is_tracing()
+    assert "transport_distribution_runs_total 1" in metrics.to_prometheus()
+    spans = metrics.to_spans()["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [span["name"] for span in spans] == ["optimize_cargo_distribution", *PHASES]
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_failed_run_stops_tracing_and_is_discarded(concurrent):
+    metrics = DistributionMetrics(trace_memory=True)
+    with pytest.raises(ValueError):
+        company(concurrent).optimize_cargo_distribution("нет такой", metrics=metrics)
+    assert not tracemalloc.is_tracing()
+    assert metrics.current is None and metrics.last is None
+    assert metrics.totals["runs"] == 0
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_cancelled_run_stops_tracing_and_is_discarded(concurrent):
+    metrics = DistributionMetrics(trace_memory=True)
+    with pytest.raises(DistributionCancelled):
+        company(concurrent).optimize_cargo_distribution(metrics=metrics, should_stop=lambda: True)
+    assert not tracemalloc.is_tracing()
+    assert metrics.last is None
+
+
+def test_external_tracing_left_running():
+    tracemalloc.start()
+    try:
+        metrics = DistributionMetrics(trace_memory=True)
+        with pytest.raises(ValueError):
+            company().optimize_cargo_distribution("нет такой", metrics=metrics)
+        company().optimize_cargo_distribution(metrics=metrics)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,126 @@
+import random
+
+import pytest
+
+from transport.client import Client
+from transport.packing_strategies import STRATEGIES
+from transport.train import Train
+from transport.transport_company import TransportCompany
+from transport.vehicle import Vehicle
+
+
+def fleet(capacities, volume_capacity=None):
+    vehicles = []
+    for capacity in sorted(capacities, reverse=True):
+        vehicle = Vehicle.from_trusted(capacity, volume_capacity)
+        vehicles.append(vehicle)
+    return vehicles
+
+
+def overloaded_stream(seed):
+    # Парк заполняется рано, дальше идут серии тяжелых грузов вперемешку с легкими
+    rng = random.Random(seed)
+    clients = []
+    for i in range(rng.randint(20, 80)):
+        weight = rng.choice([rng.uniform(0.5, 3), rng.uniform(5, 15), rng.uniform(15, 30)])
+        clients.append(Client.from_trusted(f"Клиент {i}", weight, rng.random() < 0.2, rng.uniform(0, 2), 0))
+    return clients, [rng.uniform(5, 20) for _ in range(rng.randint(1, 5))]
+
+
+def placement(vehicles):
+    return [[c.name for c in v.clients_list] for v in vehicles]
+
+
+@pytest.mark.parametrize("seed", range(40))
+@pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+def test_skipping_heavier_runs_matches_checking_each(strategy, seed):
+    decreasing, place = STRATEGIES[strategy]
+    clients, capacities = overloaded_stream(seed)
+    if decreasing:
+        clients.sort(key=lambda c: (not c.is_vip, -c.cargo_weight))
+    else:
+        clients.sort(key=lambda c: not c.is_vip)
+    for volume_capacity in (None, 4.0):
+        skipping, checking = fleet(capacities, volume_capacity), fleet(capacities, volume_capacity)
+        # Список — с пропуском серий; итератор позиций не имеет, каждый груз проверяется
+        skipped = place(list(clients), skipping)
+        checked = place(iter(clients), checking)
+        assert [c.name for c in skipped] == [c.name for c in checked]
+        assert placement(skipping) == placement(checking)
+
+
+def oversized_company():
+    company = TransportCompany("Оценка")
+    company.add_vehicles([Train(10, 5), Train(5, 5)])
+    company.add_clients([Client("VIP большой", 12, True), Client("Большой", 11),
+                         Client("VIP", 4, True), Client("Обычный", 3)])
+    return company
+
+
+def test_report_bounds_with_oversized_vip_and_regular_cargo():
+    company = oversized_company()
+    report = company.feasibility_report()
+    assert report == {
+        "total_capacity": 15.0,
+        "largest_capacity": 10.0,
+        "max_residual": 10.0,
+        "demand": 30.0,
+        "vip_demand": 16.0,
+        "oversized_clients": 2,
+        "oversized_vip": 1,
+        # Грузы тяжелее самой большой машины требуют новых машин целиком
+        "extra_capacity_lower": 23.0,
+        # План еще не рассчитан: не хватает всего спроса
+        "extra_capacity_upper": 30.0,
+        "vip_extra_capacity_lower": 12.0,
+        "vip_extra_capacity_upper": 16.0,
+    }
+
+    company.optimize_cargo_distribution()
+    report = company.feasibility_report()
+    assert report["max_residual"] == 5.0
+    # После распределения верхняя оценка совпала с нижней: не вошли только негабаритные
+    assert report["extra_capacity_upper"] == report["extra_capacity_lower"] == 23.0
+    assert report["vip_extra_capacity_upper"] == report["vip_extra_capacity_lower"] == 12.0
+
+
+def test_report_bounds_without_oversized_cargo():
+    company = TransportCompany("Оценка")
+    company.add_vehicle(Train(10, 5))
+    company.add_clients([Client("VIP", 6, True), Client("Обычный", 6)])
+    company.optimize_cargo_distribution()
+    report = company.feasibility_report()
+    assert report["oversized_clients"] == report["oversized_vip"] == 0
+    assert report["extra_capacity_lower"] == 2.0
+    assert report["extra_capacity_upper"] == 6.0
+    assert report["vip_extra_capacity_lower"] == report["vip_extra_capacity_upper"] == 0.0
+
+
+def test_report_on_feasible_and_empty_company():
+    company = TransportCompany("Оценка")
+    assert company.feasibility_report()["extra_capacity_lower"] == 0.0
+    company.add_vehicle(Train(10, 5))
+    company.add_client(Client("Обычный", 10))
+    company.optimize_cargo_distribution()
+    report = company.feasibility_report()
+    # Груз ровно по грузоподъемности — не негабарит
+    assert report["oversized_clients"] == 0
+    assert report["extra_capacity_lower"] == report["extra_capacity_upper"] == 0.0
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_lower_bound_never_exceeds_unassigned_weight(seed):
+    rng = random.Random(seed)
+    company = TransportCompany("Оценка")
+    company.add_vehicles([Train(rng.uniform(5, 20), 5) for _ in range(rng.randint(1, 4))])
+    company.add_clients([Client(f"Клиент {i}", rng.uniform(0.5, 25), rng.random() < 0.3)
+                         for i in range(rng.randint(1, 30))])
+    for strategy in sorted(STRATEGIES):
+        unassigned = company.optimize_cargo_distribution(strategy)
+        report = company.feasibility_report()
+        weight = sum(c.cargo_weight for c in unassigned)
+        vip_weight = sum(c.cargo_weight for c in unassigned if c.is_vip)
+        assert report["extra_capacity_lower"] <= report["extra_capacity_upper"] + 1e-6
+        assert report["extra_capacity_upper"] == pytest.approx(weight, abs=1e-6)
+        assert report["vip_extra_capacity_lower"] <= report["vip_extra_capacity_upper"] + 1e-6
+        assert report["vip_extra_capacity_upper"] == pytest.approx(vip_weight, abs=1e-6)
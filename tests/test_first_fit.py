@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from transport.airplane import Airplane
+from transport.client import Client
+from transport.first_fit_tree import FirstFitTree
+from transport.train import Train
+from transport.transport_company import TransportCompany
+
+
+def legacy_plan(clients, vehicles):
+    # Прежний цикл optimize_cargo_distribution: для каждого клиента (VIP первыми)
+    # перебор транспорта по убыванию грузоподъемности до первого с местом
+    sorted_clients = sorted(clients, key=lambda c: not c.is_vip)
+    sorted_vehicles = sorted(vehicles, key=lambda v: v.capacity, reverse=True)
+    loads = {v: 0.0 for v in sorted_vehicles}
+    plan = {v: [] for v in sorted_vehicles}
+    unassigned = []
+    for client in sorted_clients:
+        for vehicle in sorted_vehicles:
+            if loads[vehicle] + client.cargo_weight <= vehicle.capacity:
+                loads[vehicle] += client.cargo_weight
+                plan[vehicle].append(client)
+                break
+        else:
+            unassigned.append(client)
+    return plan, unassigned
+
+
+def random_company(seed):
+    rng = random.Random(seed)
+    company = TransportCompany(f"Депо {seed}")
+    for _ in range(rng.randint(1, 40)):
+        # Целые значения дают точные совпадения остатка и веса, дробные — обычный случай
+        capacity = rng.choice([rng.randint(5, 60), rng.uniform(5, 60)])
+        if rng.random() < 0.5:
+            company.add_vehicle(Train(capacity, rng.randint(1, 10)))
+        else:
+            company.add_vehicle(Airplane(capacity, rng.randint(1000, 12000)))
+    for i in range(rng.randint(0, 300)):
+        weight = rng.choice([rng.randint(1, 20), rng.uniform(0.1, 30)])
+        company.add_client(Client(f"Клиент {i}", weight, rng.random() < 0.2))
+    return company
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_tree_plan_matches_legacy_loop(seed):
+    company = random_company(seed)
+    expected, expected_unassigned = legacy_plan(company.clients, company.vehicles)
+
+    unassigned = company.optimize_cargo_distribution()
+
+    assert unassigned == expected_unassigned
+    for vehicle in company.vehicles:
+        assert vehicle.clients_list == expected[vehicle]
+    assert company.vehicles_used == sum(1 for clients in expected.values() if clients)
+
+
+def test_find_first_after_updates():
+    tree = FirstFitTree([5.0, 3.0, 8.0, 1.0])
+    assert tree.find_first(4.0) == 0
+    tree.update(0, 2.0)
+    assert tree.find_first(4.0) == 2
+    assert tree.find_first(4.0, start=3) == -1
+    assert tree.find_first(9.0) == -1
+    assert tree.append(6.0) == 4
+    assert tree.find_first(6.0, start=3) == 4
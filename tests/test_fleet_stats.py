@@ -0,0 +1,238 @@
+import random
+
+import pytest
+
+from transport.airplane import Airplane
+from transport.client import Client
+from transport.packing_strategies import STRATEGIES
+from transport.train import Train
+from transport.transport_company import TransportCompany
+
+
+def recomputed(company):
+    # Сводка полным обходом парка и клиентов — эталон для накопительных счетчиков
+    vehicles = company.vehicles
+    loaded = [c for v in vehicles for c in v.clients_list]
+    loaded_weight = sum(v.current_load for v in vehicles)
+    total = sum(v.capacity for v in vehicles)
+    demand = sum(c.cargo_weight for c in company.clients)
+    vip_loaded = sum(c.cargo_weight for c in loaded if c.is_vip)
+    by_type = {}
+    for v in vehicles:
+        kind = type(v).__name__
+        by_type[kind] = by_type.get(kind, 0.0) + v.capacity - v.current_load
+    return {
+        "vehicles": len(vehicles),
+        "vehicles_used": sum(1 for v in vehicles if v.clients_list),
+        "clients": len(company.clients),
+        "clients_loaded": len(loaded),
+        "clients_unassigned": len(company.clients) - len(loaded),
+        "total_capacity": total,
+        "loaded_weight": loaded_weight,
+        "free_capacity": total - loaded_weight,
+        "utilization": loaded_weight / total if total else 0.0,
+        "demand": demand,
+        "unassigned_weight": demand - loaded_weight,
+        "vip_demand": sum(c.cargo_weight for c in company.clients if c.is_vip),
+        "vip_loaded_weight": vip_loaded,
+        "vip_share": vip_loaded / loaded_weight if loaded_weight else 0.0,
+        "free_capacity_by_type": by_type,
+    }
+
+
+def recomputed_histogram(company):
+    vehicles, free = [0] * 10, [0.0] * 10
+    for v in company.vehicles:
+        index = min(9, int(v.current_load / v.capacity * 10))
+        vehicles[index] += 1
+        free[index] += v.capacity - v.current_load
+    return vehicles, free
+
+
+def assert_consistent(company):
+    stats, expected = company.stats(), recomputed(company)
+    assert stats.keys() == expected.keys()
+    for key, value in expected.items():
+        if key == "free_capacity_by_type":
+            assert stats[key].keys() == value.keys()
+            for kind, free in value.items():
+                assert stats[key][kind] == pytest.approx(free, abs=1e-6)
+        else:
+            assert stats[key] == pytest.approx(value, abs=1e-6), key
+    vehicles, free = recomputed_histogram(company)
+    histogram = company.capacity_histogram()
+    assert [b["vehicles"] for b in histogram] == vehicles
+    assert [b["free_capacity"] for b in histogram] == pytest.approx(free, abs=1e-6)
+
+
+def test_empty_company():
+    company = TransportCompany("Статистика")
+    stats = company.stats()
+    assert stats["vehicles"] == stats["clients"] == 0
+    assert stats["utilization"] == stats["vip_share"] == 0.0
+    assert stats["free_capacity_by_type"] == {}
+    histogram = company.capacity_histogram()
+    assert [(b["from"], b["to"]) for b in histogram] == [(k / 10, (k + 1) / 10) for k in range(10)]
+    assert all(b["vehicles"] == 0 and b["free_capacity"] == 0.0 for b in histogram)
+
+
+def test_counters_after_load_and_unload():
+    company = TransportCompany("Статистика")
+    train, airplane = Train(10, 5), Airplane(20, 9000)
+    company.add_vehicles([train, airplane])
+    vip, regular, light = Client("VIP", 4, True), Client("Обычный", 6), Client("Легкий", 2)
+    company.add_clients([vip, regular, light])
+    assert company.stats()["free_capacity_by_type"] == {"Train": 10.0, "Airplane": 20.0}
+
+    train.load_cargo(vip)
+    train.load_cargo(regular)
+    airplane.load_cargo(light)
+    stats = company.stats()
+    assert stats["vehicles_used"] == 2
+    assert stats["clients_loaded"] == 3 and stats["clients_unassigned"] == 0
+    assert stats["loaded_weight"] == 12.0
+    assert stats["vip_loaded_weight"] == 4.0
+    assert stats["vip_share"] == pytest.approx(4 / 12)
+    assert stats["free_capacity_by_type"] == {"Train": 0.0, "Airplane": 18.0}
+    assert_consistent(company)
+
+    train.unload_cargo(vip)
+    airplane.unload_cargo(light)
+    stats = company.stats()
+    assert stats["vehicles_used"] == 1
+    assert stats["clients_loaded"] == 1 and stats["clients_unassigned"] == 2
+    assert stats["vip_loaded_weight"] == 0.0
+    assert stats["free_capacity_by_type"] == {"Train": 4.0, "Airplane": 20.0}
+    assert_consistent(company)
+
+
+def test_counters_after_load_many_and_reset():
+    company = TransportCompany("Статистика")
+    train = Train(10, 5)
+    company.add_vehicle(train)
+    clients = [Client("VIP", 3, True), Client("Обычный", 5)]
+    company.add_clients(clients)
+    train.load_many(clients)
+    assert company.stats()["clients_loaded"] == 2
+    assert company.stats()["vehicles_used"] == 1
+    assert_consistent(company)
+    train.reset_load()
+    stats = company.stats()
+    assert stats["clients_loaded"] == stats["vehicles_used"] == 0
+    assert stats["loaded_weight"] == stats["vip_loaded_weight"] == 0.0
+    assert_consistent(company)
+
+
+def test_counters_after_remove_and_replace_vehicle():
+    company = TransportCompany("Статистика")
+    train, airplane = Train(10, 5), Airplane(8, 9000)
+    company.add_vehicles([train, airplane])
+    company.add_clients([Client("VIP", 6, True), Client("Обычный", 7)])
+    company.optimize_cargo_distribution()
+    assert_consistent(company)
+
+    # Замена поезда самолетом: тип Train исчезает из сводки вместе с последней машиной
+    bigger = Airplane(12, 9000)
+    company.replace_vehicle(train, bigger)
+    stats = company.stats()
+    # Груз поезда вернулся в очередь, самолет остался загруженным
+    assert stats["free_capacity_by_type"] == {"Airplane": 13.0}
+    assert stats["clients_loaded"] == stats["clients_unassigned"] == 1
+    assert stats["vip_loaded_weight"] == 0.0
+    assert_consistent(company)
+
+    company.optimize_cargo_distribution()
+    company.remove_vehicle(airplane)
+    stats = company.stats()
+    assert stats["vehicles"] == 1
+    assert stats["total_capacity"] == 12.0
+    assert_consistent(company)
+
+    company.remove_vehicle(bigger)
+    stats = company.stats()
+    assert stats["vehicles"] == stats["vehicles_used"] == stats["clients_loaded"] == 0
+    assert stats["total_capacity"] == 0.0
+    assert stats["free_capacity_by_type"] == {}
+    assert stats["unassigned_weight"] == 13.0
+    assert_consistent(company)
+
+
+def test_counters_after_remove_client():
+    company = TransportCompany("Статистика")
+    company.add_vehicle(Train(10, 5))
+    vip, regular = Client("VIP", 4, True), Client("Обычный", 3)
+    company.add_clients([vip, regular])
+    company.optimize_cargo_distribution()
+    company.remove_client(vip)
+    stats = company.stats()
+    assert stats["clients"] == stats["clients_loaded"] == 1
+    assert stats["vip_demand"] == stats["vip_loaded_weight"] == 0.0
+    assert_consistent(company)
+    company.remove_client(regular)
+    assert company.stats()["demand"] == 0.0
+    assert_consistent(company)
+
+
+@pytest.mark.parametrize("load, index", [
+    (0.0, 0),
+    (0.5, 0),
+    (1.0, 1),
+    (4.99, 4),
+    (5.0, 5),
+    (9.99, 9),
+    # Полностью загруженная машина попадает в последнюю корзину, а не за ее пределы
+    (10.0, 9),
+])
+def test_histogram_bucket_edges(load, index):
+    company = TransportCompany("Статистика")
+    train = Train(10, 5)
+    company.add_vehicle(train)
+    if load:
+        client = Client("Груз", load)
+        company.add_client(client)
+        train.load_cargo(client)
+    histogram = company.capacity_histogram()
+    assert [b["vehicles"] for b in histogram] == [int(k == index) for k in range(10)]
+    assert histogram[index]["free_capacity"] == pytest.approx(10.0 - load)
+    assert sum(b["free_capacity"] for b in histogram) == pytest.approx(company.stats()["free_capacity"])
+
+
+def test_histogram_moves_vehicle_between_buckets():
+    company = TransportCompany("Статистика")
+    trains = [Train(10, 5), Train(20, 5)]
+    company.add_vehicles(trains)
+    client = Client("Груз", 5)
+    company.add_client(client)
+    trains[1].load_cargo(client)
+    assert [b["vehicles"] for b in company.capacity_histogram()][:3] == [1, 0, 1]
+    trains[1].unload_cargo(client)
+    trains[0].load_cargo(client)
+    histogram = company.capacity_histogram()
+    assert histogram[0]["vehicles"] == 1 and histogram[0]["free_capacity"] == 20.0
+    assert histogram[5]["vehicles"] == 1 and histogram[5]["free_capacity"] == 5.0
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_counters_match_recomputation_under_random_edits(seed):
+    rng = random.Random(seed)
+    company = TransportCompany("Статистика")
+    company.add_vehicles([Train(rng.uniform(5, 20), 5) for _ in range(3)])
+    company.add_clients([Client(f"Клиент {i}", rng.uniform(0.5, 8), rng.random() < 0.3) for i in range(10)])
+    incremental = False
+    for step in range(40):
+        action = rng.randrange(6)
+        if action == 0:
+            company.add_client(Client(f"Новый {step}", rng.uniform(0.5, 8), rng.random() < 0.3))
+        elif action == 1 and company.clients:
+            company.remove_client(rng.choice(company.clients))
+        elif action == 2:
+            kind = rng.choice([Train, Airplane])
+            company.add_vehicle(kind(rng.uniform(5, 20), 5 if kind is Train else 9000))
+        elif action == 3 and len(company.vehicles) > 1:
+            company.remove_vehicle(rng.choice(company.vehicles))
+        elif action == 4 and company.vehicles:
+            company.replace_vehicle(rng.choice(company.vehicles), Airplane(rng.uniform(5, 20), 9000))
+        else:
+            company.optimize_cargo_distribution(rng.choice(sorted(STRATEGIES)), incremental=incremental)
+            incremental = not incremental
+        assert_consistent(company)
@@ -0,0 +1,239 @@
+import random
+
+import pytest
+
+from transport.client import Client
+from transport.packing_strategies import STRATEGIES, first_fit
+from transport.train import Train
+from transport.vehicle import Vehicle
+from transport.transport_company import TransportCompany
+
+
+def overloaded_company():
+    # Два вагона по 10 т и грузы на 30 т: часть всегда остается нераспределенной
+    company = TransportCompany("Перегруз", plan_cache_size=0)
+    for _ in range(2):
+        company.add_vehicle(Train(10, 2))
+    for i, weight in enumerate([6, 6, 4, 4, 5, 5]):
+        company.add_client(Client(f"Клиент {i}", weight))
+    company.optimize_cargo_distribution(incremental=True)
+    return company
+
+
+def assert_consistent(company):
+    loaded = [c for v in company.vehicles for c in v.clients_list]
+    assert sorted(map(id, loaded + company.unassigned)) == sorted(map(id, company.clients))
+    assert company.vehicles_used == sum(1 for v in company.vehicles if v.clients_list)
+    for vehicle in company.vehicles:
+        assert vehicle.current_load <= vehicle.capacity + 1e-9
+
+
+def test_removal_on_overloaded_fleet_is_patched():
+    company = overloaded_company()
+    planner = company._planner
+    waiting = company.unassigned
+    assert waiting
+
+    loaded = company.vehicles[0].clients_list[0]
+    company.remove_client(loaded)
+
+    # Полного перераспределения не было, освободившееся место занял ожидающий груз
+    assert company._planner is planner
+    assert len(company.unassigned) < len(waiting)
+    assert_consistent(company)
+
+
+def test_waiting_client_removed_without_rebuild():
+    company = overloaded_company()
+    planner = company._planner
+    client = company.unassigned[-1]
+    company.remove_client(client)
+    assert company._planner is planner
+    assert client not in company.unassigned
+    assert_consistent(company)
+
+
+def unassigned_key(unassigned):
+    # Нераспределенный вес: сначала VIP, затем общий
+    return (sum(c.cargo_weight for c in unassigned if c.is_vip), sum(c.cargo_weight for c in unassigned))
+
+
+def repack_key(company):
+    # Полное перераспределение того же состава той же стратегией в отдельной компании
+    copy = TransportCompany("Копия", plan_cache_size=0)
+    for vehicle in company.vehicles:
+        copy.add_vehicle(Train(vehicle.capacity, vehicle.slot_capacity))
+    for client in company.clients:
+        copy.add_client(client)
+    return unassigned_key(copy.optimize_cargo_distribution(company._strategy))
+
+
+def assert_no_worse_than_repack(company):
+    vip, weight = unassigned_key(company.unassigned)
+    full_vip, full_weight = repack_key(company)
+    assert vip <= full_vip + 1e-6
+    if abs(vip - full_vip) <= 1e-6:
+        assert weight <= full_weight + 1e-6
+
+
+def test_patch_at_lower_bound_is_kept():
+    # Без машины на 10 т остается вместимость 10 т при спросе 30 т: меньше 20 т
+    # не оставит ни один план, правку можно принять без расчета
+    company = overloaded_company()
+    planner = company._planner
+    company.remove_vehicle(company.vehicles[0])
+    assert company._planner is planner
+    assert sum(c.cargo_weight for c in company.unassigned) == pytest.approx(20)
+    assert_consistent(company)
+
+
+def test_waiting_vip_displaces_regular_cargo():
+    # После удаления VIP-груза на 3 т освободившегося места не хватает ожидающему
+    # VIP-грузу на 8 т, пока загружен обычный груз на 4 т: правка проигрывает
+    # полному перераспределению и заменяется им
+    company = TransportCompany("VIP", plan_cache_size=0)
+    company.add_vehicle(Train(10, 1))
+    clients = [Client("c0", 1, True), Client("c1", 8), Client("c2", 3, True),
+               Client("c3", 8, True), Client("c4", 4)]
+    for client in clients:
+        company.add_client(client)
+    company.optimize_cargo_distribution(incremental=True)
+    assert company.unassigned == [clients[3], clients[1]]
+
+    company.remove_client(clients[2])
+    assert company.vehicles[0].clients_list == [clients[0], clients[3]]
+    assert clients[4] in company.unassigned
+    assert_no_worse_than_repack(company)
+    assert_consistent(company)
+
+    # Новый план тоже инкрементальный
+    company.remove_client(clients[3])
+    assert company._planner is not None
+    assert_consistent(company)
+
+
+def test_vip_weight_compared_first():
+    # Груз не помещается ни при каком плане, но становится VIP: прибавился вес VIP
+    company = overloaded_company()
+    planner = company._planner
+    company.update_client(company.unassigned[0], is_vip=True)
+    assert company._planner is not planner
+    assert_consistent(company)
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_random_edits_keep_plan_consistent(seed):
+    rng = random.Random(seed)
+    company = TransportCompany(f"Правки {seed}", plan_cache_size=0)
+    for _ in range(rng.randint(1, 8)):
+        company.add_vehicle(Train(rng.uniform(5, 30), 1))
+    for i in range(rng.randint(0, 40)):
+        company.add_client(Client(f"Клиент {i}", rng.uniform(0.5, 10), rng.random() < 0.3))
+    company.optimize_cargo_distribution(rng.choice(sorted(STRATEGIES)), incremental=True)
+
+    for _ in range(60):
+        op = rng.random()
+        if op < 0.35:
+            company.add_client(Client("Новый", rng.uniform(0.5, 10), rng.random() < 0.3))
+        elif op < 0.6 and company.clients:
+            company.remove_client(rng.choice(company.clients))
+        elif op < 0.75 and company.clients:
+            company.update_client(rng.choice(company.clients), cargo_weight=rng.uniform(0.5, 10),
+                                  is_vip=rng.random() < 0.5)
+        elif op < 0.85:
+            company.add_vehicle(Train(rng.uniform(5, 30), 1))
+        elif op < 0.93 and len(company.vehicles) > 1:
+            company.remove_vehicle(rng.choice(company.vehicles))
+        elif company.vehicles:
+            company.replace_vehicle(rng.choice(company.vehicles), Train(rng.uniform(5, 30), 2))
+        assert_consistent(company)
+        # Гарантия действует в точках сверки: на нижней границе или сразу после сравнения
+        if company._planner.unchecked == 0:
+            assert_no_worse_than_repack(company)
+
+
+@pytest.mark.parametrize("strategy", ["greedy_legacy", "best_fit", "worst_fit"])
+@pytest.mark.parametrize("seed", range(10))
+def test_added_clients_follow_strategy(strategy, seed):
+    # Грузы, добавленные по одному к пустому плану, размещаются так же, как
+    # стратегия размещает их в порядке поступления
+    rng = random.Random(seed)
+    capacities = [rng.uniform(5, 30) for _ in range(6)]
+    clients = [Client(f"Клиент {i}", rng.uniform(0.5, 10)) for i in range(30)]
+    company = TransportCompany("Стратегия", plan_cache_size=0)
+    company.add_vehicles([Train(capacity, 1) for capacity in capacities])
+    company.optimize_cargo_distribution(strategy, incremental=True)
+    for client in clients:
+        company.add_client(client)
+
+    shadows = [Vehicle.from_trusted(capacity) for capacity in sorted(capacities, reverse=True)]
+    unassigned = STRATEGIES[strategy][1](clients, shadows)
+    vehicles = sorted(company.vehicles, key=lambda v: v.capacity, reverse=True)
+    assert [v.clients_list for v in vehicles] == [v.clients_list for v in shadows]
+    assert company.unassigned == unassigned
+
+
+def test_best_fit_picks_tightest_opened_vehicle():
+    company = TransportCompany("Best fit", plan_cache_size=0)
+    big, small = Train(20, 1), Train(13, 1)
+    company.add_vehicles([big, small])
+    company.add_clients([Client("Крупный", 12), Client("Средний", 9)])
+    company.optimize_cargo_distribution("best_fit", incremental=True)
+    assert [len(big.clients_list), len(small.clients_list)] == [1, 1]
+    # Остатки 8 т и 4 т: груз на 3 т уходит в машину с меньшим остатком, на 5 т — в большую
+    light, heavier = Client("Легкий", 3), Client("Тяжелее", 5)
+    company.add_client(light)
+    company.add_client(heavier)
+    assert company.where_is(light) is small
+    assert company.where_is(heavier) is big
+
+
+def test_worst_fit_picks_loosest_opened_vehicle():
+    company = TransportCompany("Worst fit", plan_cache_size=0)
+    big, small, spare = Train(20, 1), Train(10, 1), Train(30, 1)
+    company.add_vehicles([big, small])
+    company.add_clients([Client("Крупный", 16), Client("Средний", 2)])
+    company.optimize_cargo_distribution("worst_fit", incremental=True)
+    company.add_vehicle(spare)
+    # Открыты машины с остатками 4 т и 8 т; неначатая на 30 т открывается, только
+    # если груз не помещается ни в одну открытую
+    client = Client("Груз", 3)
+    company.add_client(client)
+    assert company.where_is(client) is small
+    heavy = Client("Тяжелый", 9)
+    company.add_client(heavy)
+    assert company.where_is(heavy) is spare
+
+
+def test_custom_strategy_is_refused_in_incremental_mode():
+    TransportCompany.register_strategy("своя", lambda clients, vehicles: first_fit(clients, vehicles))
+    try:
+        company = TransportCompany("Своя", plan_cache_size=0)
+        company.add_vehicle(Train(10, 1))
+        company.add_client(Client("Груз", 4))
+        assert not company.supports_incremental("своя")
+        assert company.supports_incremental("bfd")
+        with pytest.raises(ValueError):
+            company.optimize_cargo_distribution("своя", incremental=True)
+        assert company._planner is None
+        assert company.optimize_cargo_distribution("своя") == []
+    finally:
+        del TransportCompany.STRATEGIES["своя"]
+
+
+def test_repack_checks_are_amortized(monkeypatch):
+    # В переполненном парке полное перераспределение выполняется раз на
+    # (клиенты + транспорт) / CHECK_SHARE правок, а не на каждой правке
+    company = TransportCompany("Перегруз", plan_cache_size=0)
+    company.add_vehicles([Train(10, 1) for _ in range(4)])
+    company.add_clients([Client(f"Клиент {i}", 7) for i in range(60)])
+    company.optimize_cargo_distribution(incremental=True)
+    repacks = []
+    plan_order = company._plan_order
+    monkeypatch.setattr(company, "_plan_order", lambda strategy: repacks.append(strategy) or plan_order(strategy))
+
+    for i in range(32):
+        company.add_client(Client(f"Новый {i}", 7))
+        assert_consistent(company)
+    size = len(company.clients) + len(company.vehicles)
+    assert 1 <= len(repacks) <= 32 * company._planner.CHECK_SHARE // size + 1
@@ -0,0 +1,166 @@
+import random
+
+import pytest
+
+from transport.client import Client
+from transport.train import Train
+from transport.transport_company import TransportCompany
+
+
+def test_registration_keeps_vehicle_ids_lazy():
+    company = TransportCompany("Индексы")
+    company.add_vehicles([("train", 10, 2)] * 100)
+    company.add_vehicle(Train(20, 3))
+    assert all(v._id is None for v in company.vehicles)
+
+
+def test_find_vehicle_follows_fleet_changes():
+    company = TransportCompany("Индексы")
+    first, second = Train(10, 2), Train(20, 3)
+    company.add_vehicle(first)
+    assert company.find_vehicle(first.vehicle_id) is first
+
+    # После первого поиска карта поддерживается при каждом изменении парка
+    company.add_vehicle(second)
+    assert company.find_vehicle(second.vehicle_id) is second
+    replacement = Train(30, 4)
+    company.replace_vehicle(first, replacement)
+    assert company.find_vehicle(replacement.vehicle_id) is replacement
+    company.remove_vehicle(second)
+    assert company.find_vehicle(second.vehicle_id) is None
+    assert company.find_vehicle("нет такого") is None
+
+
+def test_where_is_follows_loading():
+    company = TransportCompany("Индексы")
+    train = Train(10, 2)
+    client = Client("Клиент", 4)
+    company.add_vehicle(train)
+    company.add_client(client)
+    assert company.where_is(client) is None
+    company.optimize_cargo_distribution()
+    assert company.where_is(client) is train
+    train.unload_cargo(client)
+    assert company.where_is(client) is None
+
+
+def loaded_company():
+    company = TransportCompany("Индексы")
+    for capacity in (10, 10, 10):
+        company.add_vehicle(Train(capacity, 2))
+    for i in range(3):
+        company.add_client(Client(f"Клиент {i}", 8))
+    company.optimize_cargo_distribution()
+    assert company.vehicles_used == 3
+    return company
+
+
+def test_vehicles_used_after_fleet_changes_without_planner():
+    company = loaded_company()
+    company.remove_vehicle(company.vehicles[0])
+    assert company.vehicles_used == 2
+    company.replace_vehicle(company.vehicles[0], Train(10, 2))
+    assert company.vehicles_used == 1
+    assert company.vehicles_used == company.stats()["vehicles_used"]
+
+
+def test_vehicles_used_after_unloading():
+    company = loaded_company()
+    company.remove_client(company.vehicles[0].clients_list[0])
+    assert company.vehicles_used == 2
+    vehicle = company.vehicles[1]
+    vehicle.unload_cargo(vehicle.clients_list[0])
+    assert company.vehicles_used == 1
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_vehicles_used_under_random_edits(seed):
+    rng = random.Random(seed)
+    company = TransportCompany("Индексы")
+    for _ in range(rng.randint(1, 6)):
+        company.add_vehicle(Train(rng.uniform(5, 30), 1))
+    for i in range(rng.randint(0, 30)):
+        company.add_client(Client(f"Клиент {i}", rng.uniform(0.5, 10)))
+    company.optimize_cargo_distribution()
+    for _ in range(40):
+        op = rng.random()
+        if op < 0.3 and company.clients:
+            company.remove_client(rng.choice(company.clients))
+        elif op < 0.5 and company.clients:
+            company.update_client(rng.choice(company.clients), cargo_weight=rng.uniform(0.5, 10))
+        elif op < 0.65 and len(company.vehicles) > 1:
+            company.remove_vehicle(rng.choice(company.vehicles))
+        elif op < 0.8 and company.vehicles:
+            company.replace_vehicle(rng.choice(company.vehicles), Train(rng.uniform(5, 30), 2))
+        elif op < 0.9:
+            company.add_client(Client("Новый", rng.uniform(0.5, 10)))
+        else:
+            company.optimize_cargo_distribution()
+        assert company.vehicles_used == sum(1 for v in company.vehicles if v.clients_list)
+
+
+@pytest.mark.parametrize("vehicle_id", [
+    "abcdef01-2345-6789-abcd-ef0123456789",
+    "ABCDEF01-2345-6789-ABCD-EF0123456789",
+    "{abcdef01-2345-6789-abcd-ef0123456789}",
+    "urn:uuid:abcdef01-2345-6789-abcd-ef0123456789",
+    "abcdef0123456789abcdef0123456789",
+    "Поезд-7",
+])
+def test_assigned_vehicle_id_reads_back_verbatim(vehicle_id):
+    company = TransportCompany("Индексы")
+    train = Train(10, 2)
+    train.vehicle_id = vehicle_id
+    company.add_vehicle(train)
+    assert train.vehicle_id == vehicle_id
+    assert company.find_vehicle(vehicle_id) is train
+
+    # Замена сохраняет ID в той же записи
+    replacement = Train(20, 3)
+    company.replace_vehicle(train, replacement)
+    assert replacement.vehicle_id == vehicle_id
+    assert company.find_vehicle(vehicle_id) is replacement
+
+
+def test_updated_loaded_client_waits_without_planner():
+    company = loaded_company()
+    client = company.vehicles[0].clients_list[0]
+    company.update_client(client, cargo_weight=5)
+    assert company.where_is(client) is None
+    assert company.unassigned == [client]
+    loaded = [c for v in company.vehicles for c in v.clients_list]
+    assert sorted(map(id, loaded + company.unassigned)) == sorted(map(id, company.clients))
+
+    # Уже ожидающий клиент не дублируется в очереди
+    company.update_client(client, name="Переименованный")
+    assert company.unassigned == [client]
+
+
+def test_returned_unassigned_list_is_not_mutated():
+    company = loaded_company()
+    returned = company.unassigned
+    company.remove_vehicle(company.vehicles[0])
+    company.replace_vehicle(company.vehicles[0], Train(10, 2))
+    company.update_client(company.vehicles[1].clients_list[0], cargo_weight=3)
+    assert returned == []
+    assert len(company.unassigned) == 3
+
+    waiting = company.unassigned
+    company.remove_client(waiting[0])
+    assert len(waiting) == 3
+    assert len(company.unassigned) == 2
+
+
+def test_replace_with_registered_vehicle_is_rejected():
+    company = loaded_company()
+    first, second = company.vehicles[:2]
+    second_id = second.vehicle_id
+    for new in (second, first):
+        with pytest.raises(ValueError):
+            company.replace_vehicle(first, new)
+    # Ничего не изменилось: ни парк, ни ID, ни индекс
+    assert company.vehicles[:2] == [first, second]
+    assert len(company.vehicles) == 3
+    assert second.vehicle_id == second_id
+    assert company.find_vehicle(first.vehicle_id) is first
+    assert company.stats()["vehicles"] == 3
@@ -0,0 +1,112 @@
+import io
+import sys
+
+import pytest
+
+from transport.manifest_loader import load_clients, load_fleet
+from transport.transport_company import TransportCompany
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8", newline="")
+    return str(path)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("chunk_size", [1, 2, 50])
+def test_csv_blank_lines_and_quoted_newlines(tmp_path, chunk_size, workers):
+    path = write(tmp_path, "clients.csv",
+                 "name,cargo_weight,is_vip\n"
+                 "Первый,5,да\n"
+                 "\n"
+                 "\"Второй\nс переносом\",3,нет\n"
+                 "   \n"
+                 "Третий,abc,нет\n"
+                 "\"Четвертый\n\nв три строки\",2,да\n"
+                 ",1,нет\n")
+    company = TransportCompany("Манифест")
+    report = load_clients(company, path, chunk_size=chunk_size, workers=workers)
+
+    assert [c.name for c in company.clients] == ["Первый", "Второй\nс переносом", "Четвертый\n\nв три строки"]
+    assert report["loaded"] == 3
+    # Номера строк файла учитывают пропущенные пустые строки и многострочные поля
+    assert report["errors"] == [(7, "Вес груза должен быть положительным числом."),
+                                (11, "Имя клиента должно быть непустой строкой.")]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3])
+def test_jsonl_blank_lines_skipped(tmp_path, chunk_size):
+    path = write(tmp_path, "fleet.jsonl",
+                 '{"type": "train", "capacity": 50, "number_of_cars": 3}\n'
+                 "\n"
+                 "  \n"
+                 '{"type": "airplane", "capacity": 20, "max_altitude": 9000}\n'
+                 '{"type": "bus", "capacity": 1, "extra": 1}\n')
+    company = TransportCompany("Манифест")
+    report = load_fleet(company, path, chunk_size=chunk_size)
+    assert report["loaded"] == 2
+    assert report["errors"] == [(5, "Неизвестный тип транспорта.")]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_csv_with_byte_order_mark(tmp_path, workers):
+    # Excel сохраняет «CSV UTF-8» с BOM перед первым заголовком
+    path = tmp_path / "clients.csv"
+    path.write_bytes("\ufeffname,cargo_weight,is_vip\nПервый,5,да\nВторой,3,нет\n".encode("utf-8"))
+    company = TransportCompany("Манифест")
+    report = load_clients(company, str(path), workers=workers)
+    assert report == {"loaded": 2, "error_count": 0, "errors": []}
+    assert [(c.name, c.cargo_weight, c.is_vip) for c in company.clients] == [("Первый", 5.0, True), ("Второй", 3.0, False)]
+
+
+def test_jsonl_with_byte_order_mark(tmp_path):
+    path = tmp_path / "fleet.jsonl"
+    path.write_bytes('\ufeff{"type": "train", "capacity": 50, "number_of_cars": 3}\n'.encode("utf-8"))
+    company = TransportCompany("Манифест")
+    assert load_fleet(company, str(path))["loaded"] == 1
+
+
+def test_csv_with_byte_order_mark_from_stdin(monkeypatch):
+    stream = io.StringIO("\ufeffname,cargo_weight\nПервый,5\n", newline="")
+    monkeypatch.setattr(sys, "stdin", stream)
+    company = TransportCompany("Манифест")
+    assert load_clients(company, "-", fmt="csv")["loaded"] == 1
+    assert company.clients[0].name == "Первый"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_csv_non_finite_numbers_rejected(tmp_path, workers):
+    path = write(tmp_path, "clients.csv",
+                 "name,cargo_weight,is_vip,volume\n"
+                 "Первый,5,да,\n"
+                 "Второй,nan,нет,\n"
+                 "Третий,inf,нет,\n"
+                 "Четвертый,-inf,нет,\n"
+                 "Пятый,2,нет,NaN\n")
+    company = TransportCompany("Манифест")
+    report = load_clients(company, path, chunk_size=2, workers=workers)
+    assert [c.name for c in company.clients] == ["Первый"]
+    assert report["errors"] == [(3, "Вес груза должен быть положительным числом."),
+                                (4, "Вес груза должен быть положительным числом."),
+                                (5, "Вес груза должен быть положительным числом."),
+                                (6, "Объем груза должен быть неотрицательным числом.")]
+    assert company.stats()["demand"] == 5.0
+
+
+def test_jsonl_non_finite_numbers_rejected(tmp_path):
+    # json принимает NaN и Infinity как числа
+    path = write(tmp_path, "fleet.jsonl",
+                 '{"type": "train", "capacity": NaN, "number_of_cars": 3}\n'
+                 '{"type": "train", "capacity": Infinity, "number_of_cars": 3}\n'
+                 '{"type": "train", "capacity": "inf", "number_of_cars": 3}\n'
+                 '{"type": "train", "capacity": 10, "number_of_cars": 3, "volume_capacity": "nan"}\n'
+                 '{"type": "airplane", "capacity": 20, "max_altitude": 9000}\n')
+    company = TransportCompany("Манифест")
+    report = load_fleet(company, path)
+    assert report["loaded"] == 1
+    assert report["errors"] == [(1, "Грузоподъемность должна быть положительным числом."),
+                                (2, "Грузоподъемность должна быть положительным числом."),
+                                (3, "Грузоподъемность должна быть положительным числом."),
+                                (4, "Вместимость по объему должна быть положительным числом.")]
+    assert company.stats()["total_capacity"] == 20.0
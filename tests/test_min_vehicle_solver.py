@@ -0,0 +1,158 @@
+import itertools
+import time
+
+import pytest
+
+from transport import min_vehicle_solver
+from transport.client import Client
+from transport.train import Train
+from transport.transport_company import TransportCompany
+
+
+def brute_force_min(weights, capacities):
+    # Наименьшее число занятых машин среди всех размещений грузов; None — не помещаются
+    best = None
+    for placement in itertools.product(range(len(capacities)), repeat=len(weights)):
+        loads = [0.0] * len(capacities)
+        for w, j in zip(weights, placement):
+            loads[j] += w
+        if all(load <= c + 1e-9 for load, c in zip(loads, capacities)):
+            used = len(set(placement))
+            if best is None or used < best:
+                best = used
+    return best
+
+
+# (веса по убыванию, грузоподъемности по убыванию, минимальное число машин);
+# во всех примерах FFD размещает все грузы, в первых двух — на лишней машине
+INSTANCES = [
+    ([9.0, 8.0, 7.0, 1.0], [15.0, 13.0, 13.0, 9.0], 2),
+    ([9.0, 7.0, 7.0], [14.0, 13.0, 13.0], 2),
+    ([4.0, 4.0, 3.0, 3.0, 3.0, 3.0], [10.0, 10.0, 10.0], 2),
+    ([6.0, 5.0, 3.0, 3.0, 2.0, 1.0], [14.0, 9.0, 9.0], 2),
+    ([7.0, 4.0, 4.0, 3.0, 3.0, 3.0], [12.0, 10.0, 9.0, 8.0], 3),
+    ([9.0, 7.0, 4.0, 4.0, 3.0, 1.0], [14.0, 10.0, 8.0], 3),
+    ([8.0, 5.0, 5.0, 4.0, 2.0, 2.0], [13.0, 13.0, 12.0], 2),
+    ([6.0, 6.0, 3.0, 2.0, 2.0, 1.0], [15.0, 15.0, 14.0, 14.0], 2),
+    ([9.0, 8.0, 6.0, 5.0, 1.0, 1.0], [15.0, 15.0], 2),
+    ([8.0, 8.0, 7.0, 4.0, 2.0, 2.0], [15.0, 9.0, 9.0], 3),
+    ([8.0, 7.0, 6.0, 4.0, 2.0, 1.0], [9.0, 9.0, 8.0, 8.0], 4),
+    ([5.0], [8.0, 5.0], 1),
+    ([5.0, 5.0], [10.0], 1),
+]
+
+
+@pytest.mark.parametrize("weights, capacities, optimum", INSTANCES)
+def test_solver_matches_brute_force(weights, capacities, optimum):
+    assert brute_force_min(weights, capacities) == optimum
+    assert min_vehicle_solver.lower_bound(weights, capacities) <= optimum
+
+    count, bound, placement = min_vehicle_solver.solve(weights, capacities, len(capacities) + 1,
+                                                       time.monotonic() + 10)
+    assert count == bound == optimum
+    loads = [0.0] * count
+    for w, j in zip(weights, placement):
+        loads[j] += w
+    assert all(load <= c + 1e-9 for load, c in zip(loads, capacities))
+
+
+@pytest.mark.parametrize("weights, capacities, optimum", INSTANCES)
+def test_company_plan_is_optimal_on_small_instances(weights, capacities, optimum):
+    company = TransportCompany("Минимум")
+    company.add_vehicles([Train(c, 5) for c in capacities])
+    company.add_clients([Client(f"Клиент {i}", w) for i, w in enumerate(weights)])
+
+    report = company.find_min_vehicle_plan(time_limit=10)
+    assert report["unassigned"] == []
+    assert report["vehicles_used"] == report["lower_bound"] == optimum
+    assert report["optimal"] and report["gap"] == 0.0
+    assert company.vehicles_used == optimum
+    assert all(v.current_load <= v.capacity + 1e-9 for v in company.vehicles)
+    assert sum(len(v.clients_list) for v in company.vehicles) == len(weights)
+
+
+def test_tight_instance_is_pruned():
+    # Запас парка — 1 т: перебор без границы не укладывается и в 30 с, граница
+    # отсекает ветви, где в машинах остаются непригодные остатки больше запаса
+    weights = [9.0, 9.0, 9.0, 8.0, 8.0, 7.0, 7.0, 5.0, 5.0, 5.0, 5.0, 5.0, 5.0, 4.0, 4.0, 4.0, 4.0, 4.0,
+               3.0, 3.0, 3.0]
+    capacities = [20.0, 18.0, 14.0, 12.0, 11.0, 11.0, 11.0, 10.0, 10.0]
+    placement = min_vehicle_solver.pack_into(weights, capacities, time.monotonic() + 5)
+    assert placement not in (None, False)
+    loads = [0.0] * len(capacities)
+    for w, j in zip(weights, placement):
+        loads[j] += w
+    assert all(load <= c + 1e-9 for load, c in zip(loads, capacities))
+
+
+def ffd_suboptimal_company(volume_capacity=None, vehicles=3, volume=0.0):
+    # FFD занимает три машины (4+4, 3+3+3, 3), хотя хватает двух (4+3+3 дважды)
+    company = TransportCompany("Минимум", plan_cache_size=0)
+    company.add_vehicles([Train(10, 5, volume_capacity) for _ in range(vehicles)])
+    company.add_clients([Client("Тяжелый 1", 4), Client("Тяжелый 2", 4)])
+    company.add_clients([Client(f"Легкий {i}", 3, False, volume) for i in range(4)])
+    return company
+
+
+def test_solver_improves_ffd():
+    company = ffd_suboptimal_company()
+    report = company.find_min_vehicle_plan(time_limit=10)
+    assert report == {"unassigned": [], "vehicles_used": 2, "lower_bound": 2, "gap": 0.0, "optimal": True}
+    assert company.vehicles_used == 2
+    assert sorted(v.current_load for v in company.vehicles) == [0.0, 10.0, 10.0]
+
+
+def test_exhausted_budget_reports_gap():
+    company = ffd_suboptimal_company()
+    report = company.find_min_vehicle_plan(time_limit=1e-9)
+    # Поиск не успел начаться: остается план FFD с доказанной нижней оценкой
+    assert report["vehicles_used"] == 3
+    assert report["lower_bound"] == 2
+    assert report["optimal"] is False
+    assert report["gap"] == pytest.approx(1 / 3)
+    assert company.vehicles_used == 3
+
+
+def test_exhausted_search_returns_false():
+    # Девять грузов по 6 т в восемь машин разной грузоподъемности 10–10.7 т:
+    # размещения нет; истекший лимит прерывает поиск до первого шага
+    weights = [6.0] * 9
+    capacities = [10.0 + 0.1 * i for i in range(7, -1, -1)]
+    assert min_vehicle_solver.pack_into(weights, capacities, time.monotonic() - 1) is False
+    assert min_vehicle_solver.pack_into(weights, capacities, time.monotonic() + 60) is None
+
+
+def test_weight_plan_violating_volume_is_rejected():
+    # Две машины хватает по весу, но два легких груза не входят в машину по объему
+    company = ffd_suboptimal_company(volume_capacity=2.0, vehicles=5, volume=1.5)
+    report = company.find_min_vehicle_plan(time_limit=10)
+    assert report["unassigned"] == []
+    assert report["vehicles_used"] == 5
+    assert report["lower_bound"] == 2
+    assert report["optimal"] is False
+    assert report["gap"] == pytest.approx(3 / 5)
+    # В транспорте остался план FFD, допустимый по всем измерениям
+    assert company.vehicles_used == 5
+    for vehicle in company.vehicles:
+        assert vehicle.current_volume <= vehicle.volume_capacity
+        assert vehicle.current_load <= vehicle.capacity
+
+
+def test_vip_cargo_is_loaded_first():
+    company = TransportCompany("Минимум")
+    company.add_vehicle(Train(10, 5))
+    regular, small, vip = Client("Обычный", 7), Client("Мелкий", 3), Client("VIP", 6, True)
+    company.add_clients([regular, small, vip])
+    report = company.find_min_vehicle_plan(time_limit=10)
+    # 7 + 3 заполнили бы машину целиком, но VIP-груз обслуживается первым
+    assert report["unassigned"] == [regular]
+    assert company.where_is(vip) is company.vehicles[0]
+    assert company.where_is(small) is company.vehicles[0]
+    assert report["vehicles_used"] == 1 and report["optimal"]
+
+
+def test_invalid_time_limit():
+    company = TransportCompany("Минимум")
+    for limit in (0, -1, "1"):
+        with pytest.raises(ValueError):
+            company.find_min_vehicle_plan(limit)
@@ -0,0 +1,226 @@
+import asyncio
+import random
+
+import pytest
+
+from transport.client import Client
+from transport.online_assigner import OnlineAssigner
+from transport.packing_strategies import best_fit, first_fit
+from transport.train import Train
+from transport.transport_company import TransportCompany
+from transport.vehicle import Vehicle
+
+
+def fleet(capacities):
+    company = TransportCompany("Поток")
+    company.add_vehicles([Train(capacity, 50) for capacity in capacities])
+    return company
+
+
+def random_stream(seed, count=60):
+    rng = random.Random(seed)
+    return [Client(f"Заказ {i}", rng.uniform(0.5, 12)) for i in range(count)]
+
+
+def offline(place, capacities, clients):
+    # Тот же поток в порядке поступления, размещенный стратегией на пустых копиях парка
+    vehicles = [Vehicle.from_trusted(capacity) for capacity in sorted(capacities, reverse=True)]
+    unassigned = place(clients, vehicles)
+    return [[c.name for c in v.clients_list] for v in vehicles], [c.name for c in unassigned]
+
+
+def online(company, events):
+    vehicles = sorted(company.vehicles, key=lambda v: v.capacity, reverse=True)
+    unassigned = [client.name for kind, client, _ in events if kind == "unassigned"]
+    return [[c.name for c in v.clients_list] for v in vehicles], unassigned
+
+
+def harmonic_reference(capacities, clients, classes):
+    # Harmonic-k: у каждого класса размеров (наибольшая грузоподъемность // вес)
+    # одна текущая машина; не вместившая груз закрывается, открывается следующая из резерва
+    reserve = [Vehicle.from_trusted(capacity) for capacity in sorted(capacities, reverse=True)]
+    vehicles = list(reserve)
+    reference = reserve[0].capacity
+    current = {}
+    unassigned = []
+    for client in clients:
+        size_class = max(1, min(classes, int(reference // client.cargo_weight)))
+        vehicle = current.get(size_class)
+        if vehicle is None or not vehicle.fits(client):
+            vehicle = next((v for v in reserve if v.fits(client)), None)
+            if vehicle is None:
+                unassigned.append(client.name)
+                continue
+            reserve.remove(vehicle)
+            current[size_class] = vehicle
+        vehicle.load_cargo(client)
+    return [[c.name for c in v.clients_list] for v in vehicles], unassigned
+
+
+CAPACITIES = [40, 30, 30, 25, 20, 20, 15, 10]
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("policy, place", [("first_fit", first_fit), ("best_fit", best_fit)])
+def test_policy_matches_offline_strategy(policy, place, seed):
+    clients = random_stream(seed)
+    company = fleet(CAPACITIES)
+    events = list(OnlineAssigner(company, policy).stream(clients))
+    assert online(company, events) == offline(place, CAPACITIES, clients)
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("classes", [2, 4])
+def test_harmonic_matches_reference(seed, classes):
+    clients = random_stream(seed)
+    company = fleet(CAPACITIES)
+    events = list(OnlineAssigner(company, "harmonic", harmonic_classes=classes).stream(clients))
+    assert online(company, events) == harmonic_reference(CAPACITIES, clients, classes)
+
+
+@pytest.mark.parametrize("policy", OnlineAssigner.POLICIES)
+def test_streamed_clients_are_counted_in_stats(policy):
+    company = fleet([10, 10, 10])
+    clients = [Client(f"Заказ {i}", 4) for i in range(8)]
+    events = list(OnlineAssigner(company, policy).stream(clients))
+    assigned = [c for kind, c, _ in events if kind == "assigned"]
+
+    stats = company.stats()
+    assert company.clients == clients
+    assert stats["clients"] == 8
+    assert stats["clients_loaded"] == len(assigned) == 6
+    assert stats["clients_unassigned"] == 2
+    assert stats["demand"] == 32.0
+    assert stats["loaded_weight"] == 24.0
+    assert stats["unassigned_weight"] == 8.0
+    assert all(company.where_is(c) is not None for c in assigned)
+
+
+@pytest.mark.parametrize("policy", OnlineAssigner.POLICIES)
+def test_unplaced_clients_join_unassigned(policy):
+    company = fleet([10])
+    ok, big = Client("ok", 5), Client("big", 20)
+    handed_out = company.unassigned
+    events = list(OnlineAssigner(company, policy).stream([ok, big]))
+    assert [kind for kind, _, _ in events if kind != "closed"] == ["assigned", "unassigned"]
+    assert company.unassigned == [big]
+    # Список, полученный до потока, не изменился
+    assert handed_out == []
+    stats = company.stats()
+    assert stats["demand"] == 25.0
+    assert stats["unassigned_weight"] == 20.0 == sum(c.cargo_weight for c in company.unassigned)
+
+
+def test_repeated_client_is_rejected():
+    company = fleet([10])
+    assigner = OnlineAssigner(company)
+    ok = Client("ok", 5)
+    assigner.assign(ok)
+    with pytest.raises(ValueError):
+        assigner.assign(ok)
+    vehicle = company.vehicles[0]
+    assert [c.name for c in vehicle.clients_list] == ["ok"]
+    assert vehicle.current_load == 5.0
+
+    # Клиент компании, в том числе еще не размещенный, — тоже повтор
+    known = Client("Известный", 3)
+    company.add_client(known)
+    with pytest.raises(ValueError):
+        assigner.assign(known)
+    assert company.where_is(known) is None
+    assert company.stats()["clients"] == 2
+
+
+def test_client_preloaded_into_vehicle_is_rejected():
+    company = TransportCompany("Поток")
+    train = Train(10, 5)
+    loaded = Client("Загружен", 2)
+    train.load_cargo(loaded)
+    company.add_vehicle(train)
+    with pytest.raises(ValueError):
+        OnlineAssigner(company).assign(loaded)
+    assert train.clients_list == [loaded]
+
+
+def test_concurrent_plan_sees_streamed_cargo():
+    company = TransportCompany("Поток", concurrent=True)
+    company.add_vehicle(Train(10, 5))
+    assigner = OnlineAssigner(company)
+    assigner.assign(Client("ok", 4))
+    assert [len(v.clients_list) for v in company.plan().vehicles] == [1]
+    assigner.assign(Client("big", 20))
+    version = company.plan()
+    assert [c.name for c in version.unassigned] == ["big"]
+    assert version.stats["unassigned_weight"] == 20.0
+
+
+def test_stream_drops_incremental_plan():
+    company = fleet([10, 10])
+    company.add_client(Client("Плановый", 6))
+    company.optimize_cargo_distribution(incremental=True)
+    assert company._planner is not None
+    list(OnlineAssigner(company).stream([Client("Потоковый", 3), Client("Большой", 30)]))
+    # Правки после потока не опираются на план, не знающий о его грузах
+    assert company._planner is None
+    assert [c.name for c in company.unassigned] == ["Большой"]
+    company.add_client(Client("После", 1))
+    assert company.vehicles_used == sum(1 for v in company.vehicles if v.clients_list)
+
+
+@pytest.mark.parametrize("policy", ["first_fit", "best_fit"])
+def test_full_vehicle_is_closed(policy):
+    company = fleet([10, 10])
+    assigner = OnlineAssigner(company, policy, close_below=1.0)
+    first = company.vehicles[0]
+    events = assigner.assign(Client("Почти все", 9.5))
+    assert events == [("assigned", events[0][1], first), ("closed", None, first)]
+    assert assigner.open_vehicles() == []
+
+    # Закрытую машину больше не предлагают, даже если груз в нее помещается
+    events = assigner.assign(Client("Мелкий", 0.3))
+    assert events[0][2] is company.vehicles[1]
+    assert len(first.clients_list) == 1
+    assert assigner.open_vehicles() == [company.vehicles[1]]
+
+
+def test_harmonic_closes_replaced_vehicle():
+    company = fleet([10, 10])
+    assigner = OnlineAssigner(company, "harmonic", harmonic_classes=2)
+    first, second = company.vehicles
+    assigner.assign(Client("Первый", 6))
+    events = assigner.assign(Client("Второй", 6))
+    assert events[0][2] is second
+    assert events[1] == ("closed", None, first)
+    assert assigner.open_vehicles() == [second]
+
+
+def test_unknown_policy_and_invalid_arguments():
+    company = fleet([10])
+    with pytest.raises(ValueError):
+        OnlineAssigner(company, "next_fit")
+    with pytest.raises(ValueError):
+        OnlineAssigner(company, harmonic_classes=1)
+    with pytest.raises(ValueError):
+        OnlineAssigner(company, close_below=-1)
+    with pytest.raises(TypeError):
+        OnlineAssigner(company).assign("не клиент")
+
+
+@pytest.mark.parametrize("policy", OnlineAssigner.POLICIES)
+def test_stream_async_yields_same_events(policy):
+    clients = random_stream(3, 30)
+    expected = list(OnlineAssigner(fleet(CAPACITIES), policy).stream(clients))
+
+    async def orders():
+        for client in clients:
+            await asyncio.sleep(0)
+            yield client
+
+    async def collect(assigner):
+        return [event async for event in assigner.stream_async(orders())]
+
+    company = fleet(CAPACITIES)
+    events = asyncio.run(collect(OnlineAssigner(company, policy)))
+    assert [(kind, client and client.name, vehicle and vehicle.capacity) for kind, client, vehicle in events] == \
+        [(kind, client and client.name, vehicle and vehicle.capacity) for kind, client, vehicle in expected]
+    assert company.stats()["clients"] == len(clients)
@@ -0,0 +1,40 @@
+import pytest
+
+from transport.client import Client
+from transport.packing_strategies import STRATEGIES
+from transport.train import Train
+from transport.transport_company import TransportCompany
+from transport.vehicle import Vehicle
+
+
+def vehicle(capacity, volume_capacity=None):
+    v = Vehicle.from_trusted(capacity)
+    if volume_capacity is not None:
+        v.volume_capacity = volume_capacity
+    return v
+
+
+@pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+def test_new_vehicle_opened_only_when_none_fits(strategy):
+    # Пустой транспорт — не кандидат: все грузы помещаются в самую вместительную машину
+    company = TransportCompany("Стратегии")
+    for capacity in [100, 50] + [10] * 4:
+        company.add_vehicle(Train(capacity, 2))
+    for i in range(10):
+        company.add_client(Client(f"Клиент {i}", 5))
+    assert company.optimize_cargo_distribution(strategy) == []
+    assert company.vehicles_used == 1
+    assert len(company.vehicles[0].clients_list) == 10
+
+
+@pytest.mark.parametrize("strategy", ["best_fit", "worst_fit"])
+def test_search_continues_past_vehicle_full_by_volume(strategy):
+    # Машина с наибольшим остатком заполнена по объему, но другая открытая подходит
+    vehicles = [vehicle(100, 1.0), vehicle(50, 100.0)]
+    small = [Client.from_trusted(f"Малый {i}", 10, False, 0.5, 0) for i in range(2)]
+    bulky = Client.from_trusted("Объемный", 10, False, 5.0, 0)
+    after = Client.from_trusted("После", 10, False, 0.5, 0)
+    place = STRATEGIES[strategy][1]
+    assert place(small + [bulky, after], vehicles) == []
+    assert vehicles[0].clients_list == small
+    assert vehicles[1].clients_list == [bulky, after]
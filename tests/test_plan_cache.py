@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from transport.client import Client
+from transport.train import Train
+from transport.transport_company import TransportCompany
+
+
+def assert_consistent(company):
+    # Каждый клиент компании — ровно в одном транспорте либо в списке нераспределенных
+    loaded = [c for v in company.vehicles for c in v.clients_list]
+    unassigned = company.unassigned
+    assert len(loaded) == len(set(loaded))
+    assert len(unassigned) == len(set(unassigned))
+    assert not set(loaded) & set(unassigned)
+    assert set(loaded) | set(unassigned) == set(company.clients)
+    for client in loaded:
+        assert company.where_is(client) is not None
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_readded_unassigned_client_is_not_lost(concurrent):
+    company = TransportCompany("Кэш", concurrent=concurrent)
+    company.add_vehicle(Train(10, 2))
+    a, b = Client("A", 8), Client("B", 5)
+    company.add_client(a)
+    company.add_client(b)
+    assert company.optimize_cargo_distribution() == [b]
+
+    # Тот же состав и тот же отпечаток, но план уже не загружен: B выпал из unassigned
+    company.remove_client(b)
+    company.add_client(b)
+    assert company.optimize_cargo_distribution() == [b]
+    assert company.where_is(a) is not None
+    assert company.where_is(b) is None
+    assert_consistent(company)
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_readded_loaded_client_is_replayed(concurrent):
+    company = TransportCompany("Кэш", concurrent=concurrent)
+    train = Train(10, 2)
+    company.add_vehicle(train)
+    a = Client("A", 4)
+    company.add_client(a)
+    company.optimize_cargo_distribution()
+
+    company.remove_client(a)
+    company.add_client(a)
+    assert company.optimize_cargo_distribution() == []
+    assert company.where_is(a) is train
+    assert company.plan_cache_stats()["replayed"] == 1
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+@pytest.mark.parametrize("seed", range(150))
+def test_random_edits_keep_plan_consistent(seed, concurrent):
+    rng = random.Random(seed)
+    company = TransportCompany("Кэш", concurrent=concurrent)
+    for _ in range(3):
+        company.add_vehicle(Train(rng.choice([10, 20, 30]), 2))
+    removed = []
+    for step in range(300):
+        op = rng.random()
+        if op < 0.3 or not company.clients:
+            if removed and rng.random() < 0.5:
+                client = removed.pop(rng.randrange(len(removed)))
+            else:
+                client = Client(f"Клиент {step}", rng.uniform(1, 12), rng.random() < 0.2)
+            company.add_client(client)
+        elif op < 0.5:
+            client = rng.choice(company.clients)
+            company.remove_client(client)
+            removed.append(client)
+        elif op < 0.6:
+            company.update_client(rng.choice(company.clients), cargo_weight=rng.uniform(1, 12))
+        elif op < 0.65:
+            company.add_vehicle(Train(rng.choice([10, 20, 30]), 2))
+        elif op < 0.7 and len(company.vehicles) > 1:
+            company.remove_vehicle(rng.choice(company.vehicles))
+        else:
+            strategy = rng.choice(["greedy_legacy", "ffd", "best_fit", "worst_fit"])
+            company.optimize_cargo_distribution(strategy, incremental=rng.random() < 0.5)
+            assert_consistent(company)
@@ -0,0 +1,122 @@
+import asyncio
+import json
+from urllib.parse import quote
+
+import pytest
+
+from transport.planning_service import PlanningService
+from transport.train import Train
+from transport.transport_company import TransportCompany
+
+
+async def exchange(port, raw: bytes):
+    # Сырой запрос -> (статус, заголовки, тело); пустой ответ — (None, {}, b"")
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw)
+    await writer.drain()
+    line = await reader.readline()
+    if not line:
+        writer.close()
+        return None, {}, b""
+    headers = {}
+    while (header := await reader.readline()) != b"\r\n":
+        name, _, value = header.decode().partition(":")
+        headers[name.lower()] = value.strip()
+    body = await reader.readexactly(int(headers["content-length"]))
+    writer.close()
+    return int(line.split()[1]), headers, body
+
+
+def request(method, path, body=None) -> bytes:
+    data = b"" if body is None else (body if isinstance(body, bytes) else json.dumps(body).encode())
+    return f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data
+
+
+def run(scenario):
+    async def main():
+        company = TransportCompany("Сервис")
+        company.add_vehicle(Train(20, 4))
+        service = PlanningService(company, batch_window=0.01)
+        await service.start(port=0)
+        try:
+            return await scenario(service, company)
+        finally:
+            await service.close()
+    return asyncio.run(main())
+
+
+def test_batched_additions_and_reads():
+    async def scenario(service, company):
+        posts = [exchange(service.port, request("POST", "/clients", {"name": f"Клиент {i}", "cargo_weight": 3}))
+                 for i in range(5)]
+        responses = await asyncio.gather(*posts)
+        assert [status for status, _, _ in responses] == [200] * 5
+        assert service.counters["batches"] == 1
+
+        status, headers, body = await exchange(service.port, request("GET", "/plan"))
+        summary = json.loads(body)
+        assert status == 200 and headers["content-type"].startswith("application/json")
+        assert summary["vehicles_used"] == 1 and summary["unassigned"] == 0
+        assert summary["stats"]["clients"] == 5
+
+        status, _, body = await exchange(service.port, request("GET", "/clients?name=" + quote("Клиент 2")))
+        assert json.loads(body)[0]["vehicle_id"] == company.vehicles[0].vehicle_id
+        status, headers, body = await exchange(service.port, request("GET", "/plan/vehicles?format=csv"))
+        assert status == 200 and headers["content-type"].startswith("text/csv")
+        assert body.decode().count("Клиент") == 5
+    run(scenario)
+
+
+def test_invalid_request_rejected_alone():
+    async def scenario(service, company):
+        good, bad = await asyncio.gather(
+            exchange(service.port, request("POST", "/clients", [{"name": "Хороший", "cargo_weight": 1}])),
+            exchange(service.port, request("POST", "/clients", [{"name": "Плохой", "cargo_weight": -1}])))
+        assert good[0] == 200
+        assert bad[0] == 400 and json.loads(bad[2])["errors"] == [[0, "Вес груза должен быть положительным числом."]]
+        assert [c.name for c in company.clients] == ["Хороший"]
+        assert service.counters["rejected_requests"] == 1
+    run(scenario)
+
+
+@pytest.mark.parametrize("raw, status", [
+    (request("POST", "/clients", b"{not json"), 400),
+    (request("POST", "/clients", "\xff".encode("latin-1")), 400),
+    (request("POST", "/clients"), 400),
+    (request("POST", "/optimize", {"strategy": "нет такой"}), 400),
+    (request("GET", "/clients"), 400),
+    (request("GET", "/plan/vehicles?format=xml"), 400),
+    (request("GET", "/нет"), 404),
+    (request("DELETE", "/plan"), 405),
+    (b"GET /plan HTTP/1.1\r\nContent-Length: abc\r\n\r\n", 400),
+    (b"POST /clients HTTP/1.1\r\nContent-Length: -5\r\n\r\n", 400),
+    (b"POST /clients HTTP/1.1\r\nContent-Length: 1_0\r\n\r\n", 400),
+    (b"POST /clients HTTP/1.1\r\nContent-Length: 999999999999\r\n\r\n", 413),
+    (b"BROKEN\r\n\r\n", 400),
+])
+def test_malformed_input_gets_response(raw, status):
+    async def scenario(service, company):
+        # Без ответа соединение зависло бы в ожидании тела запроса
+        response = await asyncio.wait_for(exchange(service.port, raw), 5)
+        assert response[0] == status
+        assert "error" in json.loads(response[2])
+        # Сервис продолжает отвечать
+        assert (await exchange(service.port, request("GET", "/health")))[0] == 200
+    run(scenario)
+
+
+def test_keep_alive_connection():
+    async def scenario(service, company):
+        reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+        for _ in range(3):
+            writer.write(request("GET", "/health"))
+            await writer.drain()
+            assert (await reader.readline()).split()[1] == b"200"
+            headers = {}
+            while (header := await reader.readline()) != b"\r\n":
+                name, _, value = header.decode().partition(":")
+                headers[name.lower()] = value.strip()
+            assert headers["connection"] == "keep-alive"
+            await reader.readexactly(int(headers["content-length"]))
+        writer.close()
+    run(scenario)
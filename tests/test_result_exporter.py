@@ -0,0 +1,165 @@
+import csv
+import io
+import json
+
+import pytest
+
+from transport.airplane import Airplane
+from transport.client import Client
+from transport.result_exporter import export_distribution, write_distribution
+from transport.train import Train
+from transport.transport_company import TransportCompany
+
+
+def planned_company(concurrent=False):
+    company = TransportCompany("Экспорт", concurrent=concurrent)
+    train, airplane, empty = Train(10, 2), Airplane(5, 9000), Train(1, 1)
+    for vehicle, vehicle_id in ((train, "поезд-1"), (airplane, "самолет-1"), (empty, "пустой")):
+        vehicle.vehicle_id = vehicle_id
+    company.add_vehicles([train, airplane, empty])
+    company.add_clients([Client("VIP \"Альфа\", ООО", 6, True), Client("Бета", 4), Client("Гамма", 3)])
+    company.optimize_cargo_distribution()
+    return company
+
+
+EXPECTED = [
+    {"id": "поезд-1", "type": "Train", "capacity": 10.0, "current_load": 10.0,
+     "clients": [{"name": "VIP \"Альфа\", ООО", "cargo_weight": 6.0, "is_vip": True},
+                 {"name": "Бета", "cargo_weight": 4.0, "is_vip": False}]},
+    {"id": "самолет-1", "type": "Airplane", "capacity": 5.0, "current_load": 3.0,
+     "clients": [{"name": "Гамма", "cargo_weight": 3.0, "is_vip": False}]},
+    {"id": "пустой", "type": "Train", "capacity": 1.0, "current_load": 0.0, "clients": []},
+]
+
+
+def written(source, fmt):
+    buffer = io.StringIO(newline="")
+    assert write_distribution(source, buffer, fmt) == 3
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("from_plan", [False, True])
+def test_json(from_plan):
+    company = planned_company(from_plan)
+    text = written(company.plan() if from_plan else company, "json")
+    assert json.loads(text) == {"company": "Экспорт", "vehicles": EXPECTED}
+
+
+@pytest.mark.parametrize("from_plan", [False, True])
+def test_jsonl(from_plan):
+    company = planned_company(from_plan)
+    text = written(company.plan() if from_plan else company, "jsonl")
+    assert text.endswith("\n")
+    assert [json.loads(line) for line in text.splitlines()] == EXPECTED
+
+
+@pytest.mark.parametrize("from_plan", [False, True])
+def test_csv(from_plan):
+    company = planned_company(from_plan)
+    rows = list(csv.reader(io.StringIO(written(company.plan() if from_plan else company, "csv"), newline="")))
+    assert rows == [
+        ["vehicle_id", "type", "capacity", "current_load", "volume_capacity", "current_volume",
+         "slot_capacity", "used_slots", "client_name", "cargo_weight", "is_vip", "volume", "slots"],
+        ["поезд-1", "Train", "10.0", "10.0", "", "0.0", "2", "0", "VIP \"Альфа\", ООО", "6.0", "True", "0.0", "0"],
+        ["поезд-1", "Train", "10.0", "10.0", "", "0.0", "2", "0", "Бета", "4.0", "False", "0.0", "0"],
+        ["самолет-1", "Airplane", "5.0", "3.0", "", "0.0", "", "0", "Гамма", "3.0", "False", "0.0", "0"],
+        # Пустой транспорт — строка без клиента
+        ["пустой", "Train", "1.0", "0.0", "", "0.0", "1", "0", "", "", "", "", ""],
+    ]
+
+
+@pytest.mark.parametrize("from_plan", [False, True])
+def test_csv_volume_and_slots(from_plan):
+    company = TransportCompany("Объем", concurrent=from_plan)
+    train = Train(10, 3, 20)
+    train.vehicle_id = "поезд"
+    company.add_vehicle(train)
+    company.add_clients([Client("Ящики", 4, volume=7.5, slots=2), Client("Мешки", 3, volume=2)])
+    company.optimize_cargo_distribution()
+    buffer = io.StringIO(newline="")
+    assert write_distribution(company.plan() if from_plan else company, buffer, "csv") == 1
+    rows = list(csv.reader(io.StringIO(buffer.getvalue(), newline="")))
+    assert rows[1:] == [
+        ["поезд", "Train", "10.0", "7.0", "20.0", "9.5", "3", "2", "Ящики", "4.0", "False", "7.5", "2"],
+        ["поезд", "Train", "10.0", "7.0", "20.0", "9.5", "3", "2", "Мешки", "3.0", "False", "2.0", "0"],
+    ]
+
+
+def test_empty_company():
+    company = TransportCompany("Пусто")
+    calls = []
+    buffer = io.StringIO()
+    assert write_distribution(company, buffer, "json", lambda done, total: calls.append((done, total))) == 0
+    assert json.loads(buffer.getvalue()) == {"company": "Пусто", "vehicles": []}
+    assert calls == [(0, 0)]
+
+
+@pytest.mark.parametrize("fmt", ["json", "jsonl", "csv"])
+@pytest.mark.parametrize("every, expected", [
+    (1, [(1, 5), (2, 5), (3, 5), (4, 5), (5, 5)]),
+    (2, [(2, 5), (4, 5), (5, 5)]),
+    (5, [(5, 5)]),
+    (10, [(5, 5)]),
+])
+def test_progress_is_ordered_and_final_once(fmt, every, expected):
+    company = TransportCompany("Прогресс")
+    company.add_vehicles([Train(10, 1) for _ in range(5)])
+    calls = []
+    written_before = []
+    buffer = io.StringIO()
+
+    def progress(done, total):
+        calls.append((done, total))
+        written_before.append(len(buffer.getvalue()))
+
+    write_distribution(company, buffer, fmt, progress, every)
+    assert calls == expected
+    # Прогресс сообщается по мере записи, а не после нее
+    assert written_before == sorted(written_before)
+    assert written_before[0] > 0
+
+
+def test_format_from_extension(tmp_path):
+    company = planned_company()
+    for name, check in (("plan.json", lambda t: json.loads(t)["vehicles"]),
+                        ("plan.jsonl", lambda t: [json.loads(line) for line in t.splitlines()]),
+                        ("plan.CSV", lambda t: t.splitlines()[0].split(","))):
+        path = tmp_path / name
+        assert export_distribution(company, str(path)) == 3
+        assert check(path.read_text(encoding="utf-8"))
+        assert not (tmp_path / (name + ".tmp")).exists()
+    # Без расширения — JSON
+    path = tmp_path / "plan"
+    export_distribution(company, str(path))
+    assert json.loads(path.read_text(encoding="utf-8"))["company"] == "Экспорт"
+
+
+def test_invalid_arguments_touch_nothing(tmp_path):
+    company = planned_company()
+    path = tmp_path / "plan.xml"
+    with pytest.raises(ValueError):
+        export_distribution(company, str(path))
+    with pytest.raises(ValueError):
+        export_distribution(company, str(tmp_path / "plan.json"), progress_every=0)
+    with pytest.raises(ValueError):
+        write_distribution(company, io.StringIO(), "yaml")
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("error", [OSError, KeyboardInterrupt])
+def test_failed_export_leaves_target_untouched(tmp_path, error):
+    company = TransportCompany("Прерванный")
+    company.add_vehicles([Train(10, 1) for _ in range(5)])
+    path = tmp_path / "plan.jsonl"
+    path.write_text("прежний план\n", encoding="utf-8")
+
+    def progress(done, total):
+        # Запись идет во временный файл рядом с целевым
+        assert (tmp_path / "plan.jsonl.tmp").exists()
+        if done == 3:
+            raise error("сбой записи")
+
+    with pytest.raises(error):
+        export_distribution(company, str(path), progress=progress, progress_every=1)
+    assert path.read_text(encoding="utf-8") == "прежний план\n"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["plan.jsonl"]
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from transport.client import Client
+from transport.train import Train
+from transport.transport_company import TransportCompany
+
+
+def random_company(seed):
+    rng = random.Random(seed)
+    company = TransportCompany(f"Шарды {seed}", plan_cache_size=0)
+    for _ in range(rng.randint(2, 12)):
+        company.add_vehicle(Train(rng.randint(10, 60), 3))
+    for i in range(rng.randint(10, 120)):
+        company.add_client(Client(f"Клиент {i}", rng.uniform(1, 25), rng.random() < 0.3))
+    return company
+
+
+def vip_plan(company):
+    return {v: [c for c in v.clients_list if c.is_vip] for v in company.vehicles}
+
+
+@pytest.mark.parametrize("shard_by", ["balanced", "type"])
+@pytest.mark.parametrize("seed", range(60))
+def test_vip_cargo_placed_as_in_sequential_plan(seed, shard_by):
+    # VIP-грузы размещаются по всему парку до шардирования — как в последовательном плане
+    company = random_company(seed)
+    sequential = company.optimize_cargo_distribution()
+    expected = vip_plan(company)
+
+    unassigned = company.distribute_parallel(workers=1 if seed % 2 else 3, shard_by=shard_by)
+
+    assert vip_plan(company) == expected
+    assert [c for c in unassigned if c.is_vip] == [c for c in sequential if c.is_vip]
+    loaded = [c for v in company.vehicles for c in v.clients_list]
+    assert sorted(map(id, loaded + unassigned)) == sorted(map(id, company.clients))
+    assert all(v.current_load <= v.capacity for v in company.vehicles)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_volume_and_slots_respected(seed):
+    # Шарды упаковываются по весу; объем и места соблюдаются раскладкой и ремонтным проходом
+    rng = random.Random(seed)
+    company = TransportCompany(f"Объем {seed}", plan_cache_size=0)
+    for _ in range(rng.randint(2, 8)):
+        company.add_vehicle(Train(rng.randint(20, 60), rng.randint(2, 6), rng.uniform(10, 40)))
+    for i in range(rng.randint(10, 60)):
+        company.add_client(Client(f"Клиент {i}", rng.uniform(1, 15), rng.random() < 0.2,
+                                  rng.uniform(0, 8), rng.randint(0, 2)))
+
+    unassigned = company.distribute_parallel(workers=1 if seed % 2 else 3)
+
+    loaded = [c for v in company.vehicles for c in v.clients_list]
+    assert sorted(map(id, loaded + unassigned)) == sorted(map(id, company.clients))
+    for v in company.vehicles:
+        assert v.current_load <= v.capacity + 1e-9
+        assert v.current_volume <= v.volume_capacity + 1e-9
+        assert v.used_slots <= v.slot_capacity
+    # Ремонтный проход не оставляет груз, для которого есть место по всем измерениям
+    assert not any(v.fits(c) for c in unassigned for v in company.vehicles)
@@ -0,0 +1,125 @@
+import json
+import struct
+
+import pytest
+
+from transport import snapshot as snapshot_module
+from transport.airplane import Airplane
+from transport.client import Client
+from transport.snapshot import ALIGN, MAGIC, Snapshot
+from transport.train import Train
+from transport.transport_company import TransportCompany
+
+
+def sample_company():
+    company = TransportCompany("Снимок")
+    company.add_vehicle(Train(20, 4, 30))
+    company.add_vehicle(Airplane(15, 9000, 12, 2))
+    company.add_vehicle(Train(5, 1))
+    company.add_client(Client("Обычный", 4))
+    company.add_client(Client("Объемный", 6, True, 10.5, 1))
+    company.add_client(Client("С отсеками", 5, False, 2, 2))
+    company.add_client(Client("Лишний", 50))
+    company.add_client(Client("Легкий", 1, True, 0.5))
+    company.optimize_cargo_distribution()
+    return company
+
+
+def plan(company):
+    return [[(c.name, c.cargo_weight, c.is_vip, c.volume, c.slots) for c in v.clients_list]
+            for v in company.vehicles]
+
+
+def test_round_trip(tmp_path):
+    company = sample_company()
+    path = str(tmp_path / "company.snap")
+    company.save_snapshot(path)
+    loaded = TransportCompany.load_snapshot(path)
+
+    # Назначения и порядок загрузки (VIP первыми) совпадают с исходным планом
+    assert plan(loaded) == plan(company)
+    assert [c.name for c in loaded.unassigned] == [c.name for c in company.unassigned]
+    assert loaded.vehicles_used == company.vehicles_used
+    for original, copy in zip(company.vehicles, loaded.vehicles):
+        assert type(copy) is type(original)
+        assert copy.vehicle_id == original.vehicle_id
+        assert (copy.capacity, copy.current_load) == (original.capacity, original.current_load)
+        assert (copy.volume_capacity, copy.current_volume) == (original.volume_capacity, original.current_volume)
+        assert (copy.slot_capacity, copy.used_slots) == (original.slot_capacity, original.used_slots)
+
+
+def write_without(path, source, dropped):
+    # Снимок старого формата: те же столбцы, но без объема и мест
+    with Snapshot(source) as snapshot:
+        columns = {name: snapshot._array(name) for name in snapshot._layout if name not in dropped}
+        meta = (snapshot.company_name, snapshot.vehicle_count, snapshot.client_count)
+    layout = {}
+    offset = 0
+    for name, column in columns.items():
+        size = len(column) * column.itemsize
+        layout[name] = [offset, size, column.typecode]
+        offset += size + (-size) % ALIGN
+    header = json.dumps({"company": meta[0], "vehicles": meta[1], "clients": meta[2], "columns": layout},
+                        ensure_ascii=False).encode("utf-8")
+    header += b" " * ((-len(header)) % ALIGN)
+    with open(path, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", len(header)) + header)
+        for column in columns.values():
+            size = len(column) * column.itemsize
+            f.write(column.tobytes() + b"\0" * ((-size) % ALIGN))
+
+
+def test_old_format_without_volume_and_slots(tmp_path):
+    company = TransportCompany("Старый")
+    company.add_vehicle(Train(10, 2))
+    company.add_client(Client("Первый", 6))
+    company.add_client(Client("Второй", 6))
+    company.optimize_cargo_distribution()
+    source = str(tmp_path / "new.snap")
+    old = str(tmp_path / "old.snap")
+    company.save_snapshot(source)
+    write_without(old, source, {"volume_capacity", "slot_capacity", "volume", "slots"})
+
+    loaded = TransportCompany.load_snapshot(old)
+    vehicle = loaded.vehicles[0]
+    assert vehicle.volume_capacity == vehicle.UNLIMITED and vehicle.slot_capacity == 2
+    assert [(c.name, c.volume, c.slots) for c in vehicle.clients_list] == [("Первый", 0.0, 0)]
+    assert [c.name for c in loaded.unassigned] == ["Второй"]
+
+
+def test_failed_write_keeps_previous_snapshot(tmp_path, monkeypatch):
+    path = str(tmp_path / "company.snap")
+    sample_company().save_snapshot(path)
+    with open(path, "rb") as f:
+        before = f.read()
+
+    def broken(*args):
+        raise OSError("диск заполнен")
+
+    monkeypatch.setattr(snapshot_module.struct, "pack", broken)
+    with pytest.raises(OSError):
+        TransportCompany("Другая").save_snapshot(path)
+    with open(path, "rb") as f:
+        assert f.read() == before
+    assert list(tmp_path.iterdir()) == [tmp_path / "company.snap"]
+
+
+def test_snapshot_keeps_volume_and_slots(tmp_path):
+    company = TransportCompany("Снимок")
+    company.add_vehicle(Airplane(50, 9000, 10, 2))
+    company.add_client(Client("Объемный", 5, False, 6, 1))
+    company.add_client(Client("Второй", 5, False, 6, 1))
+    company.optimize_cargo_distribution()
+    path = tmp_path / "company.snap"
+    company.save_snapshot(str(path))
+
+    with Snapshot(str(path)) as snapshot:
+        volume, slots = snapshot.column("volume"), snapshot.column("slots")
+        assert list(volume) == [6.0, 6.0] and list(slots) == [1, 1]
+        volume.release()
+        slots.release()
+    loaded = TransportCompany.load_snapshot(str(path))
+    vehicle = loaded.vehicles[0]
+    assert vehicle.current_volume == 6 and vehicle.used_slots == 1
+    assert [c.name for c in loaded.unassigned] == ["Второй"]
+    assert not vehicle.fits(loaded.unassigned[0])
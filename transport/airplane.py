@@ -1,11 +1,25 @@
 from .vehicle import Vehicle
 
 class Airplane(Vehicle):
-    def __init__(self, capacity: float, max_altitude: int):
-        super().__init__(capacity)
+    __slots__ = ("max_altitude",)
+
+    def __init__(self, capacity: float, max_altitude: int, volume_capacity: float = None, holds: int = None):
+        super().__init__(capacity, volume_capacity)
         if not isinstance(max_altitude, int) or max_altitude <= 0:
             raise ValueError("Максимальная высота должна быть положительным целым числом.")
+        if holds is not None and (not isinstance(holds, int) or holds <= 0):
+            raise ValueError("Количество грузовых отсеков должно быть положительным целым числом.")
         self.max_altitude = max_altitude
+        if holds is not None:
+            self.slot_capacity = holds
+
+    @classmethod
+    def from_trusted(cls, capacity: float, max_altitude: int, volume_capacity: float = None, holds: int = None):
+        airplane = super().from_trusted(capacity, volume_capacity)
+        airplane.max_altitude = max_altitude
+        if holds is not None:
+            airplane.slot_capacity = holds
+        return airplane
 
     def __str__(self):
         base = super().__str__()
@@ -0,0 +1,164 @@
+import os
+import pickle
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from .capacity_index import CapacityIndex
+from .client import Client
+from .vehicle import Vehicle
+
+# Шаблон парка в разделяемой памяти: три столбца double по числу машин —
+# грузоподъемность, вместимость по объему, число мест (inf — без ограничений).
+# Одинаковые парки разных депо хранятся в одном сегменте и не копируются в задачи.
+FLEET_COLUMNS = 3
+
+
+def _fleet_bytes(vehicles) -> bytes:
+    columns = array("d", (v.capacity for v in vehicles))
+    columns.extend(v.volume_capacity for v in vehicles)
+    columns.extend(v.slot_capacity for v in vehicles)
+    return columns.tobytes()
+
+
+def plan_company(task):
+    # Выполняется в процессе-обработчике. На вход — имя сегмента с шаблоном парка,
+    # число машин, байты столбцов клиентов (вес, VIP, объем, места) в порядке
+    # обслуживания и функция размещения. На выход — номер машины для каждого
+    # клиента (-1 — не поместился) и время расчета.
+    started = time.perf_counter()
+    fleet_name, vehicle_count, client_columns, place = task
+    shm = SharedMemory(name=fleet_name)
+    try:
+        fleet = shm.buf[:FLEET_COLUMNS * vehicle_count * 8].cast("d")
+        vehicles = []
+        for j in range(vehicle_count):
+            volume = fleet[vehicle_count + j]
+            vehicle = Vehicle.from_trusted(fleet[j], None if volume == Vehicle.UNLIMITED else volume)
+            vehicle.slot_capacity = fleet[2 * vehicle_count + j]
+            vehicles.append(vehicle)
+        fleet.release()
+    finally:
+        shm.close()
+
+    weights, vip, volumes, slots = (array(code) for code in "dbdq")
+    for column, data in zip((weights, vip, volumes, slots), client_columns):
+        column.frombytes(data)
+    clients = [Client.from_trusted("", weights[i], bool(vip[i]), volumes[i], slots[i]) for i in range(len(weights))]
+    place(clients, vehicles)
+
+    position = {id(c): i for i, c in enumerate(clients)}
+    result = array("q", [-1]) * len(clients)
+    for j, vehicle in enumerate(vehicles):
+        for client in vehicle.clients_list:
+            result[position[id(client)]] = j
+    return result.tobytes(), time.perf_counter() - started
+
+
+def _rebalance(companies, results):
+    # Нераспределенные грузы (VIP и тяжелые первыми) переносятся в первое депо,
+    # где для них есть место; перед поиском — проверка наибольшего остатка за O(1)
+    indexes = [CapacityIndex(sorted(c.vehicles, key=lambda v: v.capacity, reverse=True)) for c in companies]
+    for k, source in enumerate(companies):
+        for client in sorted(source.unassigned, key=lambda c: (not c.is_vip, -c.cargo_weight)):
+            for t, target in enumerate(companies):
+                index = indexes[t]
+                if t == k or index.max_residual() < client.cargo_weight - CapacityIndex.EPSILON:
+                    continue
+                j = index.find_first(client)
+                if j == -1:
+                    continue
+                source.remove_client(client)
+                target.add_client(client)
+                index.vehicles[j].load_cargo(client)
+                index.update(j)
+                results[k]["sent"] += 1
+                results[t]["received"] += 1
+                break
+    for company, result in zip(companies, results):
+        company._adopt_plan(company.unassigned)
+        result["vehicles_used"] = company.vehicles_used
+        result["unassigned"] = company.unassigned
+
+
+def plan_companies(companies, workers: int = None, strategy: str = "greedy_legacy", rebalance: bool = False) -> list:
+    # Планирует все компании в общем пуле процессов. Возвращает по компании
+    # словарь с итогами и временем расчета в обработчике (seconds).
+    from .transport_company import TransportCompany
+
+    companies = list(companies)
+    if not all(isinstance(c, TransportCompany) for c in companies):
+        raise TypeError("Ожидается список объектов TransportCompany.")
+    if len({id(c) for c in companies}) != len(companies):
+        raise ValueError("Компания указана в списке несколько раз.")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not isinstance(workers, int) or workers <= 0:
+        raise ValueError("Количество процессов должно быть положительным целым числом.")
+
+    orders = [company._plan_order(strategy) for company in companies]
+    if workers > 1 and len(orders) > 1:
+        # Функция размещения передается обработчикам по ссылке: лямбды и локальные
+        # функции (допустимые в register_strategy) так не передаются
+        try:
+            pickle.dumps(orders[0][0])
+        except (pickle.PicklingError, AttributeError, TypeError):
+            raise ValueError(f"Стратегию {strategy} нельзя выполнить в пуле процессов: "
+                             "нужна функция уровня модуля (или workers=1).") from None
+    # Байты шаблона -> сегмент; сегменты удаляет только этот процесс
+    segments = {}
+    templates = []
+    tasks = []
+    try:
+        for place, clients, vehicles in orders:
+            fleet = _fleet_bytes(vehicles)
+            if fleet not in segments:
+                shm = SharedMemory(create=True, size=max(len(fleet), 1))
+                shm.buf[:len(fleet)] = fleet
+                segments[fleet] = (len(segments), shm)
+            template, shm = segments[fleet]
+            templates.append(template)
+            client_columns = (array("d", (c.cargo_weight for c in clients)).tobytes(),
+                              array("b", (c.is_vip for c in clients)).tobytes(),
+                              array("d", (c.volume for c in clients)).tobytes(),
+                              array("q", (c.slots for c in clients)).tobytes())
+            tasks.append((shm.name, len(vehicles), client_columns, place))
+
+        if workers == 1 or len(tasks) <= 1:
+            outputs = list(map(plan_company, tasks))
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                outputs = list(executor.map(plan_company, tasks))
+    finally:
+        for _, shm in segments.values():
+            shm.close()
+            shm.unlink()
+
+    results = []
+    for company, (place, clients, vehicles), template, (data, seconds) in zip(companies, orders, templates, outputs):
+        assignment = array("q")
+        assignment.frombytes(data)
+        for v in vehicles:
+            v.reset_load()
+        unassigned = []
+        # Загрузка в порядке обслуживания повторяет состояние машин в обработчике
+        for client, j in zip(clients, assignment):
+            if j == -1:
+                unassigned.append(client)
+            else:
+                vehicles[j].load_cargo(client)
+        company._adopt_plan(unassigned, strategy)
+        results.append({
+            "company": company.name,
+            "vehicles_used": company.vehicles_used,
+            "unassigned": unassigned,
+            "seconds": seconds,
+            "fleet_template": template,
+            "sent": 0,
+            "received": 0,
+        })
+
+    if rebalance and len(companies) > 1:
+        _rebalance(companies, results)
+    return results
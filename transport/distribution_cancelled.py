@@ -0,0 +1,3 @@
+class DistributionCancelled(Exception):
+    # Распределение прервано по запросу (should_stop вернул True)
+    pass
\ No newline at end of file
@@ -0,0 +1,181 @@
+import json
+import os
+import secrets
+import time
+import tracemalloc
+from collections import deque
+
+from .vehicle_probe import VehicleProbe
+
+PHASES = ("sort", "reset", "place", "publish")
+
+
+class DistributionMetrics:
+    # Необязательная инструментация optimize_cargo_distribution: время фаз,
+    # число проверок места, число загрузок и (при trace_memory) выделенная
+    # и пиковая память. Без объекта метрик распределение не замедляется.
+    def __init__(self, trace_memory: bool = False, max_runs: int = 1000):
+        if not isinstance(max_runs, int) or max_runs <= 0:
+            raise ValueError("Число хранимых прогонов должно быть положительным целым числом.")
+        self.trace_memory = trace_memory
+        self.runs = deque(maxlen=max_runs)
+        self.current = None
+        # Накопительные счетчики за все прогоны (для Prometheus)
+        self.totals = {"runs": 0, "capacity_probes": 0, "loads": 0, "seconds": 0.0, "load_cargo_seconds": 0.0}
+        self.phase_totals = dict.fromkeys(PHASES, 0.0)
+        self._mark = 0.0
+        self._own_trace = False
+
+    def begin(self, strategy: str, clients: int, vehicles: int):
+        self.current = {
+            "strategy": strategy,
+            "clients": clients,
+            "vehicles": vehicles,
+            "started_ns": time.time_ns(),
+            "phases": {},
+            "spans": [],
+            "capacity_probes": 0,
+            "loads": 0,
+            "load_cargo_s": 0.0,
+        }
+        if self.trace_memory:
+            self._own_trace = not tracemalloc.is_tracing()
+            if self._own_trace:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self.current["memory_before"] = tracemalloc.get_traced_memory()[0]
+        self._mark = time.perf_counter()
+
+    def phase(self, name: str):
+        # Закрывает фазу, начатую предыдущей отметкой
+        now = time.perf_counter()
+        run = self.current
+        offset = sum(run["phases"].values())
+        run["phases"][name] = now - self._mark
+        start_ns = run["started_ns"] + int(offset * 1e9)
+        run["spans"].append((name, start_ns, start_ns + int((now - self._mark) * 1e9)))
+        self._mark = now
+
+    def wrap(self, vehicles) -> list:
+        return [VehicleProbe(v, self) for v in vehicles]
+
+    def end(self, unassigned: int, vehicles_used: int) -> dict:
+        run = self.current
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            run["allocated_bytes"] = current - run.pop("memory_before")
+            run["peak_memory_bytes"] = peak
+            if self._own_trace:
+                tracemalloc.stop()
+        run["duration_s"] = sum(run["phases"].values())
+        run["unassigned"] = unassigned
+        run["vehicles_used"] = vehicles_used
+        self.runs.append(run)
+        self.current = None
+
+        self.totals["runs"] += 1
+        self.totals["capacity_probes"] += run["capacity_probes"]
+        self.totals["loads"] += run["loads"]
+        self.totals["seconds"] += run["duration_s"]
+        self.totals["load_cargo_seconds"] += run["load_cargo_s"]
+        for name, seconds in run["phases"].items():
+            self.phase_totals[name] = self.phase_totals.get(name, 0.0) + seconds
+        return run
+
+    def cancel(self):
+        # Прерванный прогон не учитывается
+        if self.trace_memory and self._own_trace and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._own_trace = False
+        self.current = None
+
+    @property
+    def last(self):
+        return self.runs[-1] if self.runs else None
+
+    def to_prometheus(self) -> str:
+        # Текстовый формат экспозиции Prometheus: счетчики за все прогоны и значения последнего
+        lines = [
+            "# HELP transport_distribution_runs_total Completed cargo distribution runs.",
+            "# TYPE transport_distribution_runs_total counter",
+            f"transport_distribution_runs_total {self.totals['runs']}",
+            "# HELP transport_distribution_seconds_total Time spent in cargo distribution.",
+            "# TYPE transport_distribution_seconds_total counter",
+            f"transport_distribution_seconds_total {self.totals['seconds']:.9f}",
+            "# HELP transport_distribution_phase_seconds_total Time spent per distribution phase.",
+            "# TYPE transport_distribution_phase_seconds_total counter",
+        ]
+        lines += [f'transport_distribution_phase_seconds_total{{phase="{name}"}} {seconds:.9f}'
+                  for name, seconds in self.phase_totals.items()]
+        lines += [
+            "# HELP transport_distribution_capacity_probes_total Vehicle capacity checks.",
+            "# TYPE transport_distribution_capacity_probes_total counter",
+            f"transport_distribution_capacity_probes_total {self.totals['capacity_probes']}",
+            "# HELP transport_distribution_loads_total Cargo loads performed.",
+            "# TYPE transport_distribution_loads_total counter",
+            f"transport_distribution_loads_total {self.totals['loads']}",
+            "# HELP transport_distribution_load_cargo_seconds_total Time spent in Vehicle.load_cargo.",
+            "# TYPE transport_distribution_load_cargo_seconds_total counter",
+            f"transport_distribution_load_cargo_seconds_total {self.totals['load_cargo_seconds']:.9f}",
+        ]
+        last = self.last
+        if last is not None:
+            gauges = [("last_duration_seconds", last["duration_s"]),
+                      ("last_unassigned", last["unassigned"]),
+                      ("last_vehicles_used", last["vehicles_used"])]
+            if "peak_memory_bytes" in last:
+                gauges += [("last_peak_memory_bytes", last["peak_memory_bytes"]),
+                           ("last_allocated_bytes", last["allocated_bytes"])]
+            for name, value in gauges:
+                lines += [f"# TYPE transport_distribution_{name} gauge",
+                          f'transport_distribution_{name}{{strategy="{last["strategy"]}"}} {value}']
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _attribute(key: str, value) -> dict:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    def to_spans(self) -> dict:
+        # Прогоны в формате OTLP/JSON (OpenTelemetry): корневой span на прогон и дочерние на фазы
+        spans = []
+        for run in self.runs:
+            trace_id = secrets.token_hex(16)
+            root_id = secrets.token_hex(8)
+            attributes = {key: run[key] for key in ("strategy", "clients", "vehicles", "capacity_probes",
+                                                    "loads", "load_cargo_s", "unassigned", "vehicles_used",
+                                                    "allocated_bytes", "peak_memory_bytes") if key in run}
+            spans.append({
+                "traceId": trace_id,
+                "spanId": root_id,
+                "name": "optimize_cargo_distribution",
+                "kind": 1,
+                "startTimeUnixNano": str(run["started_ns"]),
+                "endTimeUnixNano": str(run["started_ns"] + int(run["duration_s"] * 1e9)),
+                "attributes": [self._attribute(k, v) for k, v in attributes.items()],
+            })
+            for name, start_ns, end_ns in run["spans"]:
+                spans.append({
+                    "traceId": trace_id,
+                    "spanId": secrets.token_hex(8),
+                    "parentSpanId": root_id,
+                    "name": name,
+                    "kind": 1,
+                    "startTimeUnixNano": str(start_ns),
+                    "endTimeUnixNano": str(end_ns),
+                })
+        return {"resourceSpans": [{
+            "resource": {"attributes": [self._attribute("service.name", "transport")]},
+            "scopeSpans": [{"scope": {"name": "transport.distribution_metrics"}, "spans": spans}],
+        }]}
+
+    def write_spans(self, path: str):
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_spans(), f, ensure_ascii=False)
+        os.replace(temp_path, path)
@@ -0,0 +1,77 @@
+class FirstFitTree:
+    # Турнирное дерево максимумов над остаточной вместимостью транспорта.
+    # Позволяет найти первый по порядку транспорт со свободным местом за O(log m).
+    EPSILON = 1e-9
+
+    def __init__(self, residuals):
+        self.count = len(residuals)
+        size = 1
+        while size < max(self.count, 1):
+            size *= 2
+        self.size = size
+        self.tree = [float("-inf")] * (2 * size)
+        self.tree[size:size + self.count] = [float(r) for r in residuals]
+        for i in range(size - 1, 0, -1):
+            left = self.tree[2 * i]
+            right = self.tree[2 * i + 1]
+            self.tree[i] = left if left >= right else right
+
+    def max_residual(self) -> float:
+        return self.tree[1]
+
+    def residual(self, index: int) -> float:
+        return self.tree[self.size + index]
+
+    def append(self, residual: float) -> int:
+        # Добавляет лист в конец; при нехватке места дерево перестраивается вдвое большим
+        if self.count == self.size:
+            leaves = self.tree[self.size:self.size + self.count]
+            self.__init__(leaves + [residual])
+            return self.count - 1
+        self.count += 1
+        self.update(self.count - 1, residual)
+        return self.count - 1
+
+    def update(self, index: int, residual: float):
+        tree = self.tree
+        i = self.size + index
+        tree[i] = residual
+        i //= 2
+        while i:
+            left = tree[2 * i]
+            right = tree[2 * i + 1]
+            best = left if left >= right else right
+            if tree[i] == best:
+                break
+            tree[i] = best
+            i //= 2
+
+    def find_first(self, weight: float, start: int = 0) -> int:
+        # Возвращает индекс первого листа (не раньше start), где остаток >= weight,
+        # либо -1. Сравнение ведется с небольшим запасом, поэтому кандидат
+        # нужно дополнительно проверить через Vehicle.has_space_for.
+        tree = self.tree
+        need = weight - self.EPSILON
+        if start >= self.count or tree[1] < need:
+            return -1
+        if start == 0:
+            i = 1
+            while i < self.size:
+                i = 2 * i if tree[2 * i] >= need else 2 * i + 1
+            return i - self.size
+
+        # Поднимаемся от start, пока не найдем правое поддерево с подходящим максимумом
+        i = self.size + start
+        if tree[i] >= need:
+            return start
+        while True:
+            while i & 1:
+                i //= 2
+                if i <= 1:
+                    return -1
+            i += 1
+            if tree[i] >= need:
+                break
+        while i < self.size:
+            i = 2 * i if tree[2 * i] >= need else 2 * i + 1
+        return i - self.size
@@ -0,0 +1,164 @@
+class FleetStats:
+    # Накопительные сводки по компании. Обновляются за O(1) на каждое событие
+    # (добавление/удаление транспорта и клиентов, загрузка и выгрузка груза),
+    # поэтому stats() и гистограмму можно опрашивать сколь угодно часто.
+    BINS = 10
+
+    def __init__(self):
+        self.vehicle_count = 0
+        self.used_vehicles = 0
+        self.total_capacity = 0.0
+        self.loaded_weight = 0.0
+        self.client_count = 0
+        self.loaded_count = 0
+        self.demand = 0.0
+        self.vip_demand = 0.0
+        self.vip_loaded_weight = 0.0
+        self.count_by_type = {}
+        self.capacity_by_type = {}
+        self.load_by_type = {}
+        self.bin_vehicles = [0] * self.BINS
+        self.bin_free = [0.0] * self.BINS
+        # Транспорт -> (учтенная загрузка, корзина гистограммы)
+        self._state = {}
+
+    def _bin(self, vehicle, load: float) -> int:
+        return max(0, min(self.BINS - 1, int(load / vehicle.capacity * self.BINS)))
+
+    def _account(self, vehicle, sign: int):
+        # Вклад машины в загрузку, гистограмму и счетчик занятых: sign = +1 / -1
+        if sign > 0:
+            load = vehicle.current_load
+            index = self._bin(vehicle, load)
+        else:
+            load, index = self._state[vehicle]
+        kind = type(vehicle).__name__
+        self.loaded_weight += sign * load
+        self.load_by_type[kind] += sign * load
+        self.bin_vehicles[index] += sign
+        self.bin_free[index] += sign * (vehicle.capacity - load)
+        if vehicle.clients_list:
+            self.used_vehicles += sign
+        if sign > 0:
+            self._state[vehicle] = (load, index)
+
+    def add_vehicle(self, vehicle):
+        kind = type(vehicle).__name__
+        self.vehicle_count += 1
+        self.total_capacity += vehicle.capacity
+        self.count_by_type[kind] = self.count_by_type.get(kind, 0) + 1
+        self.capacity_by_type[kind] = self.capacity_by_type.get(kind, 0.0) + vehicle.capacity
+        self.load_by_type.setdefault(kind, 0.0)
+        # Транспорт может прийти уже загруженным (например, из снимка)
+        self._account(vehicle, 1)
+        self._count_clients(vehicle.clients_list, 1)
+
+    def remove_vehicle(self, vehicle):
+        kind = type(vehicle).__name__
+        self._account(vehicle, -1)
+        self._count_clients(vehicle.clients_list, -1)
+        del self._state[vehicle]
+        self.vehicle_count -= 1
+        self.total_capacity -= vehicle.capacity
+        self.capacity_by_type[kind] -= vehicle.capacity
+        self.count_by_type[kind] -= 1
+        if not self.count_by_type[kind]:
+            del self.count_by_type[kind], self.capacity_by_type[kind], self.load_by_type[kind]
+        if self.vehicle_count == 0:
+            self.total_capacity = 0.0
+
+    def _count_clients(self, clients, sign: int):
+        for client in clients:
+            self.loaded_count += sign
+            if client.is_vip:
+                self.vip_loaded_weight += sign * client.cargo_weight
+
+    def add_client(self, client):
+        self.client_count += 1
+        self.demand += client.cargo_weight
+        if client.is_vip:
+            self.vip_demand += client.cargo_weight
+
+    def remove_client(self, client):
+        self.client_count -= 1
+        self.demand -= client.cargo_weight
+        if client.is_vip:
+            self.vip_demand -= client.cargo_weight
+        if self.client_count == 0:
+            self.demand = 0.0
+            self.vip_demand = 0.0
+
+    def _moved(self, vehicle, was_used: bool):
+        # Пересчет вклада одной машины по разнице с учтенным состоянием
+        old_load, old_index = self._state[vehicle]
+        load = vehicle.current_load
+        index = self._bin(vehicle, load)
+        kind = type(vehicle).__name__
+        self.loaded_weight += load - old_load
+        self.load_by_type[kind] += load - old_load
+        self.bin_vehicles[old_index] -= 1
+        self.bin_free[old_index] -= vehicle.capacity - old_load
+        self.bin_vehicles[index] += 1
+        self.bin_free[index] += vehicle.capacity - load
+        self.used_vehicles += bool(vehicle.clients_list) - was_used
+        self._state[vehicle] = (load, index)
+
+    def cargo_loaded(self, vehicle, client):
+        if vehicle not in self._state:
+            return
+        self._count_clients((client,), 1)
+        self._moved(vehicle, len(vehicle.clients_list) > 1)
+
+    def cargo_loaded_many(self, vehicle, clients):
+        if vehicle not in self._state:
+            return
+        self._count_clients(clients, 1)
+        self._moved(vehicle, len(vehicle.clients_list) > len(clients))
+
+    def cargo_unloaded(self, vehicle, client):
+        if vehicle not in self._state:
+            return
+        self._count_clients((client,), -1)
+        self._moved(vehicle, True)
+
+    def load_reset(self, vehicle):
+        # Вызывается до очистки: загрузка машины еще не сброшена
+        if vehicle not in self._state:
+            return
+        self._count_clients(vehicle.clients_list, -1)
+        self._account(vehicle, -1)
+        self._state[vehicle] = (0.0, 0)
+        self.bin_vehicles[0] += 1
+        self.bin_free[0] += vehicle.capacity
+
+    def histogram(self) -> list:
+        width = 1.0 / self.BINS
+        return [
+            {"from": round(k * width, 6), "to": round((k + 1) * width, 6),
+             "vehicles": self.bin_vehicles[k], "free_capacity": max(0.0, self.bin_free[k])}
+            for k in range(self.BINS)
+        ]
+
+    def summary(self) -> dict:
+        loaded = max(0.0, self.loaded_weight)
+        vip_loaded = max(0.0, self.vip_loaded_weight)
+        return {
+            "vehicles": self.vehicle_count,
+            "vehicles_used": self.used_vehicles,
+            "clients": self.client_count,
+            "clients_loaded": self.loaded_count,
+            "clients_unassigned": self.client_count - self.loaded_count,
+            "total_capacity": self.total_capacity,
+            "loaded_weight": loaded,
+            "free_capacity": max(0.0, self.total_capacity - loaded),
+            "utilization": loaded / self.total_capacity if self.total_capacity else 0.0,
+            "demand": max(0.0, self.demand),
+            "unassigned_weight": max(0.0, self.demand - loaded),
+            "vip_demand": max(0.0, self.vip_demand),
+            "vip_loaded_weight": vip_loaded,
+            "vip_share": vip_loaded / loaded if loaded else 0.0,
+            "free_capacity_by_type": {
+                kind: max(0.0, capacity - self.load_by_type[kind])
+                for kind, capacity in self.capacity_by_type.items()
+            },
+        }
@@ -0,0 +1,133 @@
+import math
+import time
+from bisect import bisect_left, bisect_right
+
+
+def lower_bound(weights, capacities) -> int:
+    # Нижняя оценка числа транспортных средств для размещения всех грузов.
+    # weights — по убыванию, capacities — по убыванию грузоподъемности.
+    if not weights:
+        return 0
+    total = sum(weights)
+
+    # L1: сколько самых вместительных машин нужно хотя бы по суммарному весу
+    l1 = 0
+    cumulative = 0.0
+    for capacity in capacities:
+        if cumulative >= total:
+            break
+        cumulative += capacity
+        l1 += 1
+
+    # L2 (Мартелло — Тот) для вместимости самой большой машины: меньшие машины
+    # только строже, поэтому оценка остается корректной
+    c = capacities[0]
+    ascending = weights[::-1]
+    prefix = [0.0]
+    for w in ascending:
+        prefix.append(prefix[-1] + w)
+
+    def count_le(x):
+        return bisect_right(ascending, x)
+
+    def sum_between(lo, hi):
+        # Сумма весов из полуинтервала (lo, hi]
+        return prefix[count_le(hi)] - prefix[count_le(lo)]
+
+    n = len(ascending)
+    half = c / 2
+    l2 = 0
+    alphas = {0.0}
+    alphas.update(w for w in ascending if w <= half)
+    for alpha in alphas:
+        j1 = n - count_le(c - alpha)
+        j2 = count_le(c - alpha) - count_le(half)
+        j2_sum = sum_between(half, c - alpha)
+        j3_sum = prefix[count_le(half)] - prefix[bisect_left(ascending, alpha)]
+        rest = j3_sum - (j2 * c - j2_sum)
+        value = j1 + j2 + max(0, math.ceil(rest / c - 1e-9))
+        if value > l2:
+            l2 = value
+
+    return max(l1, l2)
+
+
+def pack_into(weights, capacities, deadline: float):
+    # Ветви и границы: разместить все грузы (по убыванию) в заданные машины.
+    # Граница в каждом узле: остаток машины меньше самого легкого груза уже не
+    # заполнится, и если такой потерянной вместимости больше, чем запас парка
+    # (вместимость минус весь вес), оставшимся грузам не хватит места — ветвь
+    # отсекается. Возвращает номер машины для каждого груза, None при
+    # невозможности и False при исчерпании времени.
+    n = len(weights)
+    k = len(capacities)
+    slack = sum(capacities) - sum(weights)
+    if slack < -1e-9:
+        return None
+    if n == 0:
+        return []
+    if time.monotonic() > deadline:
+        return False
+    smallest = weights[-1]
+    eps = 1e-9 * max(1.0, slack)
+
+    def lost(residual):
+        return residual if residual < smallest - 1e-9 else 0.0
+
+    loads = [0.0] * k
+    placed = [-1] * n
+    waste = sum(lost(c) for c in capacities)
+    i = 0
+    steps = 0
+
+    while 0 <= i < n:
+        steps += 1
+        if steps & 4095 == 0 and time.monotonic() > deadline:
+            return False
+
+        w = weights[i]
+        j = placed[i] + 1
+        if placed[i] != -1:
+            previous = placed[i]
+            waste -= lost(capacities[previous] - loads[previous])
+            loads[previous] -= w
+            waste += lost(capacities[previous] - loads[previous])
+            placed[i] = -1
+
+        while j < k:
+            # Машина в том же состоянии, что и предыдущая, уже была перебрана
+            if j and capacities[j] == capacities[j - 1] and loads[j] == loads[j - 1]:
+                j += 1
+                continue
+            if loads[j] + w <= capacities[j]:
+                residual = capacities[j] - loads[j]
+                if waste - lost(residual) + lost(residual - w) <= slack + eps:
+                    break
+            j += 1
+
+        if j == k:
+            i -= 1
+            continue
+        waste += lost(capacities[j] - loads[j] - w) - lost(capacities[j] - loads[j])
+        loads[j] += w
+        placed[i] = j
+        i += 1
+
+    return placed if i == n else None
+
+
+def solve(weights, capacities, upper_bound: int, deadline: float):
+    # Ищет минимальное число машин k: достаточно проверять k самых вместительных,
+    # т.к. любые k машин можно заменить ими без потери допустимости.
+    # Возвращает (лучшее k или None, доказанная нижняя оценка, размещение).
+    bound = lower_bound(weights, capacities)
+    for k in range(bound, upper_bound):
+        if time.monotonic() > deadline:
+            return None, bound, None
+        placement = pack_into(weights, capacities[:k], deadline)
+        if placement is False:
+            return None, bound, None
+        if placement is not None:
+            return k, k, placement
+        bound = k + 1
+    return None, bound, None
@@ -0,0 +1,170 @@
+from bisect import bisect_left, insort
+from collections import deque
+
+from .first_fit_tree import FirstFitTree
+
+
+class OnlineAssigner:
+    # Размещение непрерывно поступающих заказов: каждый клиент загружается сразу,
+    # без сортировки всего потока. В памяти хранятся только открытые машины;
+    # неначатые ждут в резерве по убыванию грузоподъемности, заполненные закрываются.
+    # Клиенты потока регистрируются в компании (как add_client, но без расчета плана):
+    # stats() учитывает их спрос, а не размещенные попадают в company.unassigned.
+    # Ограничена только память самого распределителя: компания, как и при add_client,
+    # хранит каждого клиента потока в своих индексах, а транспорт — в clients_list.
+    POLICIES = ("first_fit", "best_fit", "harmonic")
+
+    def __init__(self, company, policy: str = "first_fit", harmonic_classes: int = 4, close_below: float = 0.0):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Неизвестная политика размещения: {policy}.")
+        if not isinstance(harmonic_classes, int) or harmonic_classes < 2:
+            raise ValueError("Число классов Harmonic должно быть целым числом не меньше 2.")
+        if not isinstance(close_below, (int, float)) or close_below < 0:
+            raise ValueError("Порог закрытия должен быть неотрицательным числом.")
+        self.company = company
+        self.policy = policy
+        self.close_below = close_below
+        self.classes = harmonic_classes
+
+        vehicles = sorted(company.vehicles, key=lambda v: v.capacity, reverse=True)
+        self.reference = vehicles[0].capacity if vehicles else 0.0
+        self.reserve = deque(v for v in vehicles if not v.clients_list)
+
+        # first_fit: дерево остатков по порядку открытия
+        self.tree = FirstFitTree([])
+        self.slots = {}
+        # best_fit: отсортированный список (остаток, номер открытия)
+        self.residuals = []
+        self.opened = 0
+        # harmonic: текущая машина каждого класса размеров
+        self.by_class = {}
+
+        for v in vehicles:
+            if v.clients_list:
+                self._open(v)
+
+    def _residual(self, vehicle) -> float:
+        return vehicle.capacity - vehicle.current_load
+
+    def _open(self, vehicle, size_class: int = None):
+        # Возвращает ключ открытой машины в slots
+        number = self.opened
+        self.opened += 1
+        if self.policy == "first_fit":
+            number = self.tree.append(self._residual(vehicle))
+            self.slots[number] = vehicle
+        elif self.policy == "best_fit":
+            self.slots[number] = vehicle
+            insort(self.residuals, (self._residual(vehicle), number))
+        else:
+            self.by_class[size_class] = vehicle
+        return number
+
+    def _take_reserve(self, client):
+        # Первая по убыванию грузоподъемности неначатая машина, вмещающая груз по всем
+        # измерениям; если не хватает грузоподъемности, дальше искать бессмысленно
+        for i, vehicle in enumerate(self.reserve):
+            if vehicle.capacity < client.cargo_weight:
+                break
+            if vehicle.fits(client):
+                del self.reserve[i]
+                return vehicle
+        return None
+
+    def _size_class(self, weight: float) -> int:
+        if weight <= 0 or self.reference <= 0:
+            return self.classes
+        return max(1, min(self.classes, int(self.reference // weight)))
+
+    def _place_first_fit(self, client, events):
+        weight = client.cargo_weight
+        index = self.tree.find_first(weight)
+        while index != -1 and not self.slots[index].fits(client):
+            index = self.tree.find_first(weight, index + 1)
+        if index == -1:
+            vehicle = self._take_reserve(client)
+            if vehicle is None:
+                return None
+            index = self._open(vehicle)
+        vehicle = self.slots[index]
+        vehicle.load_cargo(client)
+        if self._residual(vehicle) <= self.close_below:
+            self.tree.update(index, float("-inf"))
+            del self.slots[index]
+            events.append(("closed", None, vehicle))
+        else:
+            self.tree.update(index, self._residual(vehicle))
+        return vehicle
+
+    def _place_best_fit(self, client, events):
+        weight = client.cargo_weight
+        pos = bisect_left(self.residuals, (weight - FirstFitTree.EPSILON, -1))
+        while pos < len(self.residuals) and not self.slots[self.residuals[pos][1]].fits(client):
+            pos += 1
+        if pos < len(self.residuals):
+            number = self.residuals.pop(pos)[1]
+        else:
+            vehicle = self._take_reserve(client)
+            if vehicle is None:
+                return None
+            number = self._open(vehicle)
+            self.residuals.remove((self._residual(vehicle), number))
+        vehicle = self.slots[number]
+        vehicle.load_cargo(client)
+        if self._residual(vehicle) <= self.close_below:
+            del self.slots[number]
+            events.append(("closed", None, vehicle))
+        else:
+            insort(self.residuals, (self._residual(vehicle), number))
+        return vehicle
+
+    def _place_harmonic(self, client, events):
+        weight = client.cargo_weight
+        size_class = self._size_class(weight)
+        vehicle = self.by_class.get(size_class)
+        if vehicle is None or not vehicle.fits(client):
+            replacement = self._take_reserve(client)
+            if replacement is None:
+                return None
+            if vehicle is not None:
+                events.append(("closed", None, vehicle))
+            vehicle = replacement
+            self._open(vehicle, size_class)
+        vehicle.load_cargo(client)
+        if self._residual(vehicle) <= self.close_below:
+            del self.by_class[size_class]
+            events.append(("closed", None, vehicle))
+        return vehicle
+
+    def assign(self, client) -> list:
+        # Размещает одного клиента; возвращает события ("assigned" | "unassigned" | "closed", клиент, транспорт)
+        if not hasattr(client, 'cargo_weight') or not hasattr(client, 'name'):
+            raise TypeError("Объект должен быть экземпляром класса Client.")
+        events = []
+        if self.policy == "first_fit":
+            place = self._place_first_fit
+        elif self.policy == "best_fit":
+            place = self._place_best_fit
+        else:
+            place = self._place_harmonic
+        # Повторно отправленный клиент отклоняется (ValueError) до размещения
+        vehicle = self.company._admit_streamed(client, lambda c: place(c, events))
+        kind = "unassigned" if vehicle is None else "assigned"
+        events.insert(0, (kind, client, vehicle))
+        return events
+
+    def stream(self, clients):
+        # Генератор событий для итератора клиентов
+        for client in clients:
+            yield from self.assign(client)
+
+    async def stream_async(self, clients):
+        # То же для асинхронного потока клиентов
+        async for client in clients:
+            for event in self.assign(client):
+                yield event
+
+    def open_vehicles(self) -> list:
+        if self.policy == "harmonic":
+            return list(self.by_class.values())
+        return list(self.slots.values())
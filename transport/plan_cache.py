@@ -0,0 +1,87 @@
+from collections import OrderedDict
+
+MASK = (1 << 64) - 1
+MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+def client_key(client) -> tuple:
+    return (client.name, client.cargo_weight, client.is_vip, client.volume, client.slots)
+
+
+def vehicle_key(vehicle) -> tuple:
+    return (type(vehicle).__name__, vehicle.capacity, vehicle.volume_capacity, vehicle.slot_capacity)
+
+
+def _mix(key) -> int:
+    return (hash(key) * MULTIPLIER) & MASK
+
+
+class PlanCache:
+    # LRU-кэш готовых планов. Ключ — отпечаток состава и стратегия. Отпечаток —
+    # хеш мультимножества клиентов и парка: сумма перемешанных хешей элементов
+    # по модулю 2^64. Он обновляется за O(1) на каждое изменение и не зависит
+    # от порядка добавления. План хранится ссылками на объекты клиентов и транспорта.
+    def __init__(self, capacity: int = 4):
+        self._check(capacity)
+        self.capacity = capacity
+        self._plans = OrderedDict()
+        self._client_count = 0
+        self._client_hash = 0
+        self._vehicle_count = 0
+        self._vehicle_hash = 0
+        self.counters = {"unchanged": 0, "replayed": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def _check(capacity):
+        if isinstance(capacity, bool) or not isinstance(capacity, int) or capacity < 0:
+            raise ValueError("Размер кэша планов должен быть неотрицательным целым числом.")
+
+    def client_added(self, client, sign: int = 1):
+        self._client_count += sign
+        self._client_hash = (self._client_hash + sign * _mix(client_key(client))) & MASK
+
+    def vehicle_added(self, vehicle, sign: int = 1):
+        self._vehicle_count += sign
+        self._vehicle_hash = (self._vehicle_hash + sign * _mix(vehicle_key(vehicle))) & MASK
+
+    def fingerprint(self) -> tuple:
+        return self._client_count, self._client_hash, self._vehicle_count, self._vehicle_hash
+
+    def get(self, key):
+        entry = self._plans.get(key)
+        if entry is not None:
+            self._plans.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        if not self.capacity:
+            return
+        self._plans[key] = entry
+        self._plans.move_to_end(key)
+        while len(self._plans) > self.capacity:
+            self._plans.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def discard(self, key):
+        self._plans.pop(key, None)
+
+    def record(self, outcome: str):
+        self.counters[outcome] += 1
+
+    def resize(self, capacity: int):
+        self._check(capacity)
+        self.capacity = capacity
+        while len(self._plans) > capacity:
+            self._plans.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def stats(self) -> dict:
+        hits = self.counters["unchanged"] + self.counters["replayed"]
+        lookups = hits + self.counters["misses"]
+        return {
+            "capacity": self.capacity,
+            "size": len(self._plans),
+            "hits": hits,
+            **self.counters,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,114 @@
+import csv
+import json
+import os
+
+from .planned_vehicle import PlannedVehicle
+
+FORMATS = ("json", "jsonl", "csv")
+CSV_FIELDS = ("vehicle_id", "type", "capacity", "current_load", "volume_capacity", "current_volume",
+              "slot_capacity", "used_slots", "client_name", "cargo_weight", "is_vip", "volume", "slots")
+
+
+def vehicle_type(vehicle) -> str:
+    # Запись версии плана хранит имя типа исходного транспорта
+    if isinstance(vehicle, PlannedVehicle):
+        return vehicle.type_name
+    return type(vehicle).__name__
+
+
+def vehicle_record(vehicle) -> dict:
+    return {
+        "id": vehicle.vehicle_id,
+        "type": vehicle_type(vehicle),
+        "capacity": vehicle.capacity,
+        "current_load": vehicle.current_load,
+        "clients": [
+            {"name": c.name, "cargo_weight": c.cargo_weight, "is_vip": c.is_vip}
+            for c in vehicle.clients_list
+        ],
+    }
+
+
+def _write_json(f, company, vehicles, step):
+    # Компактный JSON той же структуры, что и прежний экспорт, но записываемый по одной машине
+    f.write('{"company": ' + json.dumps(company.name, ensure_ascii=False) + ', "vehicles": [')
+    for i, v in enumerate(vehicles):
+        if i:
+            f.write(",")
+        f.write(json.dumps(vehicle_record(v), ensure_ascii=False, separators=(",", ":")))
+        step(i)
+    f.write("]}\n")
+
+
+def _write_jsonl(f, company, vehicles, step):
+    for i, v in enumerate(vehicles):
+        f.write(json.dumps(vehicle_record(v), ensure_ascii=False, separators=(",", ":")))
+        f.write("\n")
+        step(i)
+
+
+def _limit(value):
+    # Неограниченная вместимость по объему или местам — пустая ячейка, как в манифесте
+    return "" if value == float("inf") else value
+
+
+def _write_csv(f, company, vehicles, step):
+    # Строка на каждого клиента; пустой транспорт — строка без клиента
+    writer = csv.writer(f)
+    writer.writerow(CSV_FIELDS)
+    for i, v in enumerate(vehicles):
+        base = (v.vehicle_id, vehicle_type(v), v.capacity, v.current_load,
+                _limit(v.volume_capacity), v.current_volume, _limit(v.slot_capacity), v.used_slots)
+        if v.clients_list:
+            writer.writerows(base + (c.name, c.cargo_weight, c.is_vip, c.volume, c.slots) for c in v.clients_list)
+        else:
+            writer.writerow(base + ("", "", "", "", ""))
+        step(i)
+
+
+WRITERS = {"json": _write_json, "jsonl": _write_jsonl, "csv": _write_csv}
+
+
+def _check(fmt: str, progress_every: int):
+    if fmt not in WRITERS:
+        raise ValueError(f"Неподдерживаемый формат экспорта: {fmt}.")
+    if not isinstance(progress_every, int) or progress_every <= 0:
+        raise ValueError("Шаг прогресса должен быть положительным целым числом.")
+
+
+def write_distribution(company, f, fmt: str = "json", progress=None, progress_every: int = 1000) -> int:
+    # Потоковая запись результатов в открытый текстовый файл (например, sys.stdout).
+    # progress(записано, всего) вызывается каждые progress_every машин и в конце.
+    # Вместо компании можно передать версию плана (company.plan()) — тогда
+    # экспорт идет без блокировок параллельно с расчетом.
+    _check(fmt, progress_every)
+    vehicles = company.vehicles
+    total = len(vehicles)
+
+    def step(i):
+        if progress is not None and (i + 1) % progress_every == 0:
+            progress(i + 1, total)
+
+    WRITERS[fmt](f, company, vehicles, step)
+    if progress is not None and (total == 0 or total % progress_every):
+        progress(total, total)
+    return total
+
+
+def export_distribution(company, path: str, fmt: str = None, progress=None, progress_every: int = 1000) -> int:
+    # Экспорт в файл. Формат берется из расширения файла, если не задан явно.
+    # Файл пишется во временный и затем атомарно заменяется.
+    if fmt is None:
+        fmt = os.path.splitext(path)[1].lstrip(".").lower() or "json"
+    _check(fmt, progress_every)
+
+    temp_path = f"{path}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8", newline="") as f:
+            total = write_distribution(company, f, fmt, progress, progress_every)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return total
@@ -0,0 +1,121 @@
+import heapq
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .first_fit_tree import FirstFitTree
+from .packing_strategies import first_fit
+
+SHARD_MODES = ("balanced", "type")
+
+
+def pack_shard(payload):
+    # Выполняется в процессе-обработчике. На вход — байты массивов
+    # (грузоподъемности, начальные загрузки, веса обычных грузов), на выход — номер
+    # машины шарда для каждого груза (-1 — не поместился). Грузы — в порядке шарда,
+    # транспорт по убыванию грузоподъемности, первый подходящий. Упаковка только
+    # по весу: объем и места проверяет раскладка, а ремонтный проход размещает
+    # отказанные грузы по всем измерениям.
+    capacity_bytes, load_bytes, weight_bytes = payload
+    capacity = array("d")
+    capacity.frombytes(capacity_bytes)
+    load = array("d")
+    load.frombytes(load_bytes)
+    weights = array("d")
+    weights.frombytes(weight_bytes)
+
+    order_vehicles = sorted(range(len(capacity)), key=capacity.__getitem__, reverse=True)
+    result = array("q", [-1]) * len(weights)
+    tree = FirstFitTree([capacity[j] - load[j] for j in order_vehicles])
+
+    for i, w in enumerate(weights):
+        pos = tree.find_first(w)
+        while pos != -1 and not load[order_vehicles[pos]] + w <= capacity[order_vehicles[pos]]:
+            pos = tree.find_first(w, pos + 1)
+        if pos == -1:
+            continue
+        j = order_vehicles[pos]
+        load[j] += w
+        result[i] = j
+        tree.update(pos, capacity[j] - load[j])
+    return result.tobytes()
+
+
+def _split_vehicles(vehicles, shards: int, shard_by: str):
+    if shard_by == "type":
+        groups = {}
+        for v in vehicles:
+            groups.setdefault(type(v), []).append(v)
+        return list(groups.values())
+    # Раздаем машины по кругу в порядке убывания грузоподъемности — в каждом шарде похожий состав
+    ordered = sorted(vehicles, key=lambda v: v.capacity, reverse=True)
+    return [group for group in (ordered[k::shards] for k in range(shards)) if group]
+
+
+def _split_clients(clients, vehicle_groups):
+    # Каждый груз (по убыванию веса) уходит в шард с наименьшей долей занятой
+    # свободной вместимости; шард без свободного места получает грузы последним
+    capacities = [sum(v.capacity - v.current_load for v in group) for group in vehicle_groups]
+    heap = [(0.0, k) for k in range(len(vehicle_groups))]
+    groups = [[] for _ in vehicle_groups]
+    demand = [0.0] * len(vehicle_groups)
+    for client in sorted(clients, key=lambda c: (not c.is_vip, -c.cargo_weight)):
+        _, k = heapq.heappop(heap)
+        groups[k].append(client)
+        demand[k] += client.cargo_weight
+        heapq.heappush(heap, (demand[k] / capacities[k] if capacities[k] > 0 else float("inf"), k))
+    return groups
+
+
+def distribute_sharded(company, workers: int = None, shard_by: str = "balanced"):
+    # Параллельное распределение. VIP-грузы сначала размещаются по всему парку,
+    # как при последовательном распределении: иначе обычный груз одного шарда мог
+    # бы занять место, нужное VIP-грузу, не поместившемуся в своем шарде. Затем
+    # обычные клиенты и транспорт делятся на шарды, каждый шард упаковывается в
+    # отдельном процессе, и нераспределенные грузы повторно размещаются по всем машинам.
+    # Шарды делятся и упаковываются только по весу; ограничения по объему и местам
+    # соблюдает раскладка результата (Vehicle.fits) и ремонтный проход first_fit.
+    if shard_by not in SHARD_MODES:
+        raise ValueError(f"Неизвестный способ разбиения: {shard_by}.")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not isinstance(workers, int) or workers <= 0:
+        raise ValueError("Количество процессов должно быть положительным целым числом.")
+
+    for v in company.vehicles:
+        v.reset_load()
+    if not company.vehicles:
+        return list(company.clients)
+
+    sorted_vehicles = sorted(company.vehicles, key=lambda v: v.capacity, reverse=True)
+    vip_unassigned = first_fit([c for c in company.clients if c.is_vip], sorted_vehicles)
+    regular = [c for c in company.clients if not c.is_vip]
+
+    vehicle_groups = _split_vehicles(company.vehicles, workers, shard_by)
+    client_groups = _split_clients(regular, vehicle_groups)
+    payloads = [
+        (array("d", (v.capacity for v in vehicles)).tobytes(),
+         array("d", (v.current_load for v in vehicles)).tobytes(),
+         array("d", (c.cargo_weight for c in clients)).tobytes())
+        for vehicles, clients in zip(vehicle_groups, client_groups)
+    ]
+
+    if workers == 1 or len(payloads) == 1:
+        results = map(pack_shard, payloads)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(payloads))) as executor:
+            results = list(executor.map(pack_shard, payloads))
+
+    leftovers = []
+    for vehicles, clients, data in zip(vehicle_groups, client_groups, results):
+        assignment = array("q")
+        assignment.frombytes(data)
+        for client, j in zip(clients, assignment):
+            # Груз, не прошедший по объему или местам, уходит в ремонтный проход
+            if j == -1 or not vehicles[j].fits(client):
+                leftovers.append(client)
+            else:
+                vehicles[j].load_cargo(client)
+
+    # Ремонтный проход: остатки всех шардов по всему парку
+    return vip_unassigned + first_fit(leftovers, sorted_vehicles)
@@ -0,0 +1,251 @@
+import json
+import mmap
+import os
+import struct
+from array import array
+
+
+# Бинарный столбцовый снимок состояния компании:
+#   MAGIC | длина заголовка (uint64) | JSON-заголовок | столбцы, выровненные по 8 байт.
+# Заголовок хранит для каждого столбца смещение, длину в байтах и код типа array.
+# Файл открывается через mmap, поэтому читаются только затронутые страницы.
+MAGIC = b"TCSNAP1\0"
+ALIGN = 8
+UNLIMITED = float("inf")
+# Коды типов транспорта в столбце vehicle_kind
+KIND_VEHICLE = 0
+KIND_TRAIN = 1
+KIND_AIRPLANE = 2
+
+
+def _strings(values):
+    # Строки -> (смещения int64, общий буфер UTF-8)
+    offsets = array("q", [0])
+    blob = bytearray()
+    for value in values:
+        blob += value.encode("utf-8")
+        offsets.append(len(blob))
+    return offsets, array("B", blob)
+
+
+def save_snapshot(company, path: str):
+    from .train import Train
+    from .airplane import Airplane
+
+    vehicles = company.vehicles
+    clients = company.clients
+    vehicle_index = {id(v): j for j, v in enumerate(vehicles)}
+
+    kinds = array("b")
+    extras = array("q")
+    for v in vehicles:
+        if isinstance(v, Train):
+            kinds.append(KIND_TRAIN)
+            extras.append(v.number_of_cars)
+        elif isinstance(v, Airplane):
+            kinds.append(KIND_AIRPLANE)
+            extras.append(v.max_altitude)
+        else:
+            kinds.append(KIND_VEHICLE)
+            extras.append(0)
+
+    # Назначение клиента и его место в clients_list транспорта
+    placement = {}
+    for v in vehicles:
+        for position, client in enumerate(v.clients_list):
+            placement[id(client)] = (vehicle_index[id(v)], position)
+    assignment = array("q")
+    load_order = array("q")
+    for c in clients:
+        j, position = placement.get(id(c), (-1, -1))
+        assignment.append(j)
+        load_order.append(position)
+
+    id_offsets, id_blob = _strings(v.vehicle_id for v in vehicles)
+    name_offsets, name_blob = _strings(c.name for c in clients)
+    columns = {
+        "capacity": array("d", (v.capacity for v in vehicles)),
+        "current_load": array("d", (v.current_load for v in vehicles)),
+        "vehicle_kind": kinds,
+        "vehicle_extra": extras,
+        "vehicle_id_offsets": id_offsets,
+        "vehicle_id_blob": id_blob,
+        "volume_capacity": array("d", (v.volume_capacity for v in vehicles)),
+        "slot_capacity": array("d", (v.slot_capacity for v in vehicles)),
+        "cargo_weight": array("d", (c.cargo_weight for c in clients)),
+        "is_vip": array("b", (c.is_vip for c in clients)),
+        "volume": array("d", (c.volume for c in clients)),
+        "slots": array("q", (c.slots for c in clients)),
+        "assignment": assignment,
+        "load_order": load_order,
+        "name_offsets": name_offsets,
+        "name_blob": name_blob,
+    }
+
+    layout = {}
+    offset = 0
+    for name, column in columns.items():
+        size = len(column) * column.itemsize
+        layout[name] = [offset, size, column.typecode]
+        offset += size + (-size) % ALIGN
+    header = json.dumps({
+        "company": company.name,
+        "vehicles": len(vehicles),
+        "clients": len(clients),
+        "columns": layout,
+    }, ensure_ascii=False).encode("utf-8")
+    header += b" " * ((-len(header)) % ALIGN)
+
+    # Снимок пишется во временный файл рядом и затем атомарно заменяет прежний:
+    # сбой посреди записи не оставляет усеченного файла
+    temp_path = f"{path}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            for name, column in columns.items():
+                size = len(column) * column.itemsize
+                f.write(column.tobytes())
+                f.write(b"\0" * ((-size) % ALIGN))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class Snapshot:
+    # Снимок, открытый через mmap: столбцы доступны как memoryview без копирования
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError("Файл снимка пуст или поврежден.") from None
+        if self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError("Файл не является снимком транспортной компании.")
+        (header_size,) = struct.unpack_from("<Q", self._map, len(MAGIC))
+        start = len(MAGIC) + 8
+        header = json.loads(bytes(self._map[start:start + header_size]).decode("utf-8"))
+        self._data = start + header_size
+        self._layout = header["columns"]
+        self.company_name = header["company"]
+        self.vehicle_count = header["vehicles"]
+        self.client_count = header["clients"]
+        self._view = memoryview(self._map)
+
+    def column(self, name: str) -> memoryview:
+        # Представление ссылается на mmap: его нужно освободить до close()
+        offset, size, typecode = self._layout[name]
+        begin = self._data + offset
+        return self._view[begin:begin + size].cast(typecode)
+
+    def _string(self, offsets: str, blob: str, index: int) -> str:
+        bounds = self.column(offsets)
+        return bytes(self.column(blob)[bounds[index]:bounds[index + 1]]).decode("utf-8")
+
+    def vehicle_id(self, index: int) -> str:
+        return self._string("vehicle_id_offsets", "vehicle_id_blob", index)
+
+    def client_name(self, index: int) -> str:
+        return self._string("name_offsets", "name_blob", index)
+
+    def _array(self, name: str) -> array:
+        typecode = self._layout[name][2]
+        result = array(typecode)
+        result.frombytes(self.column(name).cast("B"))
+        return result
+
+    def _optional_array(self, name: str, default, count: int):
+        # Столбцы объема и мест появились позже: в старых снимках их нет
+        if name in self._layout:
+            return self._array(name)
+        return [default] * count
+
+    def _all_strings(self, offsets: str, blob: str) -> list:
+        bounds = self._array(offsets)
+        data = bytes(self.column(blob))
+        return [data[bounds[i]:bounds[i + 1]].decode("utf-8") for i in range(len(bounds) - 1)]
+
+    def to_company(self):
+        # Полная материализация TransportCompany со всеми объектами и назначениями
+        from .transport_company import TransportCompany
+        from .vehicle import Vehicle
+        from .train import Train
+        from .airplane import Airplane
+        from .client import Client
+
+        company = TransportCompany(self.company_name)
+        capacity = self._array("capacity")
+        loads = self._array("current_load")
+        kinds = self._array("vehicle_kind")
+        extras = self._array("vehicle_extra")
+        ids = self._all_strings("vehicle_id_offsets", "vehicle_id_blob")
+        volume_capacity = self._optional_array("volume_capacity", UNLIMITED, self.vehicle_count)
+        slot_capacity = self._optional_array("slot_capacity", UNLIMITED, self.vehicle_count)
+        vehicles = []
+        for j in range(self.vehicle_count):
+            volume = None if volume_capacity[j] == UNLIMITED else volume_capacity[j]
+            if kinds[j] == KIND_TRAIN:
+                vehicle = Train.from_trusted(capacity[j], extras[j], volume)
+            elif kinds[j] == KIND_AIRPLANE:
+                holds = None if slot_capacity[j] == UNLIMITED else int(slot_capacity[j])
+                vehicle = Airplane.from_trusted(capacity[j], extras[j], volume, holds)
+            else:
+                vehicle = Vehicle.from_trusted(capacity[j], volume)
+            vehicle.vehicle_id = ids[j]
+            vehicles.append(vehicle)
+
+        names = self._all_strings("name_offsets", "name_blob")
+        weights = self._array("cargo_weight")
+        vip = self._array("is_vip")
+        assignment = self._array("assignment")
+        load_order = self._array("load_order")
+        volumes = self._optional_array("volume", 0.0, self.client_count)
+        slots = self._optional_array("slots", 0, self.client_count)
+        clients = [Client.from_trusted(names[i], weights[i], bool(vip[i]), volumes[i], slots[i])
+                   for i in range(self.client_count)]
+
+        # clients_list восстанавливается в исходном порядке загрузки; current_load
+        # берется из снимка как есть (в нем учтены и грузы вне списка клиентов)
+        placed = sorted((assignment[i], load_order[i], i) for i in range(self.client_count) if assignment[i] >= 0)
+        for j, _, i in placed:
+            vehicle = vehicles[j]
+            vehicle.clients_list.append(clients[i])
+            vehicle.current_volume += clients[i].volume
+            vehicle.used_slots += clients[i].slots
+        for j, vehicle in enumerate(vehicles):
+            vehicle.current_load = loads[j]
+
+        company.add_vehicles(vehicles)
+        company.add_clients(clients)
+        company.unassigned = [clients[i] for i in range(self.client_count) if assignment[i] < 0]
+        company.vehicles_used = sum(1 for v in vehicles if v.clients_list)
+        return company
+
+    def close(self):
+        view = getattr(self, "_view", None)
+        if view is not None:
+            view.release()
+            self._view = None
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_snapshot(path: str) -> Snapshot:
+    return Snapshot(path)
+
+
+def load_snapshot(path: str):
+    with Snapshot(path) as snapshot:
+        return snapshot.to_company()
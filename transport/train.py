@@ -1,11 +1,22 @@
 from .vehicle import Vehicle
 
 class Train(Vehicle):
-    def __init__(self, capacity: float, number_of_cars: int):
-        super().__init__(capacity)
+    __slots__ = ("number_of_cars",)
+
+    def __init__(self, capacity: float, number_of_cars: int, volume_capacity: float = None):
+        super().__init__(capacity, volume_capacity)
         if not isinstance(number_of_cars, int) or number_of_cars <= 0:
             raise ValueError("Количество вагонов должно быть положительным целым числом.")
         self.number_of_cars = number_of_cars
+        # Каждый вагон — одно место для грузов, которым нужны отдельные вагоны
+        self.slot_capacity = number_of_cars
+
+    @classmethod
+    def from_trusted(cls, capacity: float, number_of_cars: int, volume_capacity: float = None):
+        train = super().from_trusted(capacity, volume_capacity)
+        train.number_of_cars = number_of_cars
+        train.slot_capacity = number_of_cars
+        return train
 
     def __str__(self):
         base = super().__str__()
@@ -1,50 +1,933 @@
+import functools
+import math
+import threading
+import time
+
 from .vehicle import Vehicle
 from .client import Client
+from .train import Train
+from .airplane import Airplane
+from .bulk_validation_error import BulkValidationError
+from .incremental_planner import IncrementalPlanner
+from .distribution_cancelled import DistributionCancelled
+from .fleet_stats import FleetStats
+from .capacity_index import CapacityIndex
+from .packing_strategies import STRATEGIES
+from .plan_cache import PlanCache
+from .planned_vehicle import PlannedVehicle, frozen_clients
+from .plan_version import PlanVersion
+from . import min_vehicle_solver
+
+VEHICLE_KINDS = {
+    "train": Train, "поезд": Train,
+    "airplane": Airplane, "самолет": Airplane, "самолёт": Airplane,
+}
+
+
+def _client_row(row):
+    # Проверка строки клиента по правилам Client: (имя, вес[, VIP[, объем[, места]]]) -> (client, ошибка)
+    if isinstance(row, Client):
+        return row, None
+    if not isinstance(row, (tuple, list)) or not 2 <= len(row) <= 5:
+        return None, "Ожидается Client или (имя, вес груза[, VIP[, объем[, места]]])."
+    name, weight, is_vip, volume, slots = (tuple(row) + (False, 0.0, 0)[len(row) - 2:])
+    if not isinstance(name, str) or not name.strip():
+        return None, "Имя клиента должно быть непустой строкой."
+    # nan проходит любое сравнение, inf ломает суммы сводок: нужны конечные числа
+    if not isinstance(weight, (int, float)) or not math.isfinite(weight) or weight <= 0:
+        return None, "Вес груза должен быть положительным числом."
+    if not isinstance(is_vip, bool):
+        return None, "Флаг VIP-статуса должен быть логическим значением."
+    if isinstance(volume, bool) or not isinstance(volume, (int, float)) or not math.isfinite(volume) or volume < 0:
+        return None, "Объем груза должен быть неотрицательным числом."
+    if isinstance(slots, bool) or not isinstance(slots, int) or slots < 0:
+        return None, "Число занимаемых мест должно быть неотрицательным целым числом."
+    return Client.from_trusted(name.strip(), weight, is_vip, volume, slots), None
+
+
+def _vehicle_row(row):
+    # Проверка строки транспорта: (тип, грузоподъемность, вагоны/высота[, объем[, отсеки]]) -> (vehicle, ошибка)
+    if isinstance(row, Vehicle):
+        return row, None
+    if not isinstance(row, (tuple, list)) or not 3 <= len(row) <= 5:
+        return None, "Ожидается Vehicle или (тип, грузоподъемность, вагоны/высота[, объем[, отсеки]])."
+    kind, capacity, extra, volume_capacity, holds = (tuple(row) + (None, None)[len(row) - 3:])
+    cls = VEHICLE_KINDS.get(kind.strip().lower()) if isinstance(kind, str) else None
+    if cls is None:
+        return None, "Неизвестный тип транспорта."
+    if not isinstance(capacity, (int, float)) or not math.isfinite(capacity) or capacity <= 0:
+        return None, "Грузоподъемность должна быть положительным числом."
+    if not isinstance(extra, int) or extra <= 0:
+        if cls is Train:
+            return None, "Количество вагонов должно быть положительным целым числом."
+        return None, "Максимальная высота должна быть положительным целым числом."
+    if volume_capacity is not None and (not isinstance(volume_capacity, (int, float))
+                                        or not math.isfinite(volume_capacity) or volume_capacity <= 0):
+        return None, "Вместимость по объему должна быть положительным числом."
+    if holds is not None:
+        if cls is not Airplane:
+            return None, "Грузовые отсеки задаются только для самолетов."
+        if not isinstance(holds, int) or holds <= 0:
+            return None, "Количество грузовых отсеков должно быть положительным целым числом."
+        return cls.from_trusted(capacity, extra, volume_capacity, holds), None
+    return cls.from_trusted(capacity, extra, volume_capacity), None
+
+
+def _tracked(clients, progress, should_stop, every: int = 1000):
+    # Обертка над списком клиентов для стратегий: сообщает о прогрессе и
+    # проверяет запрос отмены каждые every клиентов
+    total = len(clients)
+    for done, client in enumerate(clients):
+        if done % every == 0:
+            if should_stop is not None and should_stop():
+                raise DistributionCancelled("Распределение грузов отменено.")
+            if progress is not None:
+                progress(done, total)
+        yield client
+    if progress is not None:
+        progress(total, total)
+
+
+def _placement_fits(clients, placement, vehicles) -> bool:
+    volume = [0.0] * len(vehicles)
+    slots = [0] * len(vehicles)
+    for client, index in zip(clients, placement):
+        volume[index] += client.volume
+        slots[index] += client.slots
+    return all(volume[j] <= v.volume_capacity and slots[j] <= v.slot_capacity for j, v in enumerate(vehicles))
+
+
+def _locked(method):
+    # Изменение компании выполняется под ее блокировкой. В режиме concurrent
+    # внешний (не вложенный) вызов по завершении помечает версию плана устаревшей;
+    # новая собирается при следующем plan(), а не после каждого изменения.
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            if self._depth == 0:
+                self._owner = threading.get_ident()
+            self._depth += 1
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._owner = None
+                    if self._concurrent:
+                        self._stale = True
+    return wrapper
+
+
+def _shadow(vehicle):
+    # Пустая копия транспорта для расчета вне блокировки: те же ограничения, без наблюдателя
+    copy = Vehicle.from_trusted(vehicle.capacity)
+    copy.volume_capacity = vehicle.volume_capacity
+    copy.slot_capacity = vehicle.slot_capacity
+    return copy
+
+
+def _validate_rows(rows, check, registered, messages):
+    # Проверяет все строки; при ошибках не добавляет ничего и сообщает о каждой.
+    # Готовый объект, уже зарегистрированный в компании или повторенный в пачке,
+    # тоже ошибка строки: messages — (уже зарегистрирован, повтор в пачке)
+    valid = []
+    errors = []
+    seen = set()
+    for index, row in enumerate(rows):
+        item, error = check(row)
+        if error is None and item is row:
+            if item in registered:
+                error = messages[0]
+            elif item in seen:
+                error = messages[1]
+            else:
+                seen.add(item)
+        if error is None:
+            valid.append(item)
+        else:
+            errors.append((index, error))
+    if errors:
+        raise BulkValidationError(errors)
+    return valid
+
 
 class TransportCompany:
-    def __init__(self, name: str):
+    STRATEGIES = STRATEGIES
+
+    def __init__(self, name: str, concurrent: bool = False, plan_cache_size: int = 4):
+        # concurrent=True: расчет плана идет на копиях транспорта без блокировки,
+        # а читатели получают неизменяемые версии через plan(), не дожидаясь расчета.
+        # plan_cache_size — сколько готовых планов хранить (0 — без кэша).
         if not isinstance(name, str) or not name.strip():
             raise ValueError("Название компании должно быть непустой строкой.")
         self.name = name.strip()
-        self.vehicles = []
-        self.clients = []
+        # Упорядоченные словари вместо списков: удаление и поиск за O(1)
+        self._vehicles = {}
+        self._clients = {}
+        # ID -> транспорт; строится при первом find_vehicle, чтобы регистрация не
+        # создавала ленивые ID (uuid4) у каждой машины, затем поддерживается
+        self._vehicles_by_id = None
+        self._clients_by_name = {}
+        # Клиент -> транспорт; поддерживается уведомлениями Vehicle.load_cargo/unload_cargo
+        self._assignment = {}
+        self._stats = FleetStats()
+        self._cache = PlanCache(plan_cache_size)
+        # (ключ кэша, _revision) плана, загруженного сейчас; сбрасывается при любом
+        # движении груза. Номер изменения отличает план от того же состава, собранного
+        # заново (удаление и повторное добавление клиента): отпечаток у них общий.
+        self._current_plan = None
+        # Счетчик update_client: пока он не менялся, клиенты из кэша сохранили свои значения
+        self._client_updates = 0
+        self._vehicle_list = None
+        self._client_list = None
+        self.vehicles_used = 0
+        self._unassigned = []
+        # True, пока список нераспределенных создан компанией и не отдан наружу:
+        # только такой можно дополнять на месте
+        self._unassigned_owned = False
+        self._strategy = "greedy_legacy"
+        self._planner = None
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._owner = None
+        # Счетчик изменений состава и грузов: расчет на копиях сверяет его перед публикацией
+        self._revision = 0
+        self._concurrent = bool(concurrent)
+        # Копирование при записи: запись PlannedVehicle пересоздается только для измененного транспорта
+        self._entries = {}
+        self._dirty = set()
+        # Кортежи опубликованной версии переиспользуются, пока не изменились:
+        # записи транспорта — до изменения состава или загрузки, копии
+        # нераспределенных — до замены списка, изменения его длины или update_client
+        self._vehicle_rows = None
+        self._unassigned_rows = None
+        self._stale = False
+        self._plan = None
+        if self._concurrent:
+            self._publish()
+
+    @property
+    def vehicles(self) -> list:
+        # Список строится один раз после изменения состава; изменять его напрямую нельзя
+        if self._vehicle_list is None:
+            self._vehicle_list = list(self._vehicles)
+        return self._vehicle_list
+
+    @property
+    def clients(self) -> list:
+        if self._client_list is None:
+            self._client_list = list(self._clients)
+        return self._client_list
 
+    @property
+    def unassigned(self) -> list:
+        # После принятой инкрементальной правки список собирается из очереди
+        # планировщика при первом обращении
+        if self._unassigned is None:
+            self._unassigned = self._planner.unassigned
+        self._unassigned_owned = False
+        return self._unassigned
+
+    @unassigned.setter
+    def unassigned(self, clients):
+        self._unassigned = clients
+        self._unassigned_owned = False
+
+    def _register_vehicle(self, vehicle):
+        if vehicle in self._vehicles:
+            raise ValueError("Транспорт уже зарегистрирован в компании.")
+        self._vehicles[vehicle] = None
+        if self._vehicles_by_id is not None:
+            self._vehicles_by_id[vehicle.vehicle_id] = vehicle
+        self._vehicle_list = None
+        vehicle._observer = self
+        for client in vehicle.clients_list:
+            self._assignment[client] = vehicle
+        self._stats.add_vehicle(vehicle)
+        self.vehicles_used = self._stats.used_vehicles
+        self._cache.vehicle_added(vehicle)
+        self._revision += 1
+        if self._concurrent:
+            self._dirty.add(vehicle)
+
+    def _unregister_vehicle(self, vehicle):
+        del self._vehicles[vehicle]
+        if self._vehicles_by_id is not None:
+            self._vehicles_by_id.pop(vehicle.vehicle_id, None)
+        self._vehicle_list = None
+        self._stats.remove_vehicle(vehicle)
+        self.vehicles_used = self._stats.used_vehicles
+        self._cache.vehicle_added(vehicle, -1)
+        self._revision += 1
+        self._entries.pop(vehicle, None)
+        self._vehicle_rows = None
+
+    def _register_client(self, client):
+        if client in self._clients:
+            raise ValueError("Клиент уже зарегистрирован в компании.")
+        self._clients[client] = None
+        self._clients_by_name.setdefault(client.name, {})[client] = None
+        self._client_list = None
+        self._stats.add_client(client)
+        self._cache.client_added(client)
+        self._revision += 1
+
+    def _unregister_client(self, client):
+        del self._clients[client]
+        namesakes = self._clients_by_name[client.name]
+        del namesakes[client]
+        if not namesakes:
+            del self._clients_by_name[client.name]
+        self._client_list = None
+        self._stats.remove_client(client)
+        self._cache.client_added(client, -1)
+        self._revision += 1
+
+    # Уведомления от Vehicle: индекс назначений, сводки и число занятых машин
+    # обновляются при любом движении груза, в том числе вне расчета плана
+    def _cargo_loaded(self, vehicle, client):
+        self._assignment[client] = vehicle
+        self._stats.cargo_loaded(vehicle, client)
+        self.vehicles_used = self._stats.used_vehicles
+        self._current_plan = None
+        if self._concurrent:
+            self._dirty.add(vehicle)
+
+    def _cargo_loaded_many(self, vehicle, clients):
+        for client in clients:
+            self._assignment[client] = vehicle
+        self._stats.cargo_loaded_many(vehicle, clients)
+        self.vehicles_used = self._stats.used_vehicles
+        self._current_plan = None
+        if self._concurrent:
+            self._dirty.add(vehicle)
+
+    def _cargo_unloaded(self, vehicle, client):
+        self._assignment.pop(client, None)
+        self._stats.cargo_unloaded(vehicle, client)
+        self.vehicles_used = self._stats.used_vehicles
+        self._current_plan = None
+        if self._concurrent:
+            self._dirty.add(vehicle)
+
+    def _load_reset(self, vehicle):
+        for client in vehicle.clients_list:
+            self._assignment.pop(client, None)
+        self._stats.load_reset(vehicle)
+        self.vehicles_used = self._stats.used_vehicles
+        self._current_plan = None
+        if self._concurrent:
+            self._dirty.add(vehicle)
+
+    # Версии плана
+    def _version(self, vehicles: tuple, unassigned: tuple) -> PlanVersion:
+        return PlanVersion(1 if self._plan is None else self._plan.version + 1, self.name, self._strategy,
+                           vehicles, unassigned, self.vehicles_used, self._stats.summary(), self._stats.histogram())
+
+    def _publish(self):
+        # Вызывается под блокировкой; замена ссылки на версию атомарна для читателей.
+        # Заново копируются только измененные машины и, если он менялся, список
+        # нераспределенных: версия после одной правки стоит O(изменений), а не O(плана).
+        if self._dirty:
+            for vehicle in self._dirty:
+                if vehicle in self._vehicles:
+                    self._entries[vehicle] = PlannedVehicle(vehicle)
+            self._dirty = set()
+            self._vehicle_rows = None
+        if self._vehicle_rows is None:
+            self._vehicle_rows = tuple(self._entries[v] for v in self._vehicles)
+        unassigned = self.unassigned
+        cached = self._unassigned_rows
+        if (cached is None or cached[0] is not unassigned or cached[1] != self._client_updates
+                or cached[2] != len(unassigned)):
+            cached = (unassigned, self._client_updates, len(unassigned), frozen_clients(unassigned))
+            self._unassigned_rows = cached
+        self._plan = self._version(self._vehicle_rows, cached[3])
+        self._stale = False
+
+    def plan(self) -> PlanVersion:
+        # Текущая версия плана. В режиме concurrent версия собирается лениво: после
+        # изменений — при первом обращении (под блокировкой, которую расчет на копиях
+        # не держит), а пока изменений нет, отдается опубликованная без блокировки.
+        # Изнутри изменения (тот же поток) — последняя опубликованная версия.
+        # Иначе версия собирается по текущему состоянию.
+        if self._concurrent:
+            if self._stale and self._owner != threading.get_ident():
+                with self._lock:
+                    if self._stale:
+                        self._publish()
+            return self._plan
+        with self._lock:
+            self._plan = self._version(tuple(PlannedVehicle(v) for v in self._vehicles),
+                                       frozen_clients(self.unassigned))
+            return self._plan
+
+    @_locked
     def add_vehicle(self, vehicle):
         if not isinstance(vehicle, Vehicle):
             raise TypeError("Объект должен быть экземпляром класса Vehicle или его наследником.")
-        self.vehicles.append(vehicle)
+        self._register_vehicle(vehicle)
+        if self._planner is not None:
+            self._planner.add_vehicle(vehicle)
+            self._patch()
+
+    @_locked
+    def remove_vehicle(self, vehicle):
+        if vehicle not in self._vehicles:
+            raise ValueError("Транспорт не зарегистрирован в компании.")
+        self._unregister_vehicle(vehicle)
+        if self._planner is not None:
+            self._planner.remove_vehicle(vehicle)
+            self._patch()
+        else:
+            # Новый список, а не extend: прежний уже мог быть отдан вызывающему
+            self.unassigned = self.unassigned + vehicle.clients_list
+            vehicle.reset_load()
+        vehicle._observer = None
+
+    @_locked
+    def replace_vehicle(self, old, new):
+        # Замена с сохранением позиции в списке и ID (редактирование в GUI)
+        if not isinstance(new, Vehicle):
+            raise TypeError("Объект должен быть экземпляром класса Vehicle или его наследником.")
+        if old not in self._vehicles:
+            raise ValueError("Транспорт не зарегистрирован в компании.")
+        if new in self._vehicles:
+            raise ValueError("Транспорт уже зарегистрирован в компании.")
+        new.vehicle_id = old.vehicle_id
+        self._vehicles = {(new if v is old else v): None for v in self._vehicles}
+        if self._vehicles_by_id is not None:
+            self._vehicles_by_id[new.vehicle_id] = new
+        self._vehicle_list = None
+        self._stats.remove_vehicle(old)
+        self._stats.add_vehicle(new)
+        self.vehicles_used = self._stats.used_vehicles
+        self._cache.vehicle_added(old, -1)
+        self._cache.vehicle_added(new)
+        self._revision += 1
+        self._entries.pop(old, None)
+        if self._concurrent:
+            self._dirty.add(new)
+        new._observer = self
+        if self._planner is not None:
+            self._planner.add_vehicle(new)
+            self._planner.remove_vehicle(old)
+            self._patch(2)
+        else:
+            self.unassigned = self.unassigned + old.clients_list
+            old.reset_load()
+        old._observer = None
 
     def list_vehicles(self):
         return self.vehicles
 
+    def find_vehicle(self, vehicle_id: str):
+        if self._vehicles_by_id is None:
+            with self._lock:
+                self._vehicles_by_id = {v.vehicle_id: v for v in self._vehicles}
+        return self._vehicles_by_id.get(vehicle_id)
+
+    def find_clients(self, name: str) -> list:
+        return list(self._clients_by_name.get(name, ()))
+
+    def where_is(self, client):
+        # Транспорт, в который загружен груз клиента, или None
+        return self._assignment.get(client)
+
+    def stats(self) -> dict:
+        # Сводка по парку и грузам за O(число типов транспорта), без обхода объектов
+        return self._stats.summary()
+
+    def capacity_histogram(self) -> list:
+        # Распределение транспорта по доле загрузки (корзины по 10%) со свободной вместимостью
+        return self._stats.histogram()
+
+    def feasibility_report(self) -> dict:
+        # Оценка по весу без распределения: один проход по клиентам и парку.
+        # *_lower — нижняя граница добавочной вместимости: грузы тяжелее самой
+        # большой машины требуют новых машин целиком, остальное — сверх общей
+        # вместимости. *_upper — по текущему плану: одна машина вместимостью в
+        # нераспределенный вес приняла бы все не вошедшие грузы.
+        with self._lock:
+            largest = 0.0
+            max_residual = 0.0
+            for v in self._vehicles:
+                largest = max(largest, v.capacity)
+                max_residual = max(max_residual, v.capacity - v.current_load)
+            eps = CapacityIndex.EPSILON
+            oversized = oversized_weight = oversized_vip = oversized_vip_weight = 0
+            for c in self._clients:
+                if c.cargo_weight > largest + eps:
+                    oversized += 1
+                    oversized_weight += c.cargo_weight
+                    if c.is_vip:
+                        oversized_vip += 1
+                        oversized_vip_weight += c.cargo_weight
+            summary = self._stats.summary()
+        capacity = summary["total_capacity"]
+        demand = summary["demand"]
+        vip_demand = summary["vip_demand"]
+        # Разность накопленных сумм: погрешность округления — не недостача
+        missing = summary["unassigned_weight"]
+        vip_missing = vip_demand - summary["vip_loaded_weight"]
+        return {
+            "total_capacity": capacity,
+            "largest_capacity": largest,
+            "max_residual": max_residual,
+            "demand": demand,
+            "vip_demand": vip_demand,
+            "oversized_clients": oversized,
+            "oversized_vip": oversized_vip,
+            "extra_capacity_lower": oversized_weight + max(0.0, demand - oversized_weight - capacity),
+            "extra_capacity_upper": missing if missing > eps else 0.0,
+            "vip_extra_capacity_lower": oversized_vip_weight + max(0.0, vip_demand - oversized_vip_weight - capacity),
+            "vip_extra_capacity_upper": vip_missing if vip_missing > eps else 0.0,
+        }
+
+    @_locked
     def add_client(self, client):
         if not isinstance(client, Client):
             raise TypeError("Объект должен быть экземпляром класса Client.")
-        self.clients.append(client)
+        self._register_client(client)
+        if self._planner is not None:
+            self._planner.add_client(client)
+            self._patch()
+
+    @_locked
+    def remove_client(self, client):
+        if client not in self._clients:
+            raise ValueError("Клиент не зарегистрирован в компании.")
+        self._unregister_client(client)
+        if self._planner is not None:
+            self._planner.remove_client(client)
+            self._patch()
+        else:
+            self._detach(client)
+
+    @_locked
+    def update_client(self, client, name: str = None, cargo_weight: float = None, is_vip: bool = None):
+        # Изменяет клиента на месте; проверка — по правилам конструктора Client
+        if client not in self._clients:
+            raise ValueError("Клиент не зарегистрирован в компании.")
+        checked = Client(client.name if name is None else name,
+                         client.cargo_weight if cargo_weight is None else cargo_weight,
+                         client.is_vip if is_vip is None else is_vip)
+        requeue = False
+        if self._planner is not None:
+            self._planner.remove_client(client)
+        else:
+            # Загруженный груз выгружается и ждет среди нераспределенных; уже
+            # ожидающий остается на своем месте в очереди
+            vehicle = self._assignment.get(client)
+            if vehicle is not None:
+                vehicle.unload_cargo(client)
+                requeue = True
+        if checked.name != client.name:
+            namesakes = self._clients_by_name[client.name]
+            del namesakes[client]
+            if not namesakes:
+                del self._clients_by_name[client.name]
+            self._clients_by_name.setdefault(checked.name, {})[client] = None
+        self._stats.remove_client(client)
+        self._cache.client_added(client, -1)
+        self._revision += 1
+        self._client_updates += 1
+        client.name = checked.name
+        client.cargo_weight = checked.cargo_weight
+        client.is_vip = checked.is_vip
+        self._stats.add_client(client)
+        self._cache.client_added(client)
+        if self._planner is not None:
+            self._planner.add_client(client)
+            self._patch()
+        elif requeue:
+            self.unassigned = self.unassigned + [client]
+
+    def _detach(self, client):
+        # Без активного плана: убираем клиента из транспорта, чтобы не оставлять устаревших грузов
+        vehicle = self._assignment.get(client)
+        if vehicle is not None:
+            vehicle.unload_cargo(client)
+        elif client in self.unassigned:
+            self.unassigned = [c for c in self.unassigned if c is not client]
+
+    def _patch(self, edits: int = 1):
+        # Правка принимается без расчета, если нераспределенный вес достиг нижней
+        # границы для любого плана. Иначе правки копятся, и раз на долю состава
+        # (IncrementalPlanner.check_due) план сравнивается с полным перераспределением
+        # той же стратегией на пустых копиях транспорта (VIP-вес — первым): план,
+        # оставивший больше груза, заменяется этим перераспределением.
+        planner = self._planner
+        stats = self._stats
+        if planner.certified(stats.demand, stats.vip_demand, stats.total_capacity):
+            planner.unchecked = 0
+        elif planner.check_due(edits, len(self._clients) + len(self._vehicles)):
+            place, sorted_clients, sorted_vehicles = self._plan_order(self._strategy)
+            shadows = [_shadow(v) for v in sorted_vehicles]
+            unassigned = place(sorted_clients, shadows)
+            if planner.worse_than(unassigned):
+                key = (self._cache.fingerprint(), self._strategy)
+                self._commit_snapshot(self._revision, key, sorted_vehicles, shadows, unassigned,
+                                      self._strategy, True)
+                return
+        self._unassigned = None
+        self.vehicles_used = planner.used
+
+    @_locked
+    def add_clients(self, rows) -> int:
+        clients = _validate_rows(rows, _client_row, self._clients,
+                                 ("Клиент уже зарегистрирован в компании.", "Клиент повторяется в пачке."))
+        for client in clients:
+            self._register_client(client)
+        if self._planner is not None:
+            for client in clients:
+                self._planner.add_client(client)
+            self._patch(len(clients))
+        return len(clients)
+
+    @_locked
+    def add_vehicles(self, rows) -> int:
+        vehicles = _validate_rows(rows, _vehicle_row, self._vehicles,
+                                  ("Транспорт уже зарегистрирован в компании.", "Транспорт повторяется в пачке."))
+        for vehicle in vehicles:
+            self._register_vehicle(vehicle)
+        if self._planner is not None:
+            for v in vehicles:
+                self._planner.add_vehicle(v)
+            self._patch(len(vehicles))
+        return len(vehicles)
+
+    def _incremental_rule(self, strategy: str) -> str:
+        # Правило размещения IncrementalPlanner, повторяющее стратегию
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия распределения: {strategy}.")
+        rule = IncrementalPlanner.RULES.get(self.STRATEGIES[strategy][1])
+        if rule is None:
+            raise ValueError(f"Стратегия {strategy} не поддерживает инкрементальный режим.")
+        return rule
 
-    def optimize_cargo_distribution(self):
-        # Сортируем клиентов: VIP — в начало
-        sorted_clients = sorted(self.clients, key=lambda c: not c.is_vip)
+    def supports_incremental(self, strategy: str) -> bool:
+        return strategy in self.STRATEGIES and self.STRATEGIES[strategy][1] in IncrementalPlanner.RULES
+
+    def _new_planner(self, vehicles, unassigned, strategy: str):
+        return IncrementalPlanner(vehicles, unassigned, self._assignment, self._incremental_rule(strategy))
+
+    def _plan_order(self, strategy: str):
+        # Функция размещения, клиенты в порядке обслуживания и транспорт в порядке перебора
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия распределения: {strategy}.")
+        decreasing, place = self.STRATEGIES[strategy]
+
+        # Сортируем клиентов: VIP — в начало (для *-decreasing стратегий — по убыванию веса)
+        if decreasing:
+            sorted_clients = sorted(self.clients, key=lambda c: (not c.is_vip, -c.cargo_weight))
+        else:
+            sorted_clients = sorted(self.clients, key=lambda c: not c.is_vip)
 
         # Сортируем транспорт по убыванию грузоподъемности (жадный алгоритм)
         sorted_vehicles = sorted(self.vehicles, key=lambda v: v.capacity, reverse=True)
+        return place, sorted_clients, sorted_vehicles
+
+    @_locked
+    def _adopt_plan(self, unassigned, strategy: str = None):
+        # Публикует план, рассчитанный вне optimize_cargo_distribution
+        self.vehicles_used = self._stats.used_vehicles
+        self.unassigned = unassigned
+        if strategy is not None:
+            self._strategy = strategy
+        self._planner = None
+
+    @_locked
+    def _admit_streamed(self, client, place):
+        # Клиент из потока OnlineAssigner регистрируется, чтобы сводки учитывали его
+        # груз, и размещается функцией place(client) -> транспорт | None под той же
+        # блокировкой. Поток идет в обход инкрементального плана — план сбрасывается,
+        # его очередь остается списком нераспределенных, куда попадает и не
+        # размещенный клиент. Регистрация держит в памяти ссылку на каждого клиента потока.
+        if client in self._clients:
+            raise ValueError("Клиент уже зарегистрирован в компании.")
+        if client in self._assignment:
+            raise ValueError("Груз клиента уже загружен в транспорт.")
+        if self._planner is not None:
+            if self._unassigned is None:
+                self._unassigned = self._planner.unassigned
+            self._planner = None
+        self._register_client(client)
+        vehicle = place(client)
+        if vehicle is None:
+            # Копия — только если текущий список уже отдан наружу; дальше дописываем на месте
+            if not self._unassigned_owned:
+                self._unassigned = list(self._unassigned)
+                self._unassigned_owned = True
+            self._unassigned.append(client)
+        return vehicle
+
+    def optimize_cargo_distribution(self, strategy: str = "greedy_legacy", incremental: bool = False,
+                                    progress=None, should_stop=None, metrics=None):
+        # metrics — необязательный DistributionMetrics для замера фаз прогона;
+        # инструментированный прогон всегда выполняет расчет, минуя кэш планов.
+        # incremental=True: последующие add_/update_/remove_client(s) и
+        # add_/remove_/replace_vehicle(s) правят этот план по правилу размещения
+        # стратегии (first-, best- или worst-fit; другие стратегии этот режим не
+        # поддерживают) за O(log m) на груз. Если нераспределенный вес после правки
+        # выше нижней границы (certified), раз на (n + m) / 8 таких правок план
+        # сверяется с полным перераспределением на копиях транспорта — O(n log n + m).
+        # В переполненном парке это в среднем O(log n) на правку, но между сверками
+        # план может уступать полному расчету.
+        if incremental:
+            self._incremental_rule(strategy)
+        if metrics is None and self._cache.capacity:
+            unassigned = self._cached_plan(strategy, incremental, progress)
+            if unassigned is not None:
+                return unassigned
+        if self._concurrent and self._owner != threading.get_ident():
+            run = self._optimize_on_snapshot
+        else:
+            run = self._optimize_in_place
+        if metrics is None:
+            return run(strategy, incremental, progress, should_stop, metrics)
+        try:
+            return run(strategy, incremental, progress, should_stop, metrics)
+        finally:
+            # Прогон, прерванный исключением (в том числе отменой), не учитывается,
+            # а включенная им трассировка памяти выключается
+            if metrics.current is not None:
+                metrics.cancel()
+
+    @_locked
+    def _optimize_in_place(self, strategy, incremental, progress, should_stop, metrics):
+        if metrics is not None:
+            metrics.begin(strategy, len(self._clients), len(self._vehicles))
+        key = (self._cache.fingerprint(), strategy)
+        place, sorted_clients, sorted_vehicles = self._plan_order(strategy)
+        if metrics is not None:
+            metrics.phase("sort")
 
         # Сбрасываем загрузку всех транспортных средств
         for v in sorted_vehicles:
-            v.current_load = 0.0
-            v.clients_list = []
-
-        unassigned = []
-
-        for client in sorted_clients:
-            assigned = False
-            # Ищем первый транспорт, в который помещается груз
-            for vehicle in sorted_vehicles:
-                if vehicle.has_space_for(client.cargo_weight):
-                    vehicle.load_cargo(client)
-                    assigned = True
-                    break
-            if not assigned:
-                unassigned.append(client)
-
-        return unassigned
\ No newline at end of file
+            v.reset_load()
+        if metrics is not None:
+            metrics.phase("reset")
+        targets = sorted_vehicles if metrics is None else metrics.wrap(sorted_vehicles)
+
+        if progress is not None or should_stop is not None:
+            try:
+                unassigned = place(_tracked(sorted_clients, progress, should_stop), targets)
+            except DistributionCancelled:
+                # Частичный план не публикуется: транспорт остается пустым
+                for v in sorted_vehicles:
+                    v.reset_load()
+                self.vehicles_used = 0
+                self.unassigned = sorted_clients
+                self._planner = None
+                raise
+        else:
+            unassigned = place(sorted_clients, targets)
+        if metrics is not None:
+            metrics.phase("place")
+        self.vehicles_used = sum(1 for v in sorted_vehicles if v.clients_list)
+        self.unassigned = unassigned
+        self._strategy = strategy
+        self._remember(key, sorted_vehicles, unassigned)
+        # В инкрементальном режиме последующие изменения правят этот план, а не пересчитывают его
+        self._planner = self._new_planner(sorted_vehicles, unassigned, strategy) if incremental else None
+        if metrics is not None:
+            metrics.phase("publish")
+            metrics.end(len(unassigned), self.vehicles_used)
+        return unassigned
+
+    def _optimize_on_snapshot(self, strategy, incremental, progress, should_stop, metrics):
+        # Расчет на пустых копиях транспорта вне блокировки: читатели видят прежнюю
+        # версию плана, а изменения компании не ждут окончания расчета. Под
+        # блокировкой — только снятие состава и перенос готового плана на объекты.
+        with self._lock:
+            if metrics is not None:
+                metrics.begin(strategy, len(self._clients), len(self._vehicles))
+            place, sorted_clients, sorted_vehicles = self._plan_order(strategy)
+            revision = self._revision
+            key = (self._cache.fingerprint(), strategy)
+        if metrics is not None:
+            metrics.phase("sort")
+        shadows = [_shadow(v) for v in sorted_vehicles]
+        if metrics is not None:
+            metrics.phase("reset")
+        targets = shadows if metrics is None else metrics.wrap(shadows)
+
+        # Прерванный расчет (DistributionCancelled) ничего не меняет: опубликованным
+        # остается прежний план, копии транспорта просто отбрасываются
+        if progress is not None or should_stop is not None:
+            unassigned = place(_tracked(sorted_clients, progress, should_stop), targets)
+        else:
+            unassigned = place(sorted_clients, targets)
+        if metrics is not None:
+            metrics.phase("place")
+        unassigned = self._commit_snapshot(revision, key, sorted_vehicles, shadows, unassigned, strategy, incremental)
+        if metrics is not None:
+            metrics.phase("publish")
+            metrics.end(len(unassigned), self.vehicles_used)
+        return unassigned
+
+    @_locked
+    def _commit_snapshot(self, revision, key, sorted_vehicles, shadows, unassigned, strategy, incremental):
+        rebased = revision != self._revision
+        if not rebased:
+            for v in sorted_vehicles:
+                v.reset_load()
+            for v, shadow in zip(sorted_vehicles, shadows):
+                if shadow.clients_list:
+                    v.load_many(shadow.clients_list)
+        else:
+            sorted_vehicles, unassigned = self._rebase(sorted_vehicles, shadows)
+        self._adopt_plan(unassigned, strategy)
+        if not rebased:
+            self._remember(key, sorted_vehicles, unassigned)
+        if incremental:
+            self._planner = self._new_planner(sorted_vehicles, unassigned, strategy)
+        return unassigned
+
+    def _rebase(self, vehicles, shadows):
+        # Состав изменился во время расчета: переносим план на текущие объекты.
+        # Грузы, которым в нем не нашлось места (новые, измененные, с удаленного
+        # транспорта), и прежде не распределенные размещаются first-fit, VIP первыми.
+        current = sorted(self.vehicles, key=lambda v: v.capacity, reverse=True)
+        for v in current:
+            v.reset_load()
+        for v, shadow in zip(vehicles, shadows):
+            if v not in self._vehicles:
+                continue
+            for client in shadow.clients_list:
+                if client in self._clients and v.fits(client):
+                    v.load_cargo(client)
+        leftovers = sorted((c for c in self._clients if c not in self._assignment), key=lambda c: not c.is_vip)
+        planner = IncrementalPlanner(current, [], self._assignment)
+        return current, [c for c in leftovers if not planner.add_client(c)]
+
+    def _remember(self, key, vehicles, unassigned):
+        # Сохраняет рассчитанный план в кэш; он же теперь загружен в транспорт
+        if self._cache.capacity:
+            self._cache.put(key, (self._client_updates,
+                                  tuple((v, tuple(v.clients_list)) for v in vehicles if v.clients_list),
+                                  tuple(unassigned)))
+            self._current_plan = (key, self._revision)
+
+    def _cached_plan(self, strategy, incremental, progress):
+        # План без расчета: уже загруженный, если состав и грузы с тех пор не менялись,
+        # либо из кэша, если такой же состав уже распределялся. Иначе — None.
+        with self._lock:
+            key = (self._cache.fingerprint(), strategy)
+            if self._current_plan == (key, self._revision):
+                self._cache.record("unchanged")
+                unassigned = self.unassigned
+            else:
+                entry = self._cache.get(key)
+                unassigned = None if entry is None else self._replay(entry)
+                if unassigned is None:
+                    self._cache.discard(key)
+                    self._cache.record("misses")
+                    return None
+                self._cache.record("replayed")
+                self._adopt_plan(unassigned, strategy)
+                self._current_plan = (key, self._revision)
+            if not incremental:
+                self._planner = None
+            elif self._planner is None:
+                sorted_vehicles = sorted(self.vehicles, key=lambda v: v.capacity, reverse=True)
+                self._planner = self._new_planner(sorted_vehicles, unassigned, strategy)
+        if progress is not None:
+            progress(len(self._clients), len(self._clients))
+        return unassigned
+
+    def _replay(self, entry):
+        # Перенос плана из кэша на текущие объекты. Отпечаток совпал по числу и значениям;
+        # если все объекты плана на месте и update_client с тех пор не вызывался, это
+        # те же клиенты с теми же значениями. Иначе — None, план рассчитывается заново.
+        updates, loads, unassigned = entry
+        registered = self._clients
+        if (updates != self._client_updates or not all(v in self._vehicles for v, _ in loads)
+                or not all(c in registered for _, cached in loads for c in cached)
+                or not all(c in registered for c in unassigned)):
+            return None
+        for v in self._vehicles:
+            v.reset_load()
+        for v, cached in loads:
+            v.load_many(cached)
+        return list(unassigned)
+
+    def plan_cache_stats(self) -> dict:
+        # Попадания (unchanged — план уже загружен, replayed — перенесен из кэша), промахи, вытеснения
+        return self._cache.stats()
+
+    def resize_plan_cache(self, size: int):
+        with self._lock:
+            self._cache.resize(size)
+            if not size:
+                self._current_plan = None
+
+    @_locked
+    def distribute_parallel(self, workers: int = None, shard_by: str = "balanced"):
+        # Шардированное распределение в нескольких процессах (см. sharded_distribution)
+        from .sharded_distribution import distribute_sharded
+        unassigned = distribute_sharded(self, workers, shard_by)
+        self._adopt_plan(unassigned)
+        return unassigned
+
+    @classmethod
+    def plan_batch(cls, companies, workers: int = None, strategy: str = "greedy_legacy", rebalance: bool = False) -> list:
+        # Планирование многих компаний (депо) в общем пуле процессов (см. batch_planner)
+        from .batch_planner import plan_companies
+        return plan_companies(companies, workers, strategy, rebalance)
+
+    def save_snapshot(self, path: str):
+        from .snapshot import save_snapshot
+        with self._lock:
+            save_snapshot(self, path)
+
+    @classmethod
+    def load_snapshot(cls, path: str):
+        from .snapshot import load_snapshot
+        return load_snapshot(path)
+
+    @_locked
+    def find_min_vehicle_plan(self, time_limit: float = 1.0) -> dict:
+        if not isinstance(time_limit, (int, float)) or time_limit <= 0:
+            raise ValueError("Лимит времени должен быть положительным числом.")
+        deadline = time.monotonic() + time_limit
+
+        # Начальное решение — FFD: он же определяет, какие грузы (VIP в первую очередь) везем
+        unassigned = self.optimize_cargo_distribution("ffd")
+        best = self.vehicles_used
+        loaded = sorted((c for v in self.vehicles for c in v.clients_list),
+                        key=lambda c: c.cargo_weight, reverse=True)
+        sorted_vehicles = sorted(self.vehicles, key=lambda v: v.capacity, reverse=True)
+
+        count, bound, placement = min_vehicle_solver.solve(
+            [c.cargo_weight for c in loaded], [v.capacity for v in sorted_vehicles], best, deadline)
+
+        # Точный поиск ведется только по весу: план с нарушением объема или мест отбрасывается
+        if placement is not None and not _placement_fits(loaded, placement, sorted_vehicles):
+            placement = None
+        if placement is not None:
+            for v in sorted_vehicles:
+                v.reset_load()
+            for client, index in zip(loaded, placement):
+                sorted_vehicles[index].load_cargo(client)
+            best = count
+            self.vehicles_used = count
+        elif count is None and bound >= best:
+            bound = best
+
+        return {
+            "unassigned": unassigned,
+            "vehicles_used": best,
+            "lower_bound": bound,
+            "gap": (best - bound) / best if best else 0.0,
+            "optimal": bound >= best,
+        }
+
+    @classmethod
+    def register_strategy(cls, name: str, place, decreasing: bool = False):
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("Название стратегии должно быть непустой строкой.")
+        if not callable(place):
+            raise TypeError("Стратегия должна быть вызываемым объектом.")
+        cls.STRATEGIES = {**cls.STRATEGIES, name.strip(): (decreasing, place)}